@@ -1,29 +1,54 @@
+from typing import Optional
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from app.core.logger import logger
 from app.models.resume import Resume
 from app.models.job_description import JobDescription, JDAnalysis
 
 router = APIRouter()
 
-from app.services.analysis import analyze_job_description
-from app.services.tailoring import tailor_resume_content
+from app.services.analysis import AnalysisMode, analyze_job_description
+from app.services.tailoring import TailoringMode, tailor_resume_content
 
 @router.post("/analyze-jd", response_model=JDAnalysis)
-async def analyze_jd(jd: JobDescription):
+async def analyze_jd(jd: JobDescription, mode: AnalysisMode = "llm"):
     """
     Analyze a job description to extract keywords and requirements.
+
+    mode=fast skips the LLM and uses the local keyword extractor.
     """
-    return await analyze_job_description(jd)
+    return await analyze_job_description(jd, mode)
 
 @router.post("/tailor-resume", response_model=Resume)
-async def tailor_resume(resume: Resume, jd_analysis: JDAnalysis):
+async def tailor_resume(resume: Resume, jd_analysis: JDAnalysis, mode: Optional[TailoringMode] = None):
     """
     Tailor the resume based on the analyzed job description.
     """
-    return await tailor_resume_content(resume, jd_analysis)
+    return await tailor_resume_content(resume, jd_analysis, mode)
 
-from fastapi import Response
-from app.services.latex import generate_latex
-from app.services.compiler import compile_pdf
+import json
+from typing import Dict, List, Tuple
+from fastapi import Response, Depends
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.db.session import get_db
+from app.models.sql_models import User, TailoredResume
+from app.services.latex import generate_latex, template_registry
+from app.services.compiler import LatexCompilationError, compile_latex, compiler_stats
+from app.services.sandbox import CompileLimitExceeded
+from app.services.compile_engine import compile_engine
+from app.services.pdf_cache import pdf_cache
+from app.services.batch_compiler import compile_many
+from app.services.zip_stream import ZipStream
+from app.services.preview import MEDIA_TYPES, PreviewFormat, render_preview
+from app.services.llm import llm_client
+from app.services.llm_cache import llm_response_cache
+from app.services.jd_store import jd_analysis_store
+from app.services.jd_compaction import jd_compactor
+from app.services.ats_scoring import score_many, score_resume
+from app.models.sql_models import JDAnalysisRecord
 
 @router.post("/generate-pdf")
 async def generate_pdf(resume: Resume, template_id: str = "default"):
@@ -31,8 +56,214 @@ async def generate_pdf(resume: Resume, template_id: str = "default"):
     Generate a PDF from the resume using the specified template.
     """
     try:
-        latex_content = generate_latex(resume)
-        pdf_bytes = compile_pdf(latex_content)
-        return Response(content=pdf_bytes, media_type="application/pdf")
+        template_id = template_registry.resolve(template_id)
+        latex_content = generate_latex(resume, template_id)
+        cache_key = pdf_cache.make_key(latex_content, template_id)
+        pdf_bytes = pdf_cache.get(cache_key)
+        headers = {"X-PDF-Cache": "hit"}
+        if pdf_bytes is None:
+            result = await compile_engine.run(compile_latex, latex_content)
+            pdf_bytes = result.pdf
+            pdf_cache.put(cache_key, pdf_bytes)
+            headers = {
+                "X-PDF-Cache": "miss",
+                "X-Compile-Passes": str(result.passes),
+                "X-Compile-Time-Ms": str(round(result.total_time * 1000)),
+            }
+        return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+    except HTTPException:
+        raise
+    except (LatexCompilationError, CompileLimitExceeded) as e:
+        logger.warning(f"LaTeX compilation failed: {e}")
+        raise HTTPException(status_code=422, detail=_compile_error_detail(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+def _compile_error_detail(e: Exception) -> dict:
+    """Turns a compile failure into a small JSON-safe description."""
+    if isinstance(e, LatexCompilationError):
+        detail = {"message": "LaTeX compilation failed"}
+        if e.error:
+            detail["latex_error"] = e.error.to_dict()
+        return detail
+    if isinstance(e, CompileLimitExceeded):
+        return {"message": "Resume is too large or complex to compile", "reason": e.reason}
+    return {"message": str(e)}
+
+class BatchPDFRequest(BaseModel):
+    resumes: List[Resume] = []
+    history_ids: List[int] = []
+    template_id: str = "default"
+
+@router.post("/generate-pdf/batch")
+async def generate_pdf_batch(
+    request: BatchPDFRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Generate PDFs for many resumes (inline or from history) as a streamed ZIP.
+
+    Compiles run in parallel across a process pool and each PDF is added to
+    the archive as soon as it finishes; items that render to the same LaTeX
+    are compiled once. The archive ends with manifest.json,
+    which lists the outcome of every item; a failed item does not fail the batch.
+    """
+    total = len(request.resumes) + len(set(request.history_ids))
+    if total == 0:
+        raise HTTPException(status_code=400, detail="No resumes given")
+    if total > settings.PDF_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.PDF_BATCH_MAX_ITEMS} resumes per batch",
+        )
+
+    items = [(f"resume-{i + 1}.pdf", resume) for i, resume in enumerate(request.resumes)]
+    history_ids = list(dict.fromkeys(request.history_ids))
+    if history_ids:
+        rows = db.query(TailoredResume).filter(
+            TailoredResume.user_id == current_user.id,
+            TailoredResume.id.in_(history_ids)
+        ).all()
+        rows_by_id = {row.id: row for row in rows}
+        for history_id in history_ids:
+            row = rows_by_id.get(history_id)
+            if row is None:
+                items.append((f"history-{history_id}.pdf", "Resume not found"))
+                continue
+            try:
+                items.append((f"history-{history_id}.pdf", Resume(**row.content)))
+            except ValidationError as e:
+                items.append((f"history-{history_id}.pdf", f"Invalid resume: {e.error_count()} validation error(s)"))
+
+    template_id = template_registry.resolve(request.template_id)
+    manifest = [{"name": name} for name, _ in items]
+    cached = []
+    to_compile: Dict[str, Tuple[str, List[int]]] = {}  # Cache key -> (LaTeX, items that render to it)
+    for index, (name, resume) in enumerate(items):
+        if isinstance(resume, str):
+            manifest[index].update(status="error", error={"message": resume})
+            continue
+        try:
+            latex_content = generate_latex(resume, template_id)
+        except Exception as e:
+            manifest[index].update(status="error", error={"message": str(e)})
+            continue
+        cache_key = pdf_cache.make_key(latex_content, template_id)
+        pdf_bytes = pdf_cache.get(cache_key)
+        if pdf_bytes is not None:
+            cached.append((index, pdf_bytes))
+        else:
+            to_compile.setdefault(cache_key, (latex_content, []))[1].append(index)
+    jobs = list(to_compile.items())
+
+    async def stream_archive():
+        archive = ZipStream()
+        for index, pdf_bytes in cached:
+            manifest[index].update(status="ok", cache="hit")
+            yield archive.add(manifest[index]["name"], pdf_bytes)
+
+        async for position, outcome in compile_many([latex for _, (latex, _) in jobs]):
+            cache_key, (_, indices) = jobs[position]
+            if isinstance(outcome, Exception):
+                logger.warning(f"Batch item {manifest[indices[0]]['name']} failed: {outcome}")
+                for index in indices:
+                    manifest[index].update(status="error", error=_compile_error_detail(outcome))
+                continue
+            pdf_cache.put(cache_key, outcome.pdf)
+            manifest[indices[0]].update(status="ok", cache="miss", passes=outcome.passes)
+            # Later items with the same LaTeX reuse the first one's compile
+            for index in indices[1:]:
+                manifest[index].update(status="ok", cache="hit")
+            for index in indices:
+                yield archive.add(manifest[index]["name"], outcome.pdf)
+
+        yield archive.add("manifest.json", json.dumps(manifest, indent=2).encode("utf-8"))
+        yield archive.close()
+
+    return StreamingResponse(
+        stream_archive(),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="resumes.zip"'},
+    )
+
+@router.post("/score")
+async def score(resume: Resume, jd_analysis: JDAnalysis):
+    """
+    Score how well the resume covers the analyzed job description.
+
+    Runs locally without the LLM; returns a 0-100 score weighted by keyword
+    importance plus the matched and missing keywords.
+    """
+    return score_resume(resume, jd_analysis).to_dict()
+
+class BatchScoreRequest(BaseModel):
+    resume: Resume
+    jd_analyses: List[JDAnalysis] = []
+    # Ids of analyses saved in the JD analysis store
+    analysis_ids: List[int] = []
+
+@router.post("/score/batch")
+async def score_batch(request: BatchScoreRequest, db: Session = Depends(get_db)):
+    """
+    Score one resume against many analyzed job descriptions, best match first.
+
+    Items are identified by their position in jd_analyses ("index") or by
+    their stored analysis id ("analysis_id").
+    """
+    analysis_ids = list(dict.fromkeys(request.analysis_ids))
+    total = len(request.jd_analyses) + len(analysis_ids)
+    if total == 0:
+        raise HTTPException(status_code=400, detail="No job descriptions given")
+    if total > settings.SCORE_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.SCORE_BATCH_MAX_ITEMS} job descriptions per batch",
+        )
+
+    items = [({"index": i}, analysis) for i, analysis in enumerate(request.jd_analyses)]
+    if analysis_ids:
+        rows = db.query(JDAnalysisRecord).filter(JDAnalysisRecord.id.in_(analysis_ids)).all()
+        rows_by_id = {row.id: row for row in rows}
+        missing = [analysis_id for analysis_id in analysis_ids if analysis_id not in rows_by_id]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Analyses not found: {missing}")
+        items += [({"analysis_id": analysis_id}, JDAnalysis(**rows_by_id[analysis_id].analysis))
+                  for analysis_id in analysis_ids]
+
+    scores = score_many(request.resume, [analysis for _, analysis in items])
+    results = [
+        {**ref, "role_type": analysis.role_type, **result.to_dict()}
+        for (ref, analysis), result in zip(items, scores)
+    ]
+    results.sort(key=lambda item: item["score"], reverse=True)
+    return {"results": results}
+
+@router.post("/preview")
+async def preview_resume(resume: Resume, format: PreviewFormat = "html"):
+    """
+    Render a quick HTML or plain-text preview of the resume, without LaTeX.
+    """
+    return Response(content=render_preview(resume, format), media_type=MEDIA_TYPES[format])
+
+@router.get("/templates")
+async def list_templates():
+    """
+    List the available template ids.
+    """
+    return {"default": template_registry.default_id, "templates": template_registry.template_ids()}
+
+@router.get("/stats")
+async def get_stats():
+    """
+    Report cache hit/miss counters and compile queue state.
+    """
+    return {
+        "pdf_cache": pdf_cache.stats(),
+        "pdf_compile": compile_engine.stats(),
+        "latex_compiler": compiler_stats(),
+        "llm": llm_client.stats(),
+        "llm_cache": llm_response_cache.stats(),
+        "jd_store": jd_analysis_store.stats(),
+        "jd_compaction": jd_compactor.stats(),
+    }
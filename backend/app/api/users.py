@@ -1,13 +1,21 @@
+import json
+from datetime import datetime
+from typing import Any, List, Optional
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.logger import logger
 from app.models.resume import Resume as PydanticResume
 from app.models.job_description import JobDescription
 from app.services.analysis import analyze_job_description
-from app.services.tailoring import tailor_resume_content
+from app.services.tailoring import TailoringMode, analyze_and_tailor, stream_tailored_resume, tailor_resume_content
+from app.services.batch_tailoring import tailor_many
 from app.services.parsing import parse_pdf_resume
 from app.db.session import get_db
-from app.models.sql_models import User, Resume as DBResume
+from app.models.sql_models import User, Resume as DBResume, TailoredResume
 
 router = APIRouter()
 
@@ -41,23 +49,140 @@ async def update_my_resume(
 @router.post("/me/tailor", response_model=PydanticResume)
 async def tailor_my_resume(
     jd: JobDescription, 
+    mode: Optional[TailoringMode] = None,
+    combined: Optional[bool] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    """
+    Tailor the user's resume to a job description.
+
+    combined=true (default: settings.TAILORING_COMBINED_ANALYSIS) analyzes the
+    JD and tailors the whole resume in a single LLM call; it only supports
+    the "full" tailoring mode.
+    """
+    if combined is None:
+        combined = settings.TAILORING_COMBINED_ANALYSIS
+    if combined and mode not in (None, "full"):
+        raise HTTPException(status_code=400, detail="combined=true only supports mode=full")
+
     # 1. Get user's base resume
     if not current_user.resume:
         raise HTTPException(status_code=400, detail="Please upload a base resume first")
     
     base_resume = PydanticResume(**current_user.resume.content)
+
+    if combined:
+        _, tailored_resume = await analyze_and_tailor(base_resume, jd)
+        return tailored_resume
     
     # 2. Analyze JD
     analysis = await analyze_job_description(jd)
     
     # 3. Tailor
-    tailored_resume = await tailor_resume_content(base_resume, analysis)
+    tailored_resume = await tailor_resume_content(base_resume, analysis, mode)
     
     return tailored_resume
 
+def _sse(event: str, data: Any) -> str:
+    """Formats one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/me/tailor/stream")
+async def tailor_my_resume_stream(
+    jd: JobDescription,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Tailor the user's resume, streaming the result as server-sent events.
+
+    Emits "analysis" once the JD is analyzed, then a "section" event for each
+    part of the tailored resume as soon as it is generated, and finally
+    "done" with the complete resume (see stream_tailored_resume).
+    """
+    if not current_user.resume:
+        raise HTTPException(status_code=400, detail="Please upload a base resume first")
+
+    base_resume = PydanticResume(**current_user.resume.content)
+
+    async def event_stream():
+        analysis = await analyze_job_description(jd)
+        yield _sse("analysis", analysis.model_dump(mode="json"))
+        async for event, data in stream_tailored_resume(base_resume, analysis):
+            yield _sse(event, data)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so events reach the client immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+class BatchTailorRequest(BaseModel):
+    jds: List[JobDescription]
+    # Save each tailored resume to the user's history
+    save: bool = False
+
+@router.post("/me/tailor/batch")
+async def tailor_my_resume_batch(
+    request: BatchTailorRequest,
+    mode: Optional[TailoringMode] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Tailor the user's resume to many job descriptions, streamed as NDJSON.
+
+    JDs are analyzed and tailored concurrently and one JSON line is written per
+    JD as soon as it finishes, in completion order: {"index", "status": "ok",
+    "analysis", "resume"} (plus "history_id" when saved), or {"index",
+    "status": "error", "error"}. A failed JD does not fail the batch.
+    """
+    if not current_user.resume:
+        raise HTTPException(status_code=400, detail="Please upload a base resume first")
+    if not request.jds:
+        raise HTTPException(status_code=400, detail="No job descriptions given")
+    if len(request.jds) > settings.TAILORING_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.TAILORING_BATCH_MAX_ITEMS} job descriptions per batch",
+        )
+
+    base_resume = PydanticResume(**current_user.resume.content)
+    user_id = current_user.id
+
+    async def line_stream():
+        async for index, outcome in tailor_many(base_resume, request.jds, mode):
+            if isinstance(outcome, Exception):
+                logger.warning(f"Batch tailoring of JD {index} failed: {outcome}")
+                yield json.dumps({"index": index, "status": "error", "error": {"message": str(outcome)}}) + "\n"
+                continue
+            analysis, tailored = outcome
+            item = {
+                "index": index,
+                "status": "ok",
+                "analysis": analysis.model_dump(mode="json"),
+                "resume": tailored.model_dump(mode="json"),
+            }
+            if request.save:
+                record = TailoredResume(
+                    user_id=user_id,
+                    job_description=request.jds[index].raw_text,
+                    content=item["resume"],
+                    created_at=datetime.now().isoformat()
+                )
+                db.add(record)
+                db.commit()
+                item["history_id"] = record.id
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(
+        line_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.post("/me/parse-pdf", response_model=PydanticResume)
 async def parse_resume_pdf(
     file: UploadFile = File(...), 
@@ -0,0 +1,79 @@
+"""
+Small in-process caching primitives shared by the service layer.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class CacheStats:
+    """Thread-safe named counters (hits, misses, evictions, ...)."""
+
+    def __init__(self, *names: str):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {name: 0 for name in names}
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe least-recently-used mapping.
+
+    Args:
+        max_items: Maximum number of entries kept; the least recently used
+            entry is dropped when the bound is exceeded. 0 disables the cache.
+        ttl_seconds: Optional lifetime of an entry, after which it is
+            treated as missing.
+    """
+
+    def __init__(self, max_items: int, ttl_seconds: Optional[float] = None):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        # key -> (value, expiry timestamp or None)
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Returns the cached value (marking it most recently used) or None."""
+        with self._lock:
+            if key not in self._data:
+                return None
+            value, expires_at = self._data[key]
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> int:
+        """Stores a value and returns the number of entries evicted to make room."""
+        if self.max_items <= 0:
+            return 0
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        evicted = 0
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
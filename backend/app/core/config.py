@@ -1,4 +1,4 @@
-from typing import Optional, Literal
+from typing import Dict, Optional, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -11,10 +11,14 @@ class Settings(BaseSettings):
     # App Settings
     APP_NAME: str = "Resume Tailor"
     API_V1_STR: str = "/api/v1"
+    # "development" enables conveniences such as template hot reload
+    ENVIRONMENT: Literal["development", "production"] = "production"
     
     # LLM Configuration
-    # Options: "gemini", "openai", "bedrock"
-    LLM_PROVIDER: Literal["gemini", "openai", "bedrock"] = "bedrock"
+    # Options: "gemini", "openai", "bedrock", "router" to spread calls over
+    # the providers in LLM_ROUTER_PROVIDERS, or "replay" to serve recorded
+    # responses offline (see LLM_REPLAY_*)
+    LLM_PROVIDER: Literal["gemini", "openai", "bedrock", "router", "replay"] = "bedrock"
     
     # Provider-specific settings
     GEMINI_API_KEY: Optional[str] = None
@@ -30,4 +34,124 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = "gpt-4-turbo-preview"
     BEDROCK_MODEL: str = "anthropic.claude-3-sonnet-20240229-v1:0"
 
+    # LLM Availability
+    # Upper bound on a single provider call, including retries inside the client.
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    # Consecutive failures or timeouts after which calls fail fast, and how long
+    # to wait before letting probe calls through again.
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    LLM_BREAKER_HALF_OPEN_CALLS: int = 1
+    # Connection pool of the Bedrock (botocore) client. OpenAI uses the SDK's
+    # own keep-alive client, shared across the process by langchain-openai.
+    LLM_HTTP_MAX_CONNECTIONS: int = 20
+    LLM_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+
+    # LLM Router (LLM_PROVIDER="router")
+    # Provider -> weight for picking the primary, e.g. '{"bedrock": 3, "openai": 1}';
+    # weight 0 keeps a provider as a standby for hedging and failover only.
+    LLM_ROUTER_PROVIDERS: Dict[str, float] = {"bedrock": 1.0}
+    # Per-provider call timeout before failing over; LLM_ROUTER_TIMEOUTS overrides
+    # it per provider. Keep the sum of a failover chain below LLM_TIMEOUT_SECONDS.
+    LLM_ROUTER_TIMEOUT_SECONDS: float = 20.0
+    LLM_ROUTER_TIMEOUTS: Dict[str, float] = {}
+    # Send a duplicate request to the next provider once the primary is slower
+    # than this percentile of its recent latencies (or the initial delay until
+    # enough calls have been seen).
+    LLM_HEDGE_ENABLED: bool = True
+    LLM_HEDGE_PERCENTILE: float = 95.0
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_INITIAL_DELAY_SECONDS: float = 5.0
+
+    # LLM Record/Replay (LLM_PROVIDER="replay")
+    # "record" sends new prompts to LLM_REPLAY_UPSTREAM and appends the responses
+    # to the cassette; "replay" answers only from the cassette, offline.
+    LLM_REPLAY_MODE: Literal["replay", "record"] = "replay"
+    LLM_REPLAY_CASSETTE: str = "cassettes/llm.jsonl"
+    LLM_REPLAY_UPSTREAM: Literal["gemini", "openai", "bedrock", "router"] = "bedrock"
+    # Injected delay per replayed response, +/- a seeded random jitter.
+    LLM_REPLAY_LATENCY_MS: float = 0.0
+    LLM_REPLAY_LATENCY_JITTER_MS: float = 0.0
+    LLM_REPLAY_SEED: int = 0
+
+    # LLM Response Cache
+    # Responses are cached by a hash of provider, model and prompt (temperature is 0).
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MEMORY_ITEMS: int = 256
+    LLM_CACHE_PATH: str = ".cache/llm_responses.sqlite3"
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+    # Entries older than this are treated as missing; 0 disables expiry.
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # Tailoring
+    # "full" asks for the whole resume in one call; "sections" tailors the
+    # summary, each experience item, each project and the skills concurrently;
+    # "patch" asks only for a list of edits and applies them locally.
+    TAILORING_MODE: Literal["full", "sections", "patch"] = "full"
+    TAILORING_SECTION_CONCURRENCY: int = 4
+    # Analyze the JD and tailor the whole resume in a single LLM call on
+    # /users/me/tailor instead of two sequential ones.
+    TAILORING_COMBINED_ANALYSIS: bool = False
+    # Batch tailoring: JDs analyzed and tailored at once, and JDs per request.
+    TAILORING_BATCH_CONCURRENCY: int = 4
+    TAILORING_BATCH_MAX_ITEMS: int = 25
+
+    # JD Analysis Store
+    # Analyses are stored in the database and reused for near-identical JDs.
+    JD_STORE_ENABLED: bool = True
+    # Minimum estimated Jaccard similarity of word shingles to reuse an analysis.
+    JD_SIMILARITY_THRESHOLD: float = 0.9
+    # MinHash signature length and LSH bands (num_perm must be a multiple of bands).
+    JD_MINHASH_PERMUTATIONS: int = 64
+    JD_LSH_BANDS: int = 16
+    # Boilerplate (EEO, benefits, about us) is dropped from JDs before analysis,
+    # and what remains is cut to this many tokens, most relevant sections first.
+    JD_COMPACTION_ENABLED: bool = True
+    JD_TOKEN_BUDGET: int = 1500
+
+    # ATS Scoring
+    # Upper bound on JDs scored in one /score/batch request.
+    SCORE_BATCH_MAX_ITEMS: int = 200
+
+    # PDF Cache
+    # Compiled PDFs are cached by a hash of the rendered LaTeX and template id.
+    PDF_CACHE_ENABLED: bool = True
+    PDF_CACHE_MEMORY_ITEMS: int = 64
+    PDF_CACHE_DIR: str = ".cache/pdf"
+    PDF_CACHE_MAX_DISK_MB: int = 256
+
+    # Templates
+    # Template id that template_id="default" resolves to (file name without .tex).
+    DEFAULT_TEMPLATE_ID: str = "resume"
+    TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = ".cache/jinja"
+    # Escape the whole resume once before rendering instead of per field in the template.
+    LATEX_PRE_ESCAPE: bool = True
+
+    # PDF Compilation
+    # Concurrent pdflatex runs; defaults to the number of CPU cores.
+    PDF_COMPILE_CONCURRENCY: Optional[int] = None
+    # Requests allowed to wait for a compile slot before new ones are rejected.
+    PDF_COMPILE_QUEUE_SIZE: int = 16
+    PDF_COMPILE_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    PDF_COMPILE_RETRY_AFTER_SECONDS: int = 5
+    # Process pool size for batch PDF generation; defaults to the number of CPU cores.
+    PDF_BATCH_WORKERS: Optional[int] = None
+    PDF_BATCH_MAX_ITEMS: int = 50
+
+    # LaTeX Compiler
+    # "tempdir" compiles each PDF in a fresh temporary directory; "warm" reuses
+    # long-lived worker directories and a precompiled preamble format.
+    LATEX_COMPILE_BACKEND: Literal["tempdir", "warm"] = "warm"
+    LATEX_WORK_DIR: str = ".cache/latex"
+    # Upper bound on pdflatex passes; extra passes only run when a rerun is requested.
+    LATEX_MAX_PASSES: int = 3
+    # Stop at the first LaTeX error instead of running through the whole document.
+    LATEX_HALT_ON_ERROR: bool = True
+    # Sandbox limits for each compile (0 disables a limit). Wall-clock time
+    # covers all passes; CPU, memory and output limits apply per pdflatex run.
+    LATEX_TIMEOUT_SECONDS: float = 30.0
+    LATEX_CPU_SECONDS: int = 20
+    LATEX_MAX_MEMORY_MB: int = 1024
+    LATEX_MAX_OUTPUT_MB: int = 20
+
 settings = Settings()
@@ -1,14 +1,20 @@
 """
 Exception utilities and global error handler for the backend.
 """
+from typing import Dict, Optional
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
 from .logger import logger
 
 class ServiceError(HTTPException):
     """Base class for service‑level errors."""
-    def __init__(self, status_code: int = 500, detail: str = "Internal server error"):
-        super().__init__(status_code=status_code, detail=detail)
+    def __init__(
+        self,
+        status_code: int = 500,
+        detail: str = "Internal server error",
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        super().__init__(status_code=status_code, detail=detail, headers=headers)
 
 def register_global_exception_handler(app):
     """Register a catch‑all exception handler that logs the error and returns a JSON response.
@@ -22,6 +28,10 @@ def register_global_exception_handler(app):
         logger.error(f"Unhandled exception: {exc}", exc_info=True)
         # If it's an HTTPException we can preserve its status code and detail
         if isinstance(exc, HTTPException):
-            return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+            return JSONResponse(
+                status_code=exc.status_code,
+                content={"detail": exc.detail},
+                headers=getattr(exc, "headers", None),
+            )
         # Otherwise return a generic 500 response
         return JSONResponse(status_code=500, content={"detail": "Internal server error"})
@@ -34,3 +34,26 @@ class TailoredResume(Base):
     
     # Relationship
     owner = relationship("User", back_populates="tailored_resumes")
+
+class JDAnalysisRecord(Base):
+    __tablename__ = "jd_analyses"
+
+    id = Column(Integer, primary_key=True, index=True)
+    text_hash = Column(String, unique=True, index=True)  # sha256 of the normalized JD text
+    minhash = Column(JSON)  # MinHash signature, for near-duplicate checks
+    qualifiers = Column(JSON)  # Numbers and seniority words a near-duplicate must share
+    analysis = Column(JSON)  # The JDAnalysis JSON
+    created_at = Column(String)
+
+    # Relationship
+    bands = relationship("JDAnalysisBand", back_populates="record", cascade="all, delete-orphan")
+
+class JDAnalysisBand(Base):
+    __tablename__ = "jd_analysis_bands"
+
+    id = Column(Integer, primary_key=True, index=True)
+    record_id = Column(Integer, ForeignKey("jd_analyses.id"), index=True)
+    band_key = Column(String, index=True)  # LSH band key, "<band>:<digest>"
+
+    # Relationship
+    record = relationship("JDAnalysisRecord", back_populates="bands")
@@ -1,9 +1,80 @@
+import asyncio
+import logging
+from typing import Any, Literal, Optional
+from pydantic import ValidationError
+from app.core.config import settings
 from app.models.job_description import JDAnalysis, JobDescription
 from app.services.llm import llm_client
 from app.services.cleaning import clean_text
+from app.services.jd_store import jd_analysis_store
+from app.services.jd_compaction import jd_compactor
+from app.services.keyword_extractor import extract_analysis
 
-async def analyze_job_description(jd: JobDescription) -> JDAnalysis:
-    cleaned_text = clean_text(jd.raw_text)
+logger = logging.getLogger(__name__)
+
+AnalysisMode = Literal["llm", "fast"]
+
+# Shape of the analysis the LLM is asked for
+ANALYSIS_JSON_STRUCTURE = """{
+        "role_type": "string",
+        "keywords": [
+            {"term": "string", "importance": int (1-5), "category": "string"}
+        ],
+        "required_skills": ["string"],
+        "preferred_skills": ["string"],
+        "experience_level": "string",
+        "key_responsibilities": ["string"]
+    }"""
+
+async def lookup_stored_analysis(jd: JobDescription) -> Optional[JDAnalysis]:
+    """Returns the stored analysis of this JD, or of a near-identical repost, if any."""
+    if not settings.JD_STORE_ENABLED:
+        return None
+    return await asyncio.to_thread(jd_analysis_store.lookup, jd.raw_text)
+
+def prepare_jd_text(jd: JobDescription) -> str:
+    """Drops boilerplate, fits the JD into the token budget and cleans it for prompting."""
+    jd_text = jd_compactor.compact(jd.raw_text).text if settings.JD_COMPACTION_ENABLED else jd.raw_text
+    return clean_text(jd_text)
+
+async def analysis_from_result(jd: JobDescription, result: Any) -> JDAnalysis:
+    """
+    Validates an analysis returned by the LLM and stores it.
+
+    Falls back to the local keyword extractor if the LLM failed or the
+    result does not match the schema.
+    """
+    if not isinstance(result, dict) or "error" in result or not result:
+        logger.warning("LLM analysis unavailable, using the local keyword extractor")
+        return extract_analysis(jd.raw_text)
+
+    try:
+        analysis = JDAnalysis(**result)
+    except ValidationError as e:
+        logger.warning(f"LLM analysis did not match the schema, using the local keyword extractor: {e}")
+        return extract_analysis(jd.raw_text)
+    if settings.JD_STORE_ENABLED:
+        await asyncio.to_thread(jd_analysis_store.save, jd.raw_text, analysis)
+    return analysis
+
+async def analyze_job_description(jd: JobDescription, mode: AnalysisMode = "llm") -> JDAnalysis:
+    """
+    Analyzes a job description.
+
+    Args:
+        jd: The job description.
+        mode: "llm" asks the model; "fast" uses the local keyword extractor
+            only. The local extractor is also the fallback when the LLM fails.
+    """
+    if mode == "fast":
+        return extract_analysis(jd.raw_text)
+
+    # Reuse the analysis of this JD, or of a near-identical repost, if stored
+    stored = await lookup_stored_analysis(jd)
+    if stored is not None:
+        return stored
+
+    cleaned_text = prepare_jd_text(jd)
     
     prompt = f"""
     Analyze the following job description and extract key information in JSON format.
@@ -12,29 +83,10 @@ async def analyze_job_description(jd: JobDescription) -> JDAnalysis:
     {cleaned_text}
     
     Output JSON structure:
-    {{
-        "role_type": "string",
-        "keywords": [
-            {{"term": "string", "importance": int (1-5), "category": "string"}}
-        ],
-        "required_skills": ["string"],
-        "preferred_skills": ["string"],
-        "experience_level": "string",
-        "key_responsibilities": ["string"]
-    }}
+    {ANALYSIS_JSON_STRUCTURE}
     """
     
     result = await llm_client.generate_json(prompt)
     
     # Fallback if LLM fails or no key
-    if "error" in result or not result:
-        return JDAnalysis(
-            role_type="Unknown",
-            keywords=[],
-            required_skills=[],
-            preferred_skills=[],
-            experience_level="Unknown",
-            key_responsibilities=[]
-        )
-        
-    return JDAnalysis(**result)
+    return await analysis_from_result(jd, result)
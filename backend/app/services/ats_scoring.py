@@ -0,0 +1,174 @@
+"""
+Local ATS match scoring.
+
+Scores how well a resume covers a job description's keywords without any
+LLM call. JD keywords (plus required and preferred skills that are not
+already keywords) become a sparse term vector weighted by importance; the
+resume is reduced to the set of terms it mentions. Terms are normalized
+through the skills dictionary, so aliases such as "k8s" and "Kubernetes"
+count as the same term, and other keywords are matched as whole phrases.
+
+Batch scoring builds one matrix over the union of all JD terms and scores a
+resume against every JD with a single matrix-vector product.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from app.models.job_description import JDAnalysis
+from app.models.resume import Resume
+from app.services.keyword_extractor import KeywordExtractor, get_extractor
+
+# Importance given to skills listed in the analysis but missing from its keywords
+REQUIRED_SKILL_WEIGHT = 4
+PREFERRED_SKILL_WEIGHT = 2
+# A term mentioned only in the summary is weaker evidence than one backed by
+# a skills list, technologies or an experience/project bullet.
+SUMMARY_ONLY_CREDIT = 0.5
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+
+def normalize_term(term: str) -> str:
+    """Lowercases a term and reduces it to space-separated word tokens."""
+    return " ".join(_TOKEN.findall(term.lower()))
+
+
+@dataclass
+class ResumeTerms:
+    """What a resume mentions: dictionary skills and normalized text, by strength."""
+    skills: Set[str] = field(default_factory=set)
+    summary_skills: Set[str] = field(default_factory=set)
+    text: str = " "
+    summary_text: str = " "
+    # Canonical dictionary terms; these are matched only through the extractor
+    dictionary: Set[str] = field(default_factory=set)
+
+    def credit(self, term: str) -> float:
+        """
+        Returns 1.0 for a supported mention, a partial credit for a summary-only one, else 0.0.
+
+        Dictionary skills are credited only when the extractor found them, so
+        their case sensitivity and word boundaries hold ("go to market" is not
+        Go); other terms are matched as lowercased whole phrases.
+        """
+        if term in self.dictionary:
+            if term in self.skills:
+                return 1.0
+            return SUMMARY_ONLY_CREDIT if term in self.summary_skills else 0.0
+        phrase = f" {normalize_term(term)} "
+        if phrase in self.text:
+            return 1.0
+        if phrase in self.summary_text:
+            return SUMMARY_ONLY_CREDIT
+        return 0.0
+
+
+def resume_terms(resume: Resume, extractor: KeywordExtractor) -> ResumeTerms:
+    """Normalizes a resume's skills, technologies and bullets into a ResumeTerms."""
+    parts: List[str] = [skill for category in resume.skills for skill in category.skills]
+    parts += resume.certifications
+    for item in resume.experience:
+        parts += [item.position] + item.technologies + item.description
+    for project in resume.projects:
+        parts += [project.name, project.description] + project.technologies
+    text = "\n".join(parts)
+    summary = resume.summary or ""
+    return ResumeTerms(
+        skills={term for _, term in extractor.find_skills(text)},
+        summary_skills={term for _, term in extractor.find_skills(summary)},
+        text=f" {' '.join(normalize_term(part) for part in parts)} ",
+        summary_text=f" {normalize_term(summary)} ",
+        dictionary=set(extractor.categories),
+    )
+
+
+def jd_vector(analysis: JDAnalysis, extractor: KeywordExtractor) -> Dict[str, float]:
+    """
+    Builds the sparse, importance-weighted term vector of a JD analysis.
+
+    Keywords that are exactly a dictionary skill or alias are folded onto the
+    canonical term (a phrase that merely contains one is kept as is);
+    when a term appears more than once the highest importance wins.
+    """
+    weighted: List[Tuple[str, float]] = [(k.term, float(k.importance)) for k in analysis.keywords]
+    weighted += [(skill, REQUIRED_SKILL_WEIGHT) for skill in analysis.required_skills]
+    weighted += [(skill, PREFERRED_SKILL_WEIGHT) for skill in analysis.preferred_skills]
+
+    vector: Dict[str, float] = {}
+    names: Dict[str, str] = {}  # Normalized form -> first spelling seen
+    for term, weight in weighted:
+        normalized = normalize_term(term)
+        if not normalized or weight <= 0:
+            continue
+        canonical = extractor.canonical(term) or names.setdefault(normalized, term.strip())
+        vector[canonical] = max(vector.get(canonical, 0.0), weight)
+    return vector
+
+
+@dataclass
+class MatchScore:
+    """Coverage of a JD's weighted terms by a resume, as a 0-100 score."""
+    score: float
+    matched: List[str]
+    missing: List[str]
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"score": self.score, "matched": self.matched, "missing": self.missing}
+
+
+def score_resume(resume: Resume, analysis: JDAnalysis) -> MatchScore:
+    """
+    Scores one resume against one analyzed JD.
+
+    Returns:
+        The weighted share of JD terms the resume covers, with matched and
+        missing terms ordered by importance.
+    """
+    return score_many(resume, [analysis])[0]
+
+
+def score_many(resume: Resume, analyses: List[JDAnalysis]) -> List[MatchScore]:
+    """
+    Scores one resume against many analyzed JDs at once.
+
+    Args:
+        resume: The resume to score.
+        analyses: The JD analyses to score it against.
+
+    Returns:
+        One MatchScore per analysis, in the same order.
+    """
+    extractor = get_extractor()
+    terms = resume_terms(resume, extractor)
+    vectors = [jd_vector(analysis, extractor) for analysis in analyses]
+
+    vocabulary: Dict[str, int] = {}
+    for vector in vectors:
+        for term in vector:
+            vocabulary.setdefault(term, len(vocabulary))
+    names = list(vocabulary)
+
+    weights = np.zeros((len(vectors), len(names)), dtype=np.float64)
+    for row, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            weights[row, vocabulary[term]] = weight
+    coverage = np.fromiter((terms.credit(term) for term in names), dtype=np.float64, count=len(names))
+
+    totals = weights.sum(axis=1)
+    covered = weights @ coverage
+    scores = np.divide(covered, totals, out=np.zeros_like(covered), where=totals > 0) * 100.0
+
+    results = []
+    for row in range(len(vectors)):
+        present = np.flatnonzero(weights[row])
+        # Highest importance first; vocabulary order (JD order) breaks ties
+        present = present[np.argsort(-weights[row, present], kind="stable")]
+        results.append(MatchScore(
+            score=round(float(scores[row]), 1),
+            matched=[names[i] for i in present if coverage[i] > 0],
+            missing=[names[i] for i in present if coverage[i] == 0],
+        ))
+    return results
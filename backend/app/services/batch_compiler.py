@@ -0,0 +1,102 @@
+"""
+Parallel compilation of many LaTeX documents across a process pool.
+
+Used by the batch PDF endpoint. Each worker process owns a single warm
+worker directory and shares the precompiled formats of the main process, so
+batch compiles never collide with the per-request compiler. Each compile
+still takes a slot from the shared compile engine, so a batch cannot push
+the total number of pdflatex runs past its limit. Results are yielded as
+they finish, and failures are returned per document instead of aborting the
+batch.
+"""
+import asyncio
+import atexit
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.services import compiler
+from app.services.compile_engine import CompileEngine, compile_engine
+
+# Per-process warm pool, created on first use inside each worker
+_worker_pool: Optional[compiler.WarmCompilerPool] = None
+
+
+def _compile_in_worker(latex_content: str) -> compiler.CompileResult:
+    """Entry point executed inside a pool process."""
+    global _worker_pool
+    if settings.LATEX_COMPILE_BACKEND != "warm":
+        return compiler.compile_latex(latex_content)
+    if _worker_pool is None:
+        os.makedirs(settings.LATEX_WORK_DIR, exist_ok=True)
+        root_dir = tempfile.mkdtemp(prefix="batch-", dir=settings.LATEX_WORK_DIR)
+        atexit.register(shutil.rmtree, root_dir, True)
+        _worker_pool = compiler.WarmCompilerPool(
+            size=1,
+            root_dir=root_dir,
+            fmt_dir=os.path.join(settings.LATEX_WORK_DIR, "formats"),
+        )
+    return _worker_pool.compile(latex_content)
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                # "spawn" keeps workers independent of the server's threads
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=settings.PDF_BATCH_WORKERS or os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _process_pool
+
+
+async def compile_many(
+    documents: List[str],
+    executor: Optional[ProcessPoolExecutor] = None,
+    engine: Optional[CompileEngine] = None,
+) -> AsyncIterator[Tuple[int, Union[compiler.CompileResult, Exception]]]:
+    """
+    Compiles documents in parallel and yields (index, result) as each finishes.
+
+    The result is either a CompileResult or the exception that compile raised
+    (including CompilerBusyError when no slot frees up in time). At most
+    ``engine.max_concurrency`` documents are handed to the engine at once, so
+    a large batch does not fill its wait queue. Documents still queued are
+    cancelled if the consumer stops iterating.
+    """
+    if not documents:
+        return
+    executor = executor or _get_process_pool()
+    engine = engine or compile_engine
+    queued = iter(enumerate(documents))
+    pending = {}
+
+    def launch() -> None:
+        for index, latex in queued:
+            pending[asyncio.ensure_future(engine.run_in(executor, _compile_in_worker, latex))] = index
+            return
+
+    for _ in range(engine.max_concurrency):
+        launch()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = pending.pop(task)
+                launch()
+                error = task.exception()
+                yield index, error if error is not None else task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,61 @@
+"""
+Tailoring one resume to many job descriptions.
+
+Used by the batch tailoring endpoint. The base resume is validated and its
+part of the prompt built once for the whole batch; each JD is then analyzed
+and tailored as its own task, with at most a configured number of JDs in
+progress at a time. Results are yielded as they finish, and failures are
+returned per JD instead of aborting the batch.
+"""
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.models.job_description import JDAnalysis, JobDescription
+from app.models.resume import Resume
+from app.services.analysis import analyze_job_description
+from app.services.tailoring import TailoringMode, build_resume_prefix, tailor_resume_content
+
+TailoringOutcome = Tuple[JDAnalysis, Resume]
+
+
+async def tailor_many(
+    resume: Resume,
+    jds: List[JobDescription],
+    mode: Optional[TailoringMode] = None,
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[Tuple[int, Union[TailoringOutcome, Exception]]]:
+    """
+    Analyzes and tailors for each JD concurrently, yielding (index, result) as each finishes.
+
+    Args:
+        resume: The base resume, shared by every JD.
+        jds: The job descriptions to tailor for.
+        mode: Tailoring mode, as for tailor_resume_content.
+        concurrency: Maximum number of JDs in progress at once. Defaults to
+            ``settings.TAILORING_BATCH_CONCURRENCY``.
+
+    The result is either (analysis, tailored resume) or the exception raised
+    for that JD. JDs still running are cancelled if the consumer stops iterating.
+    """
+    if not jds:
+        return
+    semaphore = asyncio.Semaphore(concurrency or settings.TAILORING_BATCH_CONCURRENCY)
+    prefix = build_resume_prefix(resume)
+
+    async def run(jd: JobDescription) -> TailoringOutcome:
+        async with semaphore:
+            analysis = await analyze_job_description(jd)
+            return analysis, await tailor_resume_content(resume, analysis, mode, prefix=prefix)
+
+    pending = {asyncio.ensure_future(run(jd)): index for index, jd in enumerate(jds)}
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = pending.pop(task)
+                error = task.exception()
+                yield index, error if error is not None else task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,135 @@
+"""
+Circuit breaker for calls to an external dependency.
+
+After ``failure_threshold`` consecutive failures the breaker opens and calls
+fail fast instead of waiting on a dependency that is down. Once
+``reset_timeout`` seconds have passed it goes half-open and lets a limited
+number of probe calls through: a successful probe closes it again, a failed
+one re-opens it for another reset period. A probe that is cancelled before
+it reports back must hand its slot back with ``release_probe()``.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.core.cache import CacheStats
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a call while the breaker is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit is open, retry in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Thread-safe consecutive-failure circuit breaker.
+
+    Usage:
+        breaker.before_call()       # raises CircuitOpenError when open
+        try:
+            result = call()
+        except CancelledError:
+            breaker.release_probe()     # no outcome either way
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+
+    Args:
+        name: Name used in errors and stats.
+        failure_threshold: Consecutive failures that open the breaker.
+        reset_timeout: Seconds the breaker stays open before probing.
+        half_open_max_calls: Probe calls allowed at once while half-open.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.stats_counters = CacheStats("successes", "failures", "rejected", "opened")
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def before_call(self) -> None:
+        """Admits a call or raises CircuitOpenError."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return
+            self.stats_counters.incr("rejected")
+            retry_in = max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+            raise CircuitOpenError(self.name, retry_in)
+
+    def release_probe(self) -> None:
+        """Frees the slot of an admitted call that ended without an outcome (e.g. was cancelled)."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.stats_counters.incr("successes")
+            self._consecutive_failures = 0
+            self._state = CLOSED
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.stats_counters.incr("failures")
+            self._consecutive_failures += 1
+            state = self._current_state()
+            if state == HALF_OPEN or (state == CLOSED and self._consecutive_failures >= self.failure_threshold):
+                self._open()
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probes = 0
+        self.stats_counters.incr("opened")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._probes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the current state and counters."""
+        with self._lock:
+            state = self._current_state()
+            retry_in: Optional[float] = None
+            if state == OPEN:
+                retry_in = round(max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0), 1)
+            return {
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "retry_in_seconds": retry_in,
+                **self.stats_counters.snapshot(),
+            }
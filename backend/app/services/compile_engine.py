@@ -0,0 +1,132 @@
+"""
+Asynchronous front-end for the blocking LaTeX compiler.
+
+pdflatex runs in a dedicated thread pool so a compile never blocks the event
+loop. Concurrency is capped (by default at the number of CPU cores) and only a
+bounded number of requests may wait for a slot; beyond that requests are
+rejected immediately with 503 and a Retry-After header. Batch compiles run
+in their own process pool but take their slots from the same limit.
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from app.core.cache import CacheStats
+from app.core.config import settings
+from app.core.exceptions import ServiceError
+
+logger = logging.getLogger(__name__)
+
+
+class CompilerBusyError(ServiceError):
+    """Raised when the compile queue is full or a slot did not free up in time."""
+
+    def __init__(self, retry_after: int, detail: str = "PDF compiler is busy, please retry shortly"):
+        super().__init__(status_code=503, detail=detail, headers={"Retry-After": str(retry_after)})
+
+
+class CompileEngine:
+    """
+    Runs compile jobs off the event loop with admission control.
+
+    Args:
+        max_concurrency: Maximum number of compiles running at once.
+        max_queue: Maximum number of requests waiting for a free slot.
+        queue_timeout: Seconds a request may wait for a slot before it is rejected.
+        retry_after: Value of the Retry-After header sent on rejection.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_queue: int = 16,
+        queue_timeout: float = 30.0,
+        retry_after: int = 5,
+    ):
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.stats_counters = CacheStats("completed", "failed", "rejected", "timed_out")
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="pdf-compile"
+        )
+        # Created lazily so it binds to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._active = 0
+        self._waiting = 0
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs a blocking compile function in the worker pool.
+
+        Raises:
+            CompilerBusyError: If the wait queue is full or the wait times out.
+        """
+        return await self.run_in(self._executor, func, *args, **kwargs)
+
+    async def run_in(self, executor: Executor, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs a compile function in another executor once a slot is free.
+
+        Raises:
+            CompilerBusyError: If the wait queue is full or the wait times out.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            self.stats_counters.incr("rejected")
+            logger.warning(f"Compile queue full ({self._waiting} waiting), rejecting request")
+            raise CompilerBusyError(self.retry_after)
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.stats_counters.incr("timed_out")
+            raise CompilerBusyError(self.retry_after)
+        finally:
+            self._waiting -= 1
+
+        self._active += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, partial(func, *args, **kwargs))
+        try:
+            result = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The client went away; hold the slot until pdflatex actually exits
+            future.add_done_callback(lambda _: self._release())
+            raise
+        except Exception:
+            self.stats_counters.incr("failed")
+            self._release()
+            raise
+        self.stats_counters.incr("completed")
+        self._release()
+        return result
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats_counters.snapshot(),
+            "active": self._active,
+            "waiting": self._waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
+
+
+# Global instance
+compile_engine = CompileEngine(
+    max_concurrency=settings.PDF_COMPILE_CONCURRENCY,
+    max_queue=settings.PDF_COMPILE_QUEUE_SIZE,
+    queue_timeout=settings.PDF_COMPILE_QUEUE_TIMEOUT_SECONDS,
+    retry_after=settings.PDF_COMPILE_RETRY_AFTER_SECONDS,
+)
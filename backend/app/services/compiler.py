@@ -1,36 +1,397 @@
+"""
+LaTeX to PDF compilation.
+
+Two backends are available (see ``settings.LATEX_COMPILE_BACKEND``):
+
+- ``tempdir``: every compile runs in a fresh temporary directory.
+- ``warm``: compiles reuse long-lived worker directories and a precompiled
+  format (.fmt) of the document preamble, so pdflatex skips package loading.
+  Formats are keyed on a hash of the preamble and rebuilt whenever it changes.
+
+pdflatex is run once, and again only when the log asks for a rerun or the
+cross-reference data in the .aux file changed, up to ``settings.LATEX_MAX_PASSES``.
+With ``settings.LATEX_HALT_ON_ERROR`` it stops at the first error, which is
+reported as a small structured ``LatexError`` rather than the whole log.
+
+Every pdflatex run is sandboxed (see ``app.services.sandbox``): a compile that
+exceeds its wall-clock, CPU, memory or output budget is killed together with
+its children and surfaces as ``CompileLimitExceeded``.
+"""
+import hashlib
+import logging
 import os
+import queue
+import re
 import subprocess
 import tempfile
-import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.cache import CacheStats
+from app.core.config import settings
+from app.services.latex_log import LatexError, parse_latex_log
+from app.services.sandbox import CompileLimitExceeded, SandboxLimits, run_sandboxed
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "resume"
+BEGIN_DOCUMENT = "\\begin{document}"
+# Output files a previous compile may leave in a reused worker directory
+STALE_EXTENSIONS = (".pdf", ".log", ".aux", ".out", ".toc")
+# Log lines showing that pdflatex could not load a precompiled format
+FORMAT_ERROR_MARKERS = ("Fatal format file error", "I can't find the format file")
+# Log messages from LaTeX and common packages asking for another pass
+RERUN_MARKERS = (
+    "Rerun to get",
+    "Label(s) may have changed",
+    "Please rerun LaTeX",
+    "Rerun LaTeX",
+    "(rerunfilecheck)",
+)
+# .aux commands that carry data read back on the next pass
+AUX_REFERENCE_COMMANDS = ("\\newlabel", "\\bibcite", "\\citation")
+# \@writefile{<ext>} entries only matter when the document reads that list back
+AUX_LIST_READERS = {"toc": "\\tableofcontents", "lof": "\\listoffigures", "lot": "\\listoftables"}
+_WRITEFILE = re.compile(r"\\@writefile\{(\w+)\}")
+
+
+@dataclass
+class CompileResult:
+    """A compiled PDF together with per-pass timings."""
+    pdf: bytes
+    pass_times: List[float] = field(default_factory=list)
+
+    @property
+    def passes(self) -> int:
+        return len(self.pass_times)
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.pass_times)
+
+
+# Aggregate pass counts, reported through compiler_stats()
+pass_stats = CacheStats("compiles", "passes", "single_pass_compiles")
+
+
+class LatexCompilationError(Exception):
+    """
+    Raised when pdflatex does not produce a PDF.
+
+    Attributes:
+        log: The full pdflatex log, for server-side logging only.
+        error: The first error extracted from the log, if any.
+    """
+
+    def __init__(self, message: str, log: str = "", error: Optional[LatexError] = None):
+        super().__init__(message)
+        self.log = log
+        self.error = error
+
+    def __reduce__(self):
+        # Keep log and error when the exception crosses a process boundary
+        return (self.__class__, (self.args[0], self.log, self.error))
+
+
+def sandbox_limits(wall_seconds: Optional[float] = None) -> SandboxLimits:
+    """Builds the configured sandbox limits, optionally with a shorter wall-clock budget."""
+    return SandboxLimits(
+        wall_seconds=settings.LATEX_TIMEOUT_SECONDS if wall_seconds is None else wall_seconds,
+        cpu_seconds=settings.LATEX_CPU_SECONDS,
+        memory_bytes=settings.LATEX_MAX_MEMORY_MB * 1024 * 1024,
+        output_bytes=settings.LATEX_MAX_OUTPUT_MB * 1024 * 1024,
+    )
+
+
+def _run_pdflatex(args: list, cwd: str, env: Optional[Dict[str, str]] = None,
+                  wall_seconds: Optional[float] = None) -> subprocess.CompletedProcess:
+    return run_sandboxed(["pdflatex", *args], cwd=cwd, limits=sandbox_limits(wall_seconds), env=env)
+
+
+def _read(path: str) -> str:
+    if not os.path.exists(path):
+        return ""
+    with open(path, "r", errors="replace") as f:
+        return f.read()
+
+
+def _reference_data(aux: str, source: str) -> List[str]:
+    """Returns the .aux lines that the next pass of ``source`` would read back."""
+    lines = []
+    for line in aux.splitlines():
+        match = _WRITEFILE.match(line)
+        if match:
+            reader = AUX_LIST_READERS.get(match.group(1))
+            # Lists nobody typesets (e.g. the toc entries every \section writes) are ignored
+            if reader is None or reader in source:
+                lines.append(line)
+        elif line.startswith(AUX_REFERENCE_COMMANDS):
+            lines.append(line)
+    return lines
+
+
+def needs_rerun(log: str, aux_before: str, aux_after: str, source: str = "") -> bool:
+    """
+    Decides whether another pdflatex pass is required.
+
+    Args:
+        log: The .log written by the pass that just finished.
+        aux_before: The .aux contents that pass read (empty if there was none).
+        aux_after: The .aux contents that pass wrote.
+        source: The LaTeX document, to tell which \@writefile lists it reads.
+    """
+    if any(marker in log for marker in RERUN_MARKERS):
+        return True
+    # Only reference data matters; hyperref and friends write boilerplate to
+    # the .aux on every run that never affects the output.
+    return _reference_data(aux_before, source) != _reference_data(aux_after, source)
+
+
+def _compile_in_dir(work_dir: str, latex_content: str, fmt_name: Optional[str] = None,
+                    fmt_dir: Optional[str] = None) -> CompileResult:
+    """
+    Compiles LaTeX content inside work_dir and returns the PDF with pass timings.
+
+    Args:
+        work_dir: Directory to compile in. Leftovers from earlier runs are removed.
+        latex_content: Full LaTeX document.
+        fmt_name: Optional precompiled format to load instead of the preamble.
+        fmt_dir: Directory containing fmt_name.
+    """
+    for ext in STALE_EXTENSIONS:
+        path = os.path.join(work_dir, JOB_NAME + ext)
+        if os.path.exists(path):
+            os.remove(path)
+
+    tex_file = os.path.join(work_dir, f"{JOB_NAME}.tex")
+    with open(tex_file, "w") as f:
+        f.write(latex_content)
+
+    args = ["-interaction=nonstopmode"]
+    if settings.LATEX_HALT_ON_ERROR:
+        args += ["-halt-on-error", "-file-line-error"]
+    env = None
+    if fmt_name:
+        args.append(f"-fmt={fmt_name}")
+        # Trailing separator keeps the default format search path as a fallback
+        env = {**os.environ, "TEXFORMATS": fmt_dir + os.pathsep}
+    args.append(f"{JOB_NAME}.tex")
+
+    log_file = os.path.join(work_dir, f"{JOB_NAME}.log")
+    aux_file = os.path.join(work_dir, f"{JOB_NAME}.aux")
+    aux_before = ""
+    pass_times = []
+    max_passes = max(1, settings.LATEX_MAX_PASSES)
+    # The wall-clock budget covers all passes of one compile
+    deadline = time.monotonic() + settings.LATEX_TIMEOUT_SECONDS if settings.LATEX_TIMEOUT_SECONDS else None
+    while len(pass_times) < max_passes:
+        remaining = None
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise CompileLimitExceeded("timeout")
+        started = time.perf_counter()
+        process = _run_pdflatex(args, cwd=work_dir, env=env, wall_seconds=remaining)
+        pass_times.append(time.perf_counter() - started)
+        if process.returncode != 0 and not os.path.exists(os.path.join(work_dir, f"{JOB_NAME}.pdf")):
+            # Nothing to gain from another pass over a document that failed
+            break
+
+        aux_after = _read(aux_file)
+        if not needs_rerun(_read(log_file), aux_before, aux_after, latex_content):
+            break
+        aux_before = aux_after
+
+    pdf_file = os.path.join(work_dir, f"{JOB_NAME}.pdf")
+
+    if os.path.exists(pdf_file):
+        with open(pdf_file, "rb") as f:
+            result = CompileResult(pdf=f.read(), pass_times=pass_times)
+        pass_stats.incr("compiles")
+        pass_stats.incr("passes", result.passes)
+        if result.passes == 1:
+            pass_stats.incr("single_pass_compiles")
+        logger.info(f"Compiled PDF in {result.passes} pass(es), {result.total_time * 1000:.0f} ms")
+        return result
+    else:
+        # Report the first error from the log if PDF not created
+        if os.path.exists(log_file):
+            log = _read(log_file)
+            error = parse_latex_log(log, source=latex_content)
+            if error is None:
+                raise LatexCompilationError("LaTeX Compilation Error", log=log)
+            location = f" at line {error.line}" if error.line else ""
+            raise LatexCompilationError(f"LaTeX Compilation Error{location}: {error.message}", log=log, error=error)
+        raise LatexCompilationError("PDF generation failed unknown error")
+
+
+def split_preamble(latex_content: str) -> Optional[str]:
+    """Returns everything before \\begin{document}, or None if there is no body."""
+    index = latex_content.find(BEGIN_DOCUMENT)
+    if index == -1:
+        return None
+    return latex_content[:index]
+
+
+class FormatCache:
+    """
+    Builds and remembers precompiled pdflatex formats, one per distinct preamble.
+
+    Formats are dumped with the ``mylatexformat`` package. A preamble whose
+    format fails to build is remembered so it is not retried on every compile.
+    """
+
+    def __init__(self, fmt_dir: str):
+        self.fmt_dir = fmt_dir
+        os.makedirs(self.fmt_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._failed = set()
+        self.stats_counters = CacheStats("hits", "builds", "build_failures")
+
+    @staticmethod
+    def format_name(preamble: str) -> str:
+        return "preamble-" + hashlib.sha256(preamble.encode("utf-8")).hexdigest()[:16]
+
+    def get(self, latex_content: str) -> Optional[str]:
+        """Returns the format name for the document's preamble, building it if needed."""
+        preamble = split_preamble(latex_content)
+        if preamble is None:
+            return None
+        name = self.format_name(preamble)
+        if name in self._failed:
+            return None
+        if os.path.exists(os.path.join(self.fmt_dir, f"{name}.fmt")):
+            self.stats_counters.incr("hits")
+            return name
+
+        with self._lock:
+            # Another worker may have built it while we waited
+            if os.path.exists(os.path.join(self.fmt_dir, f"{name}.fmt")):
+                self.stats_counters.incr("hits")
+                return name
+            if self._build(name, preamble):
+                return name
+            return None
+
+    def invalidate(self, name: str) -> None:
+        """Marks a format as unusable, e.g. after pdflatex failed to load it."""
+        self._failed.add(name)
+        path = os.path.join(self.fmt_dir, f"{name}.fmt")
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _build(self, name: str, preamble: str) -> bool:
+        # Build under a per-process job name and move it into place, so
+        # processes sharing fmt_dir never load a half-written format
+        job = f"{name}-build-{os.getpid()}"
+        with open(os.path.join(self.fmt_dir, f"{job}.tex"), "w") as f:
+            f.write(preamble + BEGIN_DOCUMENT + "\n\\end{document}\n")
+
+        try:
+            process = _run_pdflatex(
+                ["-ini", "-interaction=nonstopmode", f"-jobname={job}", "&pdflatex", "mylatexformat.ltx", f"{job}.tex"],
+                cwd=self.fmt_dir,
+            )
+            built = process.returncode == 0 and os.path.exists(os.path.join(self.fmt_dir, f"{job}.fmt"))
+            if built:
+                os.replace(os.path.join(self.fmt_dir, f"{job}.fmt"), os.path.join(self.fmt_dir, f"{name}.fmt"))
+        except CompileLimitExceeded:
+            built = False
+        if not built:
+            logger.warning(f"Could not build LaTeX format {name}, compiling without it")
+            self._failed.add(name)
+            self.stats_counters.incr("build_failures")
+            return False
+
+        logger.info(f"Built LaTeX format {name}")
+        self.stats_counters.incr("builds")
+        return True
+
+
+class WarmCompilerPool:
+    """
+    Pool of long-lived worker directories sharing a precompiled format cache.
+
+    Args:
+        size: Number of worker directories, i.e. maximum concurrent compiles.
+        root_dir: Directory holding the worker directories.
+        fmt_dir: Directory for precompiled formats, which may be shared between
+            processes. Defaults to ``<root_dir>/formats``.
+    """
+
+    def __init__(self, size: int, root_dir: str, fmt_dir: Optional[str] = None):
+        self.root_dir = os.path.abspath(root_dir)
+        self.formats = FormatCache(os.path.abspath(fmt_dir or os.path.join(self.root_dir, "formats")))
+        self._workers: "queue.Queue[str]" = queue.Queue()
+        for i in range(size):
+            work_dir = os.path.join(self.root_dir, f"worker-{i}")
+            os.makedirs(work_dir, exist_ok=True)
+            self._workers.put(work_dir)
+
+    def compile(self, latex_content: str) -> CompileResult:
+        work_dir = self._workers.get()
+        try:
+            fmt_name = self.formats.get(latex_content)
+            if fmt_name is None:
+                return _compile_in_dir(work_dir, latex_content)
+            try:
+                return _compile_in_dir(work_dir, latex_content, fmt_name, self.formats.fmt_dir)
+            except LatexCompilationError as e:
+                if e.log and not any(marker in e.log for marker in FORMAT_ERROR_MARKERS):
+                    raise
+                # A stale or incompatible format must not break compilation
+                logger.warning(f"Could not load format {fmt_name}, retrying without it")
+                self.formats.invalidate(fmt_name)
+                return _compile_in_dir(work_dir, latex_content)
+        finally:
+            self._workers.put(work_dir)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"formats": self.formats.stats_counters.snapshot(), "idle_workers": self._workers.qsize()}
+
+
+_warm_pool: Optional[WarmCompilerPool] = None
+_warm_pool_lock = threading.Lock()
+
+
+def _get_warm_pool() -> WarmCompilerPool:
+    global _warm_pool
+    if _warm_pool is None:
+        with _warm_pool_lock:
+            if _warm_pool is None:
+                size = settings.PDF_COMPILE_CONCURRENCY or os.cpu_count() or 1
+                _warm_pool = WarmCompilerPool(size, settings.LATEX_WORK_DIR)
+    return _warm_pool
+
+
+def compile_latex(latex_content: str) -> CompileResult:
+    """
+    Compiles LaTeX content to PDF and reports how many passes it took.
+    """
+    if settings.LATEX_COMPILE_BACKEND == "warm":
+        return _get_warm_pool().compile(latex_content)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        return _compile_in_dir(temp_dir, latex_content)
+
 
 def compile_pdf(latex_content: str) -> bytes:
     """
     Compiles LaTeX content to PDF and returns the binary data.
     """
-    with tempfile.TemporaryDirectory() as temp_dir:
-        tex_file = os.path.join(temp_dir, "resume.tex")
-        
-        with open(tex_file, "w") as f:
-            f.write(latex_content)
-            
-        # Run pdflatex twice to resolve references
-        for _ in range(2):
-            process = subprocess.run(
-                ["pdflatex", "-interaction=nonstopmode", "resume.tex"],
-                cwd=temp_dir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
-        pdf_file = os.path.join(temp_dir, "resume.pdf")
-        
-        if os.path.exists(pdf_file):
-            with open(pdf_file, "rb") as f:
-                return f.read()
-        else:
-            # Return error log if PDF not created
-            log_file = os.path.join(temp_dir, "resume.log")
-            if os.path.exists(log_file):
-                with open(log_file, "r") as f:
-                    raise Exception(f"LaTeX Compilation Error:\n{f.read()}")
-            raise Exception("PDF generation failed unknown error")
+    return compile_latex(latex_content).pdf
+
+
+def compiler_stats() -> Dict[str, Any]:
+    """Returns the active backend, pass counts and, once in use, warm pool statistics."""
+    counters = pass_stats.snapshot()
+    stats = {
+        "backend": settings.LATEX_COMPILE_BACKEND,
+        **counters,
+        "avg_passes": round(counters["passes"] / counters["compiles"], 2) if counters["compiles"] else 0.0,
+    }
+    if _warm_pool is not None:
+        stats.update(_warm_pool.stats())
+    return stats
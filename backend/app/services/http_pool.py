@@ -0,0 +1,23 @@
+"""
+Connection pool settings for LLM provider clients.
+
+OpenAI calls go through the SDK's own HTTP client, which langchain-openai
+already shares across the process and keeps alive; a separate httpx pool
+measured slower under concurrency (see scripts/bench_llm_client.py). Bedrock
+clients are built by botocore with a pool of 10 connections by default, so
+they get a Config with our pool size and timeouts.
+"""
+from app.core.config import settings
+
+
+def botocore_config():
+    """Returns a botocore Config with our pool size and timeouts, for Bedrock."""
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+        connect_timeout=settings.LLM_HTTP_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=settings.LLM_TIMEOUT_SECONDS,
+        tcp_keepalive=True,
+        retries={"max_attempts": 2, "mode": "standard"},
+    )
@@ -0,0 +1,219 @@
+"""
+Token budgeting for job descriptions ahead of analysis.
+
+Pasted JDs often carry EEO statements, benefits lists and company
+boilerplate that say nothing about the role, and some are enormous. The raw
+text is split into sections (on blank lines and heading-like lines),
+boilerplate sections are dropped, and the remainder is cut down to a token
+budget by keeping the most relevant sections first, in their original order.
+Tokens are counted with tiktoken when it is installed and its encoding can
+be loaded (it is downloaded on first use), otherwise estimated.
+"""
+import logging
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.core.cache import CacheStats
+from app.core.config import settings
+
+try:
+    import tiktoken
+except ImportError:  # Optional; fall back to an estimate
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Counts tokens with tiktoken's cl100k_base, or estimates ~4 chars per token."""
+    global _encoding, tiktoken
+    if tiktoken is not None and _encoding is None:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            # Offline hosts cannot fetch the encoding; do not retry on every call
+            logger.warning(f"tiktoken encoding unavailable, estimating tokens instead: {e}")
+            tiktoken = None
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / 4)
+
+
+# Headings of sections that never matter for the analysis
+_BOILERPLATE_HEADINGS = re.compile(
+    r"^(about (us|the company|the team|our (company|team))|company (overview|description)|who we are"
+    r"|our (mission|story|values|culture)"
+    r"|(what we offer|benefits|perks)( (and|&) (perks|benefits))?|compensation( and benefits)?"
+    r"|equal (employment )?opportunity.*|eeo.*|diversity.*|privacy.*|accommodations?"
+    r"|how to apply|application process)\s*:?$",
+    re.IGNORECASE,
+)
+# Phrases typical of boilerplate paragraphs without a heading
+_BOILERPLATE_PHRASES = re.compile(
+    r"equal opportunity employer|without regard to|protected veteran|sexual orientation|gender identity"
+    r"|national origin|reasonable accommodation|e-verify|background check|privacy (notice|policy)"
+    r"|401\(?k\)?|paid time off|\bpto\b|health,? dental|dental and vision|parental leave|wellness"
+    r"|stock options|free lunch|our mission|founded in|we are proud",
+    re.IGNORECASE,
+)
+# Headings and phrases that mark the parts the analysis needs most
+_RELEVANT_HEADINGS = re.compile(
+    r"requirement|qualification|responsibilit|what you('| wi)ll do|what you bring|you have|skills"
+    r"|experience|nice to have|preferred|the role|about (you|this (role|position|job))|your impact|tech stack",
+    re.IGNORECASE,
+)
+_RELEVANT_PHRASES = re.compile(
+    r"\b(\d+\+? years|experience (with|in)|proficien|knowledge of|familiar|required|must have|preferred"
+    r"|responsible for|you will|design|build|develop|degree)\b",
+    re.IGNORECASE,
+)
+_HEADING_LINE = re.compile(r"^\s*(#{1,6}\s*|\*\*)?([A-Za-z][^.!?:]{0,60}?)(\*\*)?\s*(:)?\s*$")
+
+
+@dataclass
+class CompactedJD:
+    """The compacted text plus what compaction did to it."""
+    text: str
+    original_tokens: int
+    tokens: int
+    dropped_sections: int = 0
+    truncated: bool = False
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.tokens
+
+
+def _heading(line: str) -> Optional[str]:
+    """Returns the heading text if a line looks like a section heading."""
+    match = _HEADING_LINE.match(line)
+    if not match or len(line.split()) > 8:
+        return None
+    text = match.group(2).strip()
+    marked = match.group(1) or match.group(4)  # "# Heading", "**Heading**" or "Heading:"
+    title_case = len(text.split()) <= 5 and (text.isupper() or text.istitle())
+    return text if marked or title_case else None
+
+
+def split_sections(text: str) -> List[str]:
+    """Splits a JD into sections on blank lines and heading-like lines."""
+    sections: List[List[str]] = [[]]
+    for line in text.splitlines():
+        if not line.strip():
+            if sections[-1]:
+                sections.append([])
+            continue
+        if _heading(line) and sections[-1] and not _heading(sections[-1][-1]):
+            sections.append([])
+        sections[-1].append(line.rstrip())
+    return ["\n".join(lines) for lines in sections if lines]
+
+
+def is_boilerplate(section: str) -> bool:
+    first_line = section.split("\n", 1)[0]
+    heading = _heading(first_line)
+    if heading and _RELEVANT_HEADINGS.search(heading):
+        return False
+    if heading and _BOILERPLATE_HEADINGS.match(heading):
+        # Keep a mislabelled section that still describes the role
+        body = section.split("\n", 1)[1] if "\n" in section else ""
+        return not _RELEVANT_PHRASES.search(body)
+    hits = len(_BOILERPLATE_PHRASES.findall(section))
+    return hits >= 2 and not _RELEVANT_PHRASES.search(section)
+
+
+def relevance(section: str) -> float:
+    """Scores how much a section tells about the role itself."""
+    heading = _heading(section.split("\n", 1)[0])
+    score = 10.0 if heading and _RELEVANT_HEADINGS.search(heading) else 0.0
+    words = max(len(section.split()), 1)
+    score += 100.0 * len(_RELEVANT_PHRASES.findall(section)) / words
+    score -= 100.0 * len(_BOILERPLATE_PHRASES.findall(section)) / words
+    return score
+
+
+def _truncate(section: str, budget: int) -> str:
+    """Cuts a section down to roughly ``budget`` tokens at a word boundary."""
+    words = section.split(" ")
+    low, high = 0, len(words)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(" ".join(words[:mid])) <= budget:
+            low = mid
+        else:
+            high = mid - 1
+    return " ".join(words[:low])
+
+
+class JDCompactor:
+    """
+    Drops boilerplate from JDs and fits them into a token budget.
+
+    Args:
+        token_budget: Maximum tokens kept; 0 only drops boilerplate.
+    """
+
+    def __init__(self, token_budget: int):
+        self.token_budget = token_budget
+        self.stats_counters = CacheStats(
+            "requests", "original_tokens", "tokens", "tokens_saved", "dropped_sections", "truncated"
+        )
+
+    def compact(self, raw_text: str) -> CompactedJD:
+        original_tokens = count_tokens(raw_text)
+        sections = split_sections(raw_text)
+        kept = [section for section in sections if not is_boilerplate(section)]
+        if not kept:
+            kept = sections  # Everything looked like boilerplate; don't throw it all away
+        dropped = len(sections) - len(kept)
+
+        truncated = False
+        if self.token_budget:
+            costs = [count_tokens(section) for section in kept]
+            if sum(costs) > self.token_budget:
+                truncated = True
+                order = sorted(range(len(kept)), key=lambda i: relevance(kept[i]), reverse=True)
+                remaining = self.token_budget
+                selected: Dict[int, str] = {}
+                for i in order:
+                    if costs[i] <= remaining:
+                        selected[i] = kept[i]
+                        remaining -= costs[i]
+                    elif remaining > 20:
+                        selected[i] = _truncate(kept[i], remaining)
+                        remaining = 0
+                kept = [selected[i] for i in sorted(selected)]
+
+        text = "\n\n".join(kept) if dropped or truncated else raw_text
+        result = CompactedJD(
+            text=text,
+            original_tokens=original_tokens,
+            tokens=count_tokens(text),
+            dropped_sections=dropped,
+            truncated=truncated,
+        )
+        self.stats_counters.incr("requests")
+        self.stats_counters.incr("original_tokens", result.original_tokens)
+        self.stats_counters.incr("tokens", result.tokens)
+        self.stats_counters.incr("tokens_saved", result.tokens_saved)
+        self.stats_counters.incr("dropped_sections", dropped)
+        self.stats_counters.incr("truncated", int(truncated))
+        if result.tokens_saved:
+            logger.info(f"Compacted JD from {result.original_tokens} to {result.tokens} tokens "
+                        f"({dropped} boilerplate sections dropped, truncated={truncated})")
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats_counters.snapshot(),
+            "token_budget": self.token_budget,
+            "tokenizer": "tiktoken" if tiktoken is not None else "estimate",
+        }
+
+
+# Global instance
+jd_compactor = JDCompactor(token_budget=settings.JD_TOKEN_BUDGET)
@@ -0,0 +1,128 @@
+"""
+Database-backed store of job description analyses.
+
+Analyses are keyed on the normalized JD text, so the same posting pasted by
+different users is only analyzed once. Reposts that differ in whitespace,
+tracking links or dates are matched through MinHash/LSH similarity and reuse
+the stored analysis when they clear the configured threshold and mention the
+same numbers and seniority words (so a "3+ years" posting never reuses the
+analysis of an "8+ years" one).
+"""
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheStats
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.job_description import JDAnalysis
+from app.models.sql_models import JDAnalysisBand, JDAnalysisRecord
+from app.services.similarity import MinHasher, normalize_text, qualifiers, shingles
+
+logger = logging.getLogger(__name__)
+
+
+class JDAnalysisStore:
+    """
+    Looks up and saves JD analyses with exact and near-duplicate matching.
+
+    Database errors are logged and treated as misses, so the store never
+    breaks analysis itself.
+
+    Args:
+        session_factory: Callable returning a new SQLAlchemy session.
+        threshold: Minimum estimated similarity for a near-duplicate match.
+        hasher: MinHasher used for signatures and LSH band keys.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal,
+                 threshold: float = 0.9, hasher: Optional[MinHasher] = None):
+        self.session_factory = session_factory
+        self.threshold = threshold
+        self.hasher = hasher or MinHasher()
+        self.stats_counters = CacheStats("exact_hits", "near_hits", "misses", "saves")
+
+    @staticmethod
+    def text_hash(normalized: str) -> str:
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def lookup(self, raw_text: str) -> Optional[JDAnalysis]:
+        """Returns the stored analysis for this JD or a near-identical one, if any."""
+        normalized = normalize_text(raw_text)
+        if not normalized:
+            return None
+        db = self.session_factory()
+        try:
+            record = db.query(JDAnalysisRecord).filter(
+                JDAnalysisRecord.text_hash == self.text_hash(normalized)
+            ).first()
+            if record is not None:
+                self.stats_counters.incr("exact_hits")
+                return JDAnalysis(**record.analysis)
+
+            signature = self.hasher.signature(shingles(normalized))
+            candidates = db.query(JDAnalysisRecord).join(JDAnalysisBand).filter(
+                JDAnalysisBand.band_key.in_(self.hasher.band_keys(signature))
+            ).distinct().all()
+            required = qualifiers(normalized)
+            best, best_score = None, 0.0
+            for candidate in candidates:
+                if candidate.qualifiers != required:
+                    continue
+                score = self.hasher.similarity(signature, candidate.minhash)
+                if score > best_score:
+                    best, best_score = candidate, score
+            if best is not None and best_score >= self.threshold:
+                logger.info(f"Reusing JD analysis {best.id} (similarity {best_score:.2f})")
+                self.stats_counters.incr("near_hits")
+                return JDAnalysis(**best.analysis)
+        except SQLAlchemyError as e:
+            logger.warning(f"JD analysis lookup failed: {e}")
+        finally:
+            db.close()
+        self.stats_counters.incr("misses")
+        return None
+
+    def save(self, raw_text: str, analysis: JDAnalysis) -> None:
+        """Stores an analysis under the normalized JD text."""
+        normalized = normalize_text(raw_text)
+        if not normalized:
+            return
+        signature = self.hasher.signature(shingles(normalized))
+        db = self.session_factory()
+        try:
+            record = JDAnalysisRecord(
+                text_hash=self.text_hash(normalized),
+                minhash=signature,
+                qualifiers=qualifiers(normalized),
+                analysis=analysis.model_dump(),
+                created_at=datetime.now().isoformat(),
+                bands=[JDAnalysisBand(band_key=key) for key in self.hasher.band_keys(signature)],
+            )
+            db.add(record)
+            db.commit()
+            self.stats_counters.incr("saves")
+        except IntegrityError:
+            db.rollback()  # Saved concurrently by another request
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"JD analysis save failed: {e}")
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        counters = self.stats_counters.snapshot()
+        hits = counters["exact_hits"] + counters["near_hits"]
+        lookups = hits + counters["misses"]
+        return {**counters, "hit_ratio": round(hits / lookups, 4) if lookups else 0.0}
+
+
+# Global instance
+jd_analysis_store = JDAnalysisStore(
+    threshold=settings.JD_SIMILARITY_THRESHOLD,
+    hasher=MinHasher(num_perm=settings.JD_MINHASH_PERMUTATIONS, bands=settings.JD_LSH_BANDS),
+)
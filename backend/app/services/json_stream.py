@@ -0,0 +1,166 @@
+"""
+Incremental JSON parsing for streamed LLM output.
+
+The parser is fed text chunks as they arrive and reports every value that
+has been completely received, together with its path in the document, e.g.
+``("summary",)`` or ``("experience", 0)``. Only values up to a configurable
+depth are decoded, so a large document is not re-parsed for every token.
+Text before the first ``{``/``[`` (such as a markdown code fence) and after
+the end of the document is ignored.
+"""
+import json
+from typing import Any, List, Optional, Tuple, Union
+
+PathItem = Union[str, int]
+Path = Tuple[PathItem, ...]
+
+_WHITESPACE = " \t\r\n"
+_LITERAL_END = ",}]" + _WHITESPACE
+
+
+class _Frame:
+    """An object or array whose closing bracket has not been seen yet."""
+    __slots__ = ("kind", "path", "start", "key", "index", "expect_key")
+
+    def __init__(self, kind: str, path: Path, start: int):
+        self.kind = kind
+        self.path = path
+        self.start = start
+        self.key: Optional[str] = None
+        self.index = 0
+        self.expect_key = kind == "{"
+
+    def child_path(self) -> Path:
+        return self.path + ((self.key,) if self.kind == "{" else (self.index,))
+
+
+class IncrementalJSONParser:
+    """
+    Push parser that yields completed values as a JSON document streams in.
+
+    Usage:
+        parser = IncrementalJSONParser(max_depth=2)
+        for chunk in chunks:
+            for path, value in parser.feed(chunk):
+                ...
+
+    The root value is reported last, with the empty path.
+
+    Args:
+        max_depth: Deepest path length reported (the root has depth 0).
+
+    Raises:
+        ValueError: From feed(), if a completed value is not valid JSON.
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self.done = False
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._started = False
+        # Scalar currently being read: "string", "key", "literal" or None
+        self._scalar: Optional[str] = None
+        self._scalar_start = 0
+        self._scalar_path: Path = ()
+        self._escaped = False
+
+    def feed(self, chunk: str) -> List[Tuple[Path, Any]]:
+        """Adds text and returns the (path, value) pairs completed by it."""
+        if self.done:
+            return []
+        self._buffer += chunk
+        events: List[Tuple[Path, Any]] = []
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer) and not self.done:
+            c = buffer[i]
+            if self._scalar in ("string", "key"):
+                if self._escaped:
+                    self._escaped = False
+                elif c == "\\":
+                    self._escaped = True
+                elif c == '"':
+                    self._end_string(i + 1, events)
+                i += 1
+                continue
+            if self._scalar == "literal":
+                if c not in _LITERAL_END:
+                    i += 1
+                    continue
+                self._scalar = None
+                self._finish(self._scalar_path, self._scalar_start, i, events)
+                # Fall through: the delimiter still has to be processed
+
+            if not self._started:
+                if c in "{[":
+                    self._started = True
+                    self._stack.append(_Frame(c, (), i))
+                i += 1
+                continue
+
+            if c in _WHITESPACE:
+                pass
+            elif c in "{[":
+                self._stack.append(_Frame(c, self._stack[-1].child_path(), i))
+            elif c in "}]":
+                frame = self._stack.pop()
+                self._finish(frame.path, frame.start, i + 1, events)
+            elif c == '"':
+                frame = self._stack[-1]
+                if frame.kind == "{" and frame.expect_key:
+                    self._scalar = "key"
+                else:
+                    self._scalar = "string"
+                    self._scalar_path = frame.child_path()
+                self._scalar_start = i
+            elif c == ":":
+                self._stack[-1].expect_key = False
+            elif c == ",":
+                frame = self._stack[-1]
+                if frame.kind == "{":
+                    frame.expect_key = True
+                else:
+                    frame.index += 1
+            else:
+                self._scalar = "literal"
+                self._scalar_start = i
+                self._scalar_path = self._stack[-1].child_path()
+            i += 1
+        self._pos = i
+        return events
+
+    def _end_string(self, end: int, events: List[Tuple[Path, Any]]) -> None:
+        kind, self._scalar = self._scalar, None
+        if kind == "key":
+            self._stack[-1].key = json.loads(self._buffer[self._scalar_start:end])
+        else:
+            self._finish(self._scalar_path, self._scalar_start, end, events)
+
+    def _finish(self, path: Path, start: int, end: int, events: List[Tuple[Path, Any]]) -> None:
+        if not self._stack:
+            self.done = True
+        if len(path) <= self.max_depth:
+            try:
+                value = json.loads(self._buffer[start:end])
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON value at {list(path)}: {e}") from e
+            events.append((path, value))
+
+
+def iter_values(value: Any, max_depth: int = 2, path: Path = ()) -> List[Tuple[Path, Any]]:
+    """
+    Returns the (path, value) pairs IncrementalJSONParser would report for an
+    already-parsed document, in the same order.
+    """
+    events: List[Tuple[Path, Any]] = []
+    if len(path) < max_depth:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                events.extend(iter_values(item, max_depth, path + (key,)))
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                events.extend(iter_values(item, max_depth, path + (index,)))
+    events.append((path, value))
+    return events
@@ -0,0 +1,257 @@
+"""
+Local, deterministic job description analysis.
+
+Produces a JDAnalysis in milliseconds without any network call, for the
+fast analysis mode and as the fallback when the LLM is unavailable. Skills
+come from a bundled dictionary (data/skills.json) matched in a single pass
+with an Aho-Corasick automaton; the section a skill appears in decides
+whether it is required or preferred, and how often it appears drives its
+importance.
+"""
+import json
+import os
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.models.job_description import JDAnalysis, Keyword
+from app.services.jd_compaction import split_sections
+
+SKILLS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "skills.json")
+
+# Characters that may not directly follow or precede a match ("C" in "C++", "R" in "R&D")
+_WORD_CHARS = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_+#&")
+
+_REQUIRED_HEADING = re.compile(
+    r"requirement|qualification|must have|what you('| wi)ll (need|bring)|what you bring|you have|you are|skills",
+    re.IGNORECASE,
+)
+_PREFERRED_HEADING = re.compile(r"preferred|nice to have|bonus|plus|desired|good to have", re.IGNORECASE)
+_PREFERRED_LINE = re.compile(r"preferred|nice to have|bonus|a plus|desirable|ideally", re.IGNORECASE)
+_RESPONSIBILITY_HEADING = re.compile(
+    r"responsibilit|what you('| wi)ll do|the role|your impact|day to day|duties|you will", re.IGNORECASE
+)
+# Words before a capital letter that make it a label ("Series C", "Type R"), and
+# letter pairs such as "R and D" where the other letter is not a skill
+_LETTER_LABEL_BEFORE = re.compile(
+    r"\b(series|type|class|grade|tier|level|phase|round|plan|option|vitamin|section|part|model)\s+$",
+    re.IGNORECASE,
+)
+_LETTER_PAIR_AFTER = re.compile(r"^\s*(?:and|&)\s*([A-Z])(?![\w+#&])")
+_LETTER_PAIR_BEFORE = re.compile(r"(?<![\w+#&])([A-Z])\s*(?:and|&)\s*$")
+_BULLET = re.compile(r"^\s*(?:[-*•●]|\d+[.)])\s+(.*\S)")
+_YEARS = re.compile(r"\b(\d{1,2})\s*\+?\s*(?:(?:-|to)\s*\d{1,2}\s*\+?\s*)?years?\b", re.IGNORECASE)
+# Years only count towards the level when the same line talks about experience
+_EXPERIENCE = re.compile(r"\bexperience", re.IGNORECASE)
+_SENIORITY = (
+    ("Intern", re.compile(r"\b(intern|internship)\b", re.IGNORECASE)),
+    ("Principal", re.compile(r"\b(principal|distinguished)\b", re.IGNORECASE)),
+    ("Staff", re.compile(r"\bstaff\b", re.IGNORECASE)),
+    ("Lead", re.compile(r"\b(lead|head of)\b", re.IGNORECASE)),
+    ("Senior", re.compile(r"\b(senior|sr\.?)\b", re.IGNORECASE)),
+    ("Junior", re.compile(r"\b(junior|jr\.?|entry[- ]level|graduate)\b", re.IGNORECASE)),
+)
+_TITLE_PREFIX = re.compile(r"^\s*(job title|title|position|role)\s*:\s*", re.IGNORECASE)
+
+
+class AhoCorasick:
+    """
+    Multi-pattern string matcher.
+
+    Finds every occurrence of every pattern in one pass over the text,
+    regardless of how many patterns there are.
+    """
+
+    def __init__(self, patterns: Dict[str, str]):
+        """
+        Args:
+            patterns: Maps each pattern string to the value reported for it.
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._out[state].append((len(pattern), value))
+
+        # Breadth-first construction of failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0) if state else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yields (start, end, value) for every match, including overlapping ones."""
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._out[state]:
+                yield i - length + 1, i + 1, value
+
+
+@dataclass
+class _SkillStats:
+    category: str
+    count: int = 0
+    required: bool = False
+    preferred: bool = False
+    in_title: bool = False
+    first_seen: int = 0
+
+
+class KeywordExtractor:
+    """
+    Dictionary-based JD analyzer.
+
+    Args:
+        skills_path: JSON list of {"term", "category", "aliases",
+            "case_sensitive"} entries. A case-sensitive term (such as "Go",
+            "R" or "REST") only matches with the same capitalization; its
+            aliases ("golang", "restful") match in any case.
+    """
+
+    def __init__(self, skills_path: str = SKILLS_PATH):
+        with open(skills_path, encoding="utf-8") as f:
+            entries = json.load(f)
+        self.categories: Dict[str, str] = {}
+        folded: Dict[str, str] = {}
+        exact: Dict[str, str] = {}
+        for entry in entries:
+            term = entry["term"]
+            self.categories[term] = entry["category"]
+            if entry.get("case_sensitive"):
+                exact[term] = term
+            else:
+                folded[term.lower()] = term
+            for alias in entry.get("aliases", []):
+                folded[alias.lower()] = term
+        self._folded = AhoCorasick(folded)
+        self._exact = AhoCorasick(exact)
+        self._names = (folded, exact)
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Returns the dictionary term when ``name`` is exactly a skill or one of its aliases."""
+        folded, exact = self._names
+        name = name.strip()
+        return exact.get(name) or folded.get(name.lower())
+
+    def find_skills(self, text: str) -> List[Tuple[int, str]]:
+        """Returns (position, term) for every whole-word skill mention, in order."""
+        matches = []
+        for matcher, haystack in ((self._folded, text.lower()), (self._exact, text)):
+            for start, end, term in matcher.finditer(haystack):
+                before = haystack[start - 1] if start else " "
+                after = haystack[end] if end < len(haystack) else " "
+                if before in _WORD_CHARS or after in _WORD_CHARS:
+                    continue
+                if end - start == 1 and self._is_letter_label(text, start, end):
+                    continue
+                matches.append((start, term))
+        matches.sort()
+        return matches
+
+    def _is_letter_label(self, text: str, start: int, end: int) -> bool:
+        """Tells whether a one-letter match is a label ("Series C") or half of a pair ("R and D")."""
+        before, after = text[max(start - 20, 0):start], text[end:end + 20]
+        if _LETTER_LABEL_BEFORE.search(before):
+            return True
+        pair = _LETTER_PAIR_AFTER.match(after) or _LETTER_PAIR_BEFORE.search(before)
+        return bool(pair) and self.canonical(pair.group(1)) is None
+
+    def analyze(self, raw_text: str) -> JDAnalysis:
+        """Builds a JDAnalysis from the JD text alone."""
+        lines = [line for line in raw_text.splitlines() if line.strip()]
+        title = _TITLE_PREFIX.sub("", lines[0]).strip() if lines else ""
+        if len(title.split()) > 10:
+            title = ""
+
+        stats: Dict[str, _SkillStats] = {}
+        responsibilities: List[str] = []
+        for section in split_sections(raw_text):
+            heading, _, body = section.partition("\n")
+            section_preferred = bool(_PREFERRED_HEADING.search(heading))
+            section_required = not section_preferred and bool(_REQUIRED_HEADING.search(heading))
+            if _RESPONSIBILITY_HEADING.search(heading) and not section_required:
+                responsibilities.extend(m.group(1) for m in map(_BULLET.match, body.splitlines()) if m)
+            for line in section.splitlines():
+                preferred = section_preferred or bool(_PREFERRED_LINE.search(line))
+                for _, term in self.find_skills(line):
+                    skill = stats.get(term)
+                    if skill is None:
+                        skill = stats[term] = _SkillStats(self.categories[term], first_seen=len(stats))
+                    skill.count += 1
+                    skill.preferred = skill.preferred or (preferred and not section_required)
+                    skill.required = skill.required or (section_required and not preferred)
+        for _, term in self.find_skills(title):
+            if term in stats:
+                stats[term].in_title = True
+
+        keywords = []
+        for term, skill in stats.items():
+            base = 4 if skill.required else 2 if skill.preferred and not skill.required else 3
+            importance = min(5, base + (skill.count - 1) + int(skill.in_title))
+            keywords.append((importance, skill.count, -skill.first_seen, term, skill))
+        keywords.sort(reverse=True)
+
+        return JDAnalysis(
+            role_type=title or "Unknown",
+            keywords=[Keyword(term=term, importance=importance, category=skill.category)
+                      for importance, _, _, term, skill in keywords],
+            required_skills=[term for _, _, _, term, skill in keywords if skill.required],
+            preferred_skills=[term for _, _, _, term, skill in keywords if skill.preferred and not skill.required],
+            experience_level=experience_level(title, raw_text),
+            key_responsibilities=responsibilities[:8],
+        )
+
+
+def experience_level(title: str, text: str) -> str:
+    """Guesses seniority from the title, falling back to required years of experience."""
+    for level, pattern in _SENIORITY:
+        if pattern.search(title):
+            return level
+    years = [
+        int(match.group(1)) for line in text.splitlines() if _EXPERIENCE.search(line)
+        for match in _YEARS.finditer(line)
+    ]
+    if not years:
+        return "Unknown"
+    minimum = min(years)
+    if minimum < 2:
+        return "Junior"
+    if minimum < 5:
+        return "Mid-level"
+    if minimum < 8:
+        return "Senior"
+    return "Staff"
+
+
+_extractor: Optional[KeywordExtractor] = None
+
+
+def get_extractor() -> KeywordExtractor:
+    """Returns the extractor for the bundled skills dictionary (loaded on first use)."""
+    global _extractor
+    if _extractor is None:
+        _extractor = KeywordExtractor()
+    return _extractor
+
+
+def extract_analysis(raw_text: str) -> JDAnalysis:
+    """Analyzes a JD with the bundled skills dictionary."""
+    return get_extractor().analyze(raw_text)
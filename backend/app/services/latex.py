@@ -1,30 +1,225 @@
 import os
-from jinja2 import Environment, FileSystemLoader
+import re
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from app.core.config import settings
+from app.core.exceptions import ServiceError
 from app.models.resume import Resume
 
 TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "templates")
-env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+TEMPLATE_EXTENSION = ".tex"
+DEFAULT_TEMPLATE_ALIAS = "default"
+# ContactInfo fields holding URLs, which are not escaped
+URL_FIELDS = ("linkedin", "github", "website")
+
+LATEX_SPECIAL_CHARS = {
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+    '\\': r'\textbackslash{}',
+}
+# A single compiled character class beats both per-character joins and
+# str.translate (which is slow with multi-character replacements).
+_LATEX_SPECIAL_RE = re.compile("[" + re.escape("".join(LATEX_SPECIAL_CHARS)) + "]")
+
+
+def _latex_replacement(match: "re.Match") -> str:
+    return LATEX_SPECIAL_CHARS[match.group()]
+
 
 # Custom filter to escape LaTeX special characters
 def latex_escape(value):
     if not isinstance(value, str):
         return value
-    chars = {
-        '&': r'\&',
-        '%': r'\%',
-        '$': r'\$',
-        '#': r'\#',
-        '_': r'\_',
-        '{': r'\{',
-        '}': r'\}',
-        '~': r'\textasciitilde{}',
-        '^': r'\textasciicircum{}',
-        '\\': r'\textbackslash{}',
-    }
-    return ''.join(chars.get(c, c) for c in value)
-
-env.filters['latex_escape'] = latex_escape
-
-def generate_latex(resume: Resume, template_name: str = "resume.tex") -> str:
-    template = env.get_template(template_name)
+    return _LATEX_SPECIAL_RE.sub(_latex_replacement, value)
+
+
+# Escaping a whole resume in one go: all strings are joined and run through a
+# fixed sequence of str.replace calls. Backslashes are parked on a sentinel
+# first so the backslashes and braces added by later replacements are not
+# escaped again.
+_FIELD_SEPARATOR = "\x01"
+_BACKSLASH_SENTINEL = "\x00"
+_REPLACEMENT_SEQUENCE = (
+    ('\\', _BACKSLASH_SENTINEL),
+    ('{', r'\{'),
+    ('}', r'\}'),
+    ('&', r'\&'),
+    ('%', r'\%'),
+    ('$', r'\$'),
+    ('#', r'\#'),
+    ('_', r'\_'),
+    ('~', r'\textasciitilde{}'),
+    ('^', r'\textasciicircum{}'),
+    (_BACKSLASH_SENTINEL, r'\textbackslash{}'),
+)
+
+
+def _escape_batch(strings: List[str]) -> List[str]:
+    """Escapes many strings at once; equivalent to mapping latex_escape over them."""
+    joined = _FIELD_SEPARATOR.join(strings)
+    if _BACKSLASH_SENTINEL in joined or joined.count(_FIELD_SEPARATOR) != len(strings) - 1:
+        return [latex_escape(value) for value in strings]
+    for old, new in _REPLACEMENT_SEQUENCE:
+        joined = joined.replace(old, new)
+    return joined.split(_FIELD_SEPARATOR)
+
+
+def _collect_strings(value: Any, out: List[str]) -> None:
+    if isinstance(value, str):
+        out.append(value)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_strings(item, out)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_strings(item, out)
+
+
+def _build_view(value: Any, escaped: Iterator[str]) -> Any:
+    if isinstance(value, str):
+        return next(escaped)
+    if isinstance(value, list):
+        return [_build_view(item, escaped) for item in value]
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _build_view(item, escaped) for key, item in value.items()})
+    return value
+
+
+def escape_resume(resume: Resume) -> SimpleNamespace:
+    """
+    Escapes every text field of a resume once, for templates to render directly.
+
+    Returns a lightweight view with the same attribute layout as the Resume.
+    URL fields are left as-is since \\href takes them verbatim. Templates
+    rendering this view must not apply the latex_escape filter again.
+    """
+    data = resume.model_dump(mode="json")
+    contact_urls = {field: data["contact_info"].pop(field) for field in URL_FIELDS}
+    project_urls = [project.pop("url") for project in data["projects"]]
+
+    strings: List[str] = []
+    _collect_strings(data, strings)
+    view = _build_view(data, iter(_escape_batch(strings)))
+    for field, url in contact_urls.items():
+        setattr(view.contact_info, field, url)
+    for project, url in zip(view.projects, project_urls):
+        project.url = url
+    return view
+
+
+class TemplateNotFoundError(ServiceError):
+    """Raised when a template_id does not match any template."""
+    def __init__(self, template_id: str):
+        super().__init__(status_code=404, detail=f"Unknown template: {template_id}")
+
+
+class TemplateRegistry:
+    """
+    Loads and compiles every template with a given extension in a directory once.
+
+    Template ids are file names without the extension; "default" is an
+    alias for ``settings.DEFAULT_TEMPLATE_ID``. With auto_reload (development
+    only) templates are re-checked on disk on every lookup; otherwise the
+    compiled templates are served straight from memory.
+
+    Args:
+        template_dir: Directory containing the templates.
+        auto_reload: Whether to pick up template edits without a restart.
+        bytecode_cache_dir: Optional directory for Jinja's bytecode cache,
+            which speeds up compiling templates at startup.
+        default_id: Template id that "default" resolves to.
+        extension: File extension of the templates to load.
+        **env_options: Extra jinja2.Environment options (e.g. autoescape).
+    """
+
+    def __init__(self, template_dir: str, auto_reload: bool = False,
+                 bytecode_cache_dir: Optional[str] = None, default_id: str = "resume",
+                 extension: str = TEMPLATE_EXTENSION, **env_options: Any):
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
+        self.template_dir = template_dir
+        self.auto_reload = auto_reload
+        self.default_id = default_id
+        self.extension = extension
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            auto_reload=auto_reload,
+            bytecode_cache=bytecode_cache,
+            **env_options,
+        )
+        self.env.filters['latex_escape'] = latex_escape
+        self._templates: Dict[str, Template] = {}
+        self.load()
+
+    def load(self) -> None:
+        """(Re)compiles every template in the template directory."""
+        templates = {}
+        for name in sorted(os.listdir(self.template_dir)):
+            if name.endswith(self.extension):
+                templates[name[:-len(self.extension)]] = self.env.get_template(name)
+        self._templates = templates
+
+    def template_ids(self) -> List[str]:
+        return list(self._templates)
+
+    def resolve(self, template_id: str) -> str:
+        """Returns the canonical id for a template id or alias."""
+        if template_id == DEFAULT_TEMPLATE_ALIAS:
+            template_id = self.default_id
+        if template_id not in self._templates:
+            # In development, templates added after startup are picked up too
+            is_new_file = (
+                self.auto_reload
+                and os.path.basename(template_id) == template_id
+                and os.path.isfile(os.path.join(self.template_dir, template_id + self.extension))
+            )
+            if not is_new_file:
+                raise TemplateNotFoundError(template_id)
+        return template_id
+
+    def get(self, template_id: str) -> Template:
+        template_id = self.resolve(template_id)
+        if self.auto_reload:
+            # Jinja re-checks the file's mtime and recompiles it if it changed
+            template = self.env.get_template(template_id + self.extension)
+            self._templates[template_id] = template
+            return template
+        return self._templates[template_id]
+
+
+# Global instance, compiled once at import (i.e. application startup)
+template_registry = TemplateRegistry(
+    TEMPLATE_DIR,
+    auto_reload=settings.ENVIRONMENT == "development",
+    bytecode_cache_dir=settings.TEMPLATE_BYTECODE_CACHE_DIR,
+    default_id=settings.DEFAULT_TEMPLATE_ID,
+)
+
+
+def generate_latex(resume: Resume, template_id: str = DEFAULT_TEMPLATE_ALIAS,
+                   pre_escape: Optional[bool] = None) -> str:
+    """
+    Renders a resume with the given template.
+
+    Args:
+        resume: The resume to render.
+        template_id: Template id or "default".
+        pre_escape: Render a view of the resume escaped once up front (see
+            escape_resume) instead of the raw model. Defaults to
+            ``settings.LATEX_PRE_ESCAPE``.
+    """
+    template = template_registry.get(template_id)
+    if settings.LATEX_PRE_ESCAPE if pre_escape is None else pre_escape:
+        return template.render(resume=escape_resume(resume))
     return template.render(resume=resume)
@@ -0,0 +1,84 @@
+"""
+Extraction of the first error from a pdflatex log.
+
+Handles both the classic ``! Message`` form and the ``file:line: message``
+form produced by ``-file-line-error``, and picks up the ``l.<n> ...`` context
+lines TeX prints after an error.
+"""
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+# TeX hard-wraps log lines at this width (max_print_line)
+LOG_LINE_WIDTH = 79
+MAX_SNIPPET_LENGTH = 160
+# How far after the error message TeX's "l.<n>" context line may appear
+CONTEXT_LOOKAHEAD = 20
+
+FILE_LINE_ERROR_RE = re.compile(r"^(?P<file>[^:\s]+\.(?:tex|sty|cls|def|cfg)):(?P<line>\d+): (?P<message>.*)$")
+CONTEXT_RE = re.compile(r"^l\.(?P<line>\d+) ?(?P<context>.*)$")
+# Summary lines printed after the real error in -halt-on-error mode
+IGNORED_MESSAGES = ("==> Fatal error occurred", "Emergency stop")
+
+
+@dataclass
+class LatexError:
+    """The first error pdflatex reported for a document."""
+    message: str
+    line: Optional[int] = None
+    snippet: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _truncate(text: str, limit: int = MAX_SNIPPET_LENGTH) -> str:
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def parse_latex_log(log: str, source: Optional[str] = None) -> Optional[LatexError]:
+    """
+    Returns the first error in a pdflatex log, or None if there is none.
+
+    Args:
+        log: Contents of the .log file.
+        source: The compiled LaTeX source, used for the snippet when the log
+            has no context line.
+    """
+    lines = log.splitlines()
+    for i, text in enumerate(lines):
+        match = FILE_LINE_ERROR_RE.match(text)
+        if match:
+            message, line = match.group("message"), int(match.group("line"))
+        elif text.startswith("!"):
+            message, line = text[1:].strip(), None
+        else:
+            continue
+        if not message or message.startswith(IGNORED_MESSAGES):
+            continue
+
+        # Long messages are wrapped onto the following line
+        if len(text) >= LOG_LINE_WIDTH and i + 1 < len(lines):
+            message += lines[i + 1].strip()
+
+        snippet = None
+        for j in range(i + 1, min(i + 1 + CONTEXT_LOOKAHEAD, len(lines))):
+            context = CONTEXT_RE.match(lines[j])
+            if context:
+                line = line or int(context.group("line"))
+                # TeX splits the context at the point of the error
+                rest = lines[j + 1].strip() if j + 1 < len(lines) else ""
+                snippet = f"{context.group('context')} {rest}".strip()
+                break
+
+        if not snippet and source and line:
+            source_lines = source.splitlines()
+            if 0 < line <= len(source_lines):
+                snippet = source_lines[line - 1].strip()
+
+        return LatexError(
+            message=_truncate(message),
+            line=line,
+            snippet=_truncate(snippet) if snippet else None,
+        )
+    return None
@@ -1,20 +1,75 @@
+import asyncio
+import copy
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
 from langchain_core.prompts import PromptTemplate
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers import JsonOutputParser
+from app.core.cache import CacheStats
+from app.core.config import settings
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.json_stream import IncrementalJSONParser, Path, iter_values
+from app.services.llm_cache import LLMResponseCache, llm_response_cache
 from app.services.llm_factory import LLMFactory
+from app.services.llm_router import LLMRouter
 
 logger = logging.getLogger(__name__)
 
+# Wraps every prompt so the model returns bare JSON
+JSON_PROMPT_TEMPLATE = """
+            {prompt}
+            
+            IMPORTANT: Return ONLY a valid JSON object. Do not include any explanations, markdown formatting, or code blocks.
+            """
+
+class LLMUnavailableError(Exception):
+    """Raised by streaming calls when no LLM can be reached."""
+
+class _InFlight:
+    """A provider call shared by every caller waiting on the same prompt."""
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
 class LLMClient:
     """
     Service class for interacting with the configured LLM provider.
     Uses LangChain for abstraction and robust JSON parsing.
+
+    Args:
+        cache: Response cache consulted before calling the provider.
+            Defaults to the global llm_response_cache; pass None to disable.
+
+        breaker: Circuit breaker guarding the provider. Defaults to one
+            configured from settings.
+
+    Concurrent calls with the same prompt are coalesced: one provider
+    request is made and its result is handed to every caller. Provider
+    calls are capped at ``settings.LLM_TIMEOUT_SECONDS``; repeated failures
+    or timeouts open the breaker, after which calls fail fast.
     """
     
-    def __init__(self):
+    def __init__(self, cache: Optional[LLMResponseCache] = llm_response_cache,
+                 breaker: Optional[CircuitBreaker] = None):
         self.llm = None
+        # Built once; the chain is rebuilt only when the model changes
+        self.prompt = PromptTemplate(
+            template=JSON_PROMPT_TEMPLATE,
+            input_variables=["prompt"]
+        )
         self.parser = JsonOutputParser()
+        self._chain = None
+        self._chain_llm = None
+        self.cache = cache
+        self.breaker = breaker or CircuitBreaker(
+            "llm",
+            failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.LLM_BREAKER_RESET_SECONDS,
+            half_open_max_calls=settings.LLM_BREAKER_HALF_OPEN_CALLS,
+        )
+        self.stats_counters = CacheStats("provider_calls", "deduplicated")
+        self._inflight: Dict[str, _InFlight] = {}
         self._initialize_llm()
 
     def _initialize_llm(self):
@@ -26,9 +81,20 @@ class LLMClient:
             logger.error(f"LLM initialization failed: {e}")
             self.llm = None
 
+    @property
+    def chain(self):
+        """The Prompt -> LLM -> JSON Parser chain for the current model."""
+        if self._chain is None or self._chain_llm is not self.llm:
+            self._chain = self.prompt | self.llm | self.parser
+            self._chain_llm = self.llm
+        return self._chain
+
     async def generate_json(self, prompt_text: str) -> Dict[str, Any]:
         """
         Generates a JSON response from the LLM based on the prompt.
+
+        Identical prompts to the same provider and model are answered from
+        the response cache; only successful, non-empty responses are cached.
         
         Args:
             prompt_text: The input prompt for the LLM.
@@ -36,35 +102,184 @@ class LLMClient:
         Returns:
             Dict[str, Any]: The parsed JSON response, or an empty dict on error.
         """
-        if not self.llm:
-            # Try to re-initialize in case config changed or transient error
-            self._initialize_llm()
-            if not self.llm:
-                logger.error("LLM client is not available.")
-                return {"error": "LLM service unavailable"}
+        if not self._ensure_llm():
+            return {"error": "LLM service unavailable"}
         
         try:
-            # Create a prompt template that enforces JSON output
-            template = """
-            {prompt}
-            
-            IMPORTANT: Return ONLY a valid JSON object. Do not include any explanations, markdown formatting, or code blocks.
-            """
-            
-            prompt = PromptTemplate(
-                template=template,
-                input_variables=["prompt"]
-            )
-            
-            # Create chain: Prompt -> LLM -> JSON Parser
-            chain = prompt | self.llm | self.parser
-            
-            result = await chain.ainvoke({"prompt": prompt_text})
-            return result
-            
+            key = self._cache_key(prompt_text)
+            use_cache = self.cache is not None and self.cache.enabled
+            if use_cache:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return cached
+
+            async def call_provider():
+                self.breaker.before_call()
+                self.stats_counters.incr("provider_calls")
+                try:
+                    result = await asyncio.wait_for(
+                        self.chain.ainvoke({"prompt": prompt_text}), timeout=settings.LLM_TIMEOUT_SECONDS
+                    )
+                except asyncio.CancelledError:
+                    # Every caller went away; the probe has no outcome to report
+                    self.breaker.release_probe()
+                    raise
+                except OutputParserException:
+                    # The provider answered; the answer just was not valid JSON
+                    self.breaker.record_success()
+                    raise
+                except asyncio.TimeoutError:
+                    self.breaker.record_failure()
+                    raise TimeoutError(f"LLM call timed out after {settings.LLM_TIMEOUT_SECONDS}s")
+                except Exception:
+                    self.breaker.record_failure()
+                    raise
+                self.breaker.record_success()
+                if use_cache and result:
+                    self.cache.put(key, result)
+                return result
+
+            return await self._single_flight(key, call_provider)
+
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping LLM call: {e}")
+            return {"error": "LLM service unavailable"}
         except Exception as e:
             logger.error(f"Error generating JSON from LLM: {e}")
             return {}
 
+    async def stream_json(self, prompt_text: str, max_depth: int = 2) -> AsyncIterator[Tuple[Path, Any]]:
+        """
+        Streams the JSON response to a prompt as its parts complete.
+
+        Yields (path, value) pairs from IncrementalJSONParser, ending with the
+        whole document under the empty path. A cached response is replayed
+        from the cache. Unlike generate_json, streamed calls are not
+        coalesced, and each chunk (rather than the whole call) must arrive
+        within ``settings.LLM_TIMEOUT_SECONDS``.
+
+        Raises:
+            LLMUnavailableError: If no LLM is configured or the breaker is open.
+            ValueError: If the response is not a complete JSON document.
+            TimeoutError: If the provider stalls.
+        """
+        if not self._ensure_llm():
+            raise LLMUnavailableError("LLM service unavailable")
+        key = self._cache_key(prompt_text)
+        use_cache = self.cache is not None and self.cache.enabled
+        cached = self.cache.get(key) if use_cache else None
+        if cached is not None:
+            for event in iter_values(cached, max_depth):
+                yield event
+            return
+
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError as e:
+            raise LLMUnavailableError(str(e)) from e
+        self.stats_counters.incr("provider_calls")
+        parser = IncrementalJSONParser(max_depth)
+        stream = (self.prompt | self.llm).astream({"prompt": prompt_text})
+        result = None
+        try:
+            while not parser.done:
+                try:
+                    chunk = await asyncio.wait_for(stream.__anext__(), timeout=settings.LLM_TIMEOUT_SECONDS)
+                except StopAsyncIteration:
+                    break
+                content = getattr(chunk, "content", chunk)
+                for path, value in parser.feed(content if isinstance(content, str) else ""):
+                    if path == ():
+                        result = value
+                    yield path, value
+        except (asyncio.CancelledError, GeneratorExit):
+            # The consumer stopped early; the call has no outcome to report
+            self.breaker.release_probe()
+            raise
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            raise TimeoutError(f"LLM stream stalled for {settings.LLM_TIMEOUT_SECONDS}s")
+        except ValueError:
+            # The provider answered; the answer just was not valid JSON
+            self.breaker.record_success()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        finally:
+            await stream.aclose()
+
+        self.breaker.record_success()
+        if result is None:
+            raise ValueError("LLM response ended before the JSON document was complete")
+        if use_cache and result:
+            self.cache.put(key, result)
+
+    def _ensure_llm(self) -> bool:
+        """Makes sure an LLM is initialized; returns False if none is available."""
+        if self.llm:
+            return True
+        # Try to re-initialize in case config changed or transient error,
+        # unless recent attempts failed and the breaker is open
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError as e:
+            logger.warning(f"LLM client is not available: {e}")
+            return False
+        self._initialize_llm()
+        if not self.llm:
+            self.breaker.record_failure()
+            logger.error("LLM client is not available.")
+            return False
+        self.breaker.record_success()
+        return True
+
+    def _cache_key(self, prompt_text: str) -> str:
+        return LLMResponseCache.make_key(
+            settings.LLM_PROVIDER, LLMFactory.model_name(), self.prompt.format(prompt=prompt_text)
+        )
+
+    async def _single_flight(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs call() once per key at a time and shares its outcome.
+
+        The call runs in its own task, so a cancelled caller does not cancel
+        it for the others; it is only cancelled once every caller has gone.
+        Exceptions are raised to every caller. Each caller gets its own copy
+        of the result.
+        """
+        entry = self._inflight.get(key)
+        if entry is None:
+            entry = _InFlight(asyncio.ensure_future(call()))
+            self._inflight[key] = entry
+            entry.task.add_done_callback(lambda _: self._forget(key, entry))
+        else:
+            self.stats_counters.incr("deduplicated")
+
+        entry.waiters += 1
+        try:
+            return copy.deepcopy(await asyncio.shield(entry.task))
+        finally:
+            entry.waiters -= 1
+            if entry.waiters == 0 and not entry.task.done():
+                # Nobody is waiting anymore; later callers start a fresh call
+                self._forget(key, entry)
+                entry.task.cancel()
+
+    def _forget(self, key: str, entry: _InFlight) -> None:
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns provider call and deduplication counters."""
+        stats = {
+            **self.stats_counters.snapshot(),
+            "in_flight": len(self._inflight),
+            "circuit": self.breaker.snapshot(),
+        }
+        if isinstance(self.llm, LLMRouter):
+            stats["router"] = self.llm.stats()
+        return stats
+
 # Global instance
 llm_client = LLMClient()
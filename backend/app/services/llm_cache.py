@@ -0,0 +1,203 @@
+"""
+Response cache for LLM calls.
+
+The factory pins temperature to 0.0, so an identical prompt sent to the same
+provider and model yields the same answer. Responses are keyed on a hash of
+provider, model and the final prompt text, and kept in a bounded in-memory
+LRU tier backed by a SQLite file that survives restarts. Both tiers expire
+entries after a TTL; the SQLite tier is also capped by entry count.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.core.cache import CacheStats, LRUCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+class LLMResponseCache:
+    """
+    Two-tier (memory + SQLite) cache of parsed LLM JSON responses.
+
+    Responses are stored as JSON text and decoded on every hit, so callers
+    can freely mutate what they get back.
+
+    Args:
+        memory_items: Maximum number of responses kept in memory.
+        db_path: SQLite file for the persistent tier, or None to disable it.
+        max_entries: Entry cap for the persistent tier. Least recently used
+            rows are deleted once the cap is exceeded.
+        ttl_seconds: Lifetime of an entry in both tiers; 0 keeps entries
+            until they are evicted.
+    """
+
+    def __init__(self, memory_items: int, db_path: Optional[str], max_entries: int,
+                 ttl_seconds: float = 0):
+        self.ttl_seconds = ttl_seconds or None
+        self.memory = LRUCache(memory_items, ttl_seconds=self.ttl_seconds)
+        self.max_entries = max_entries
+        self.stats_counters = CacheStats("memory_hits", "disk_hits", "misses", "expired", "evictions")
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if db_path and max_entries > 0:
+            try:
+                directory = os.path.dirname(db_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(_SCHEMA)
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"LLM response cache persistence disabled, cannot use {db_path}: {e}")
+                self._db = None
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str) -> str:
+        """Returns the cache key for a prompt sent to a provider's model."""
+        digest = hashlib.sha256()
+        for part in (provider, model, prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory.max_items > 0 or self._db is not None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached response for a key, or None on a miss."""
+        payload = self.memory.get(key)
+        if payload is not None:
+            self.stats_counters.incr("memory_hits")
+            return json.loads(payload)
+
+        payload = self._db_get(key)
+        if payload is not None:
+            self.stats_counters.incr("disk_hits")
+            self.memory.set(key, payload)
+            return json.loads(payload)
+
+        self.stats_counters.incr("misses")
+        return None
+
+    def put(self, key: str, response: Any) -> None:
+        """Stores a JSON-serialisable response in both tiers."""
+        try:
+            payload = json.dumps(response)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"LLM response not cached, not JSON-serialisable: {e}")
+            return
+        self.stats_counters.incr("evictions", self.memory.set(key, payload))
+        self._db_put(key, payload)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self._db is None:
+            return
+        with self._db_lock:
+            try:
+                self._db.execute("DELETE FROM llm_responses")
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache clear failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and current tier sizes."""
+        counters = self.stats_counters.snapshot()
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["misses"]
+        return {
+            **counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_items": len(self.memory),
+            "persistent_enabled": self._db is not None,
+            "persistent_items": self._db_count(),
+        }
+
+    def _db_count(self) -> int:
+        if self._db is None:
+            return 0
+        with self._db_lock:
+            try:
+                return self._db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            except sqlite3.Error:
+                return 0
+
+    def _db_get(self, key: str) -> Optional[str]:
+        if self._db is None:
+            return None
+        now = time.time()
+        with self._db_lock:
+            try:
+                row = self._db.execute(
+                    "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                payload, created_at = row
+                if self.ttl_seconds and created_at + self.ttl_seconds <= now:
+                    self._db.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                    self.stats_counters.incr("expired")
+                    return None
+                # Bump accessed_at so eviction treats this entry as recently used
+                self._db.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+                return payload
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache read failed for {key}: {e}")
+                return None
+
+    def _db_put(self, key: str, payload: str) -> None:
+        if self._db is None:
+            return
+        now = time.time()
+        with self._db_lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, response, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, payload, now, now),
+                )
+                self._evict_db(now)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache write failed for {key}: {e}")
+
+    def _evict_db(self, now: float) -> None:
+        """Drops expired rows, then least recently used rows beyond the cap."""
+        if self.ttl_seconds:
+            cursor = self._db.execute(
+                "DELETE FROM llm_responses WHERE created_at <= ?", (now - self.ttl_seconds,)
+            )
+            self.stats_counters.incr("expired", max(cursor.rowcount, 0))
+        count = self._db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        if count > self.max_entries:
+            cursor = self._db.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            self.stats_counters.incr("evictions", max(cursor.rowcount, 0))
+
+
+# Global instance
+llm_response_cache = LLMResponseCache(
+    memory_items=settings.LLM_CACHE_MEMORY_ITEMS if settings.LLM_CACHE_ENABLED else 0,
+    db_path=settings.LLM_CACHE_PATH if settings.LLM_CACHE_ENABLED else None,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+)
@@ -1,5 +1,11 @@
+from typing import Optional
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.runnables import Runnable
 from app.core.config import settings
+from app.services import http_pool
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.llm_router import LLMRouter, RouteTarget
+from app.services.replay_llm import ReplayChatModel
 import logging
 
 logger = logging.getLogger(__name__)
@@ -7,15 +13,48 @@ logger = logging.getLogger(__name__)
 class LLMFactory:
     """
     Factory class to create LLM instances based on configuration.
-    Supports: Gemini, OpenAI, Bedrock.
+    Supports: Gemini, OpenAI, Bedrock, a router over several of them, and a
+    record/replay model for offline runs.
+
+    OpenAI uses the SDK's own keep-alive client; Bedrock gets its pool size
+    and timeouts from http_pool. The Gemini client manages its own transport.
     """
     
     @staticmethod
-    def create_llm() -> BaseChatModel:
-        provider = settings.LLM_PROVIDER.lower()
+    def model_name(provider: Optional[str] = None) -> str:
+        """Returns the model id configured for a provider (default: the current one)."""
+        provider = (provider or settings.LLM_PROVIDER).lower()
+        if provider == "router":
+            return ",".join(f"{name}={LLMFactory.model_name(name)}" for name in sorted(settings.LLM_ROUTER_PROVIDERS))
+        if provider == "replay":
+            return settings.LLM_REPLAY_CASSETTE
+        return {
+            "gemini": settings.GEMINI_MODEL,
+            "openai": settings.OPENAI_MODEL,
+            "bedrock": settings.BEDROCK_MODEL,
+        }.get(provider, "")
+
+    @staticmethod
+    def create_llm(provider: Optional[str] = None) -> Runnable:
+        """Creates the chat model for a provider (default: settings.LLM_PROVIDER)."""
+        provider = (provider or settings.LLM_PROVIDER).lower()
         
         try:
-            if provider == "gemini":
+            if provider == "router":
+                return LLMFactory.create_router()
+
+            elif provider == "replay":
+                return ReplayChatModel(
+                    cassette_path=settings.LLM_REPLAY_CASSETTE,
+                    mode=settings.LLM_REPLAY_MODE,
+                    upstream=(LLMFactory.create_llm(settings.LLM_REPLAY_UPSTREAM)
+                              if settings.LLM_REPLAY_MODE == "record" else None),
+                    latency_ms=settings.LLM_REPLAY_LATENCY_MS,
+                    latency_jitter_ms=settings.LLM_REPLAY_LATENCY_JITTER_MS,
+                    seed=settings.LLM_REPLAY_SEED,
+                )
+
+            elif provider == "gemini":
                 from langchain_google_genai import ChatGoogleGenerativeAI
                 if not settings.GEMINI_API_KEY:
                     raise ValueError("GEMINI_API_KEY is missing")
@@ -35,7 +74,8 @@ class LLMFactory:
                 return ChatOpenAI(
                     model=settings.OPENAI_MODEL,
                     api_key=settings.OPENAI_API_KEY,
-                    temperature=0.0
+                    temperature=0.0,
+                    timeout=settings.LLM_TIMEOUT_SECONDS
                 )
                 
             elif provider == "bedrock":
@@ -54,7 +94,8 @@ class LLMFactory:
                 return ChatBedrock(
                     model_id=settings.BEDROCK_MODEL,
                     model_kwargs={"temperature": 0.0},
-                    region_name=settings.AWS_REGION
+                    region_name=settings.AWS_REGION,
+                    config=http_pool.botocore_config()
                 )
                 
             else:
@@ -63,3 +104,42 @@ class LLMFactory:
         except Exception as e:
             logger.error(f"Failed to initialize LLM provider '{provider}': {e}")
             raise e
+
+    @staticmethod
+    def create_router() -> LLMRouter:
+        """
+        Creates an LLMRouter over the providers in settings.LLM_ROUTER_PROVIDERS.
+
+        Providers that cannot be initialized (e.g. missing credentials) are
+        left out; it is an error if none can.
+        """
+        targets = []
+        for name, weight in settings.LLM_ROUTER_PROVIDERS.items():
+            if name.lower() == "router":
+                raise ValueError("The router cannot route to itself")
+            try:
+                model = LLMFactory.create_llm(name)
+            except Exception as e:
+                logger.warning(f"Leaving LLM provider '{name}' out of the router: {e}")
+                continue
+            targets.append(RouteTarget(
+                name=name,
+                model=model,
+                weight=weight,
+                timeout=settings.LLM_ROUTER_TIMEOUTS.get(name, settings.LLM_ROUTER_TIMEOUT_SECONDS),
+                breaker=CircuitBreaker(
+                    f"llm:{name}",
+                    failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+                    reset_timeout=settings.LLM_BREAKER_RESET_SECONDS,
+                    half_open_max_calls=settings.LLM_BREAKER_HALF_OPEN_CALLS,
+                ),
+            ))
+        if not targets:
+            raise ValueError("No LLM provider in LLM_ROUTER_PROVIDERS could be initialized")
+        return LLMRouter(
+            targets,
+            hedging=settings.LLM_HEDGE_ENABLED,
+            hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+            hedge_min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+            hedge_initial_delay=settings.LLM_HEDGE_INITIAL_DELAY_SECONDS,
+        )
@@ -0,0 +1,278 @@
+"""
+Routing LLM calls across several providers.
+
+The router is a LangChain Runnable that stands in for a single chat model.
+Each call goes to a primary provider picked at random by weight. If the
+primary has not answered once its usual latency (a percentile of its recent
+calls) has passed, a hedged duplicate is sent to the next provider and the
+first answer wins; the other call is cancelled. A provider that fails or
+times out is failed over to the next one straight away. Each provider has
+its own timeout and circuit breaker, so one that keeps failing is skipped.
+"""
+import asyncio
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from app.core.cache import CacheStats
+from app.services.circuit_breaker import OPEN, CircuitBreaker, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies."""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Returns the nearest-rank p-th percentile, or None without samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(math.ceil(p / 100.0 * len(samples)), 1)
+        return samples[rank - 1]
+
+
+class RouteTarget:
+    """
+    One provider behind the router.
+
+    Args:
+        name: Provider name, used in logs and stats.
+        model: The chat model (any Runnable) to call.
+        weight: Relative share of calls it is picked as primary for; 0 makes
+            it a standby used only for hedging and failover.
+        timeout: Seconds a single call may take before failing over.
+        breaker: Circuit breaker for this provider; defaults to a new one.
+        latency_window: Number of recent latencies kept for hedging.
+    """
+
+    def __init__(self, name: str, model: Runnable, weight: float = 1.0, timeout: float = 60.0,
+                 breaker: Optional[CircuitBreaker] = None, latency_window: int = 200):
+        self.name = name
+        self.model = model
+        self.weight = weight
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker(name)
+        self.latencies = LatencyTracker(latency_window)
+        self.stats_counters = CacheStats("calls", "successes", "failures", "timeouts", "cancelled",
+                                         "hedges", "hedge_wins")
+
+
+class LLMRouter(Runnable):
+    """
+    Runnable that hedges and fails over between several chat models.
+
+    Args:
+        targets: The providers, in order of preference for hedging and
+            failover (after the weighted pick of the primary).
+        hedging: Send a hedged duplicate when the primary is slow.
+        hedge_percentile: Latency percentile of the primary after which the
+            hedge is sent.
+        hedge_min_samples: Latencies needed before the percentile is trusted;
+            until then the hedge waits ``hedge_initial_delay`` seconds.
+        hedge_initial_delay: Hedge delay used until enough samples exist.
+        rng: Random source for the weighted pick (for tests).
+    """
+
+    def __init__(self, targets: List[RouteTarget], hedging: bool = True, hedge_percentile: float = 95.0,
+                 hedge_min_samples: int = 20, hedge_initial_delay: float = 5.0,
+                 rng: Optional[random.Random] = None):
+        if not targets:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.targets = targets
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_initial_delay = hedge_initial_delay
+        self._rng = rng or random.Random()
+
+    def hedge_delay(self, target: RouteTarget) -> float:
+        """Seconds to wait on a target before sending a hedged request."""
+        if len(target.latencies) < self.hedge_min_samples:
+            return self.hedge_initial_delay
+        return target.latencies.percentile(self.hedge_percentile)
+
+    def _order(self) -> List[RouteTarget]:
+        """Returns the targets to try: a weighted pick first, then by weight, open breakers last."""
+        available = [t for t in self.targets if t.breaker.state != OPEN]
+        candidates = [t for t in available if t.weight > 0]
+        rest = sorted(self.targets, key=lambda t: (t.breaker.state == OPEN, -t.weight))
+        if not candidates:
+            return rest
+        primary = self._rng.choices(candidates, weights=[t.weight for t in candidates])[0]
+        return [primary] + [t for t in rest if t is not primary]
+
+    async def _call(self, target: RouteTarget, input: Any, config: Optional[RunnableConfig], **kwargs: Any) -> Any:
+        """Calls one target within its timeout, recording latency and outcome."""
+        target.stats_counters.incr("calls")
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(target.model.ainvoke(input, config, **kwargs), timeout=target.timeout)
+        except asyncio.CancelledError:
+            target.breaker.release_probe()
+            target.stats_counters.incr("cancelled")
+            raise
+        except asyncio.TimeoutError:
+            target.breaker.record_failure()
+            target.stats_counters.incr("timeouts")
+            raise TimeoutError(f"{target.name} timed out after {target.timeout}s")
+        except Exception:
+            target.breaker.record_failure()
+            target.stats_counters.incr("failures")
+            raise
+        target.latencies.record(time.monotonic() - started)
+        target.breaker.record_success()
+        target.stats_counters.incr("successes")
+        return result
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        """
+        Returns the first successful answer, hedging and failing over as needed.
+
+        Raises:
+            The last provider error if every provider failed, or
+            CircuitOpenError if none could be called at all.
+        """
+        order = self._order()
+        # task -> (target, start time, whether it was a hedge)
+        running: Dict[asyncio.Task, Tuple[RouteTarget, float, bool]] = {}
+        errors: List[Exception] = []
+        hedged = False
+
+        def launch(hedge: bool = False) -> None:
+            while order:
+                target = order.pop(0)
+                try:
+                    target.breaker.before_call()
+                except CircuitOpenError as e:
+                    errors.append(e)
+                    continue
+                if hedge:
+                    target.stats_counters.incr("hedges")
+                task = asyncio.ensure_future(self._call(target, input, config, **kwargs))
+                running[task] = (target, time.monotonic(), hedge)
+                return
+
+        launch()
+        try:
+            while running:
+                timeout = None
+                if self.hedging and not hedged and order and len(running) == 1:
+                    target, started, _ = next(iter(running.values()))
+                    timeout = max(self.hedge_delay(target) - (time.monotonic() - started), 0.0)
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    logger.info(f"{target.name} is slow, hedging to the next provider")
+                    launch(hedge=True)
+                    continue
+                for task in done:
+                    target, _, hedge = running.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if hedge:
+                            target.stats_counters.incr("hedge_wins")
+                        return task.result()
+                    logger.warning(f"LLM provider {target.name} failed: {error}")
+                    errors.append(error)
+                if not running:
+                    launch()  # Fail over
+        finally:
+            for task in running:
+                task.cancel()
+        raise errors[-1]
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        """Synchronous calls fail over in order but are not hedged or timed out."""
+        errors: List[Exception] = []
+        for target in self._order():
+            try:
+                target.breaker.before_call()
+            except CircuitOpenError as e:
+                errors.append(e)
+                continue
+            target.stats_counters.incr("calls")
+            try:
+                result = target.model.invoke(input, config, **kwargs)
+            except Exception as e:
+                target.breaker.record_failure()
+                target.stats_counters.incr("failures")
+                logger.warning(f"LLM provider {target.name} failed: {e}")
+                errors.append(e)
+                continue
+            target.breaker.record_success()
+            target.stats_counters.incr("successes")
+            return result
+        raise errors[-1]
+
+    async def astream(self, input: Any, config: Optional[RunnableConfig] = None,
+                      **kwargs: Any) -> AsyncIterator[Any]:
+        """
+        Streams from the first provider that answers.
+
+        Fails over only until the first chunk has been sent; after that an
+        error is raised to the caller. Streams are not hedged.
+        """
+        errors: List[Exception] = []
+        for target in self._order():
+            try:
+                target.breaker.before_call()
+            except CircuitOpenError as e:
+                errors.append(e)
+                continue
+            target.stats_counters.incr("calls")
+            sent = False
+            try:
+                async for chunk in target.model.astream(input, config, **kwargs):
+                    sent = True
+                    yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                target.breaker.release_probe()
+                raise
+            except Exception as e:
+                target.breaker.record_failure()
+                target.stats_counters.incr("failures")
+                if sent:
+                    raise
+                logger.warning(f"LLM provider {target.name} failed before streaming: {e}")
+                errors.append(e)
+                continue
+            target.breaker.record_success()
+            target.stats_counters.incr("successes")
+            return
+        raise errors[-1]
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns per-provider counters, latency percentiles and breaker state."""
+        providers = {}
+        for target in self.targets:
+            p50 = target.latencies.percentile(50)
+            p95 = target.latencies.percentile(95)
+            providers[target.name] = {
+                **target.stats_counters.snapshot(),
+                "weight": target.weight,
+                "timeout": target.timeout,
+                "latency_p50_ms": round(p50 * 1000) if p50 is not None else None,
+                "latency_p95_ms": round(p95 * 1000) if p95 is not None else None,
+                "hedge_delay_ms": round(self.hedge_delay(target) * 1000),
+                "circuit": target.breaker.snapshot(),
+            }
+        return {"hedging": self.hedging, "providers": providers}
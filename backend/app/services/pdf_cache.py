@@ -0,0 +1,170 @@
+"""
+Content-addressed cache for compiled resume PDFs.
+
+PDFs are keyed on a hash of the rendered LaTeX plus the template id, so an
+unchanged resume never goes through pdflatex twice. Lookups go through a
+bounded in-memory LRU tier first and then a size-capped on-disk tier.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from app.core.cache import CacheStats, LRUCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PDFCache:
+    """
+    Two-tier (memory + disk) cache of compiled PDFs.
+
+    Args:
+        memory_items: Maximum number of PDFs kept in memory.
+        disk_dir: Directory for the on-disk tier, or None to disable it.
+        max_disk_bytes: Total size cap for the on-disk tier. Least recently
+            used files are deleted once the cap is exceeded.
+    """
+
+    def __init__(self, memory_items: int, disk_dir: Optional[str], max_disk_bytes: int):
+        self.memory = LRUCache(memory_items)
+        self.disk_dir = disk_dir if disk_dir and max_disk_bytes > 0 else None
+        self.max_disk_bytes = max_disk_bytes
+        self.stats_counters = CacheStats("memory_hits", "disk_hits", "misses", "evictions")
+        self._disk_lock = threading.Lock()
+        self._disk_bytes = 0
+
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+            except OSError as e:
+                logger.error(f"PDF disk cache disabled, cannot use {self.disk_dir}: {e}")
+                self.disk_dir = None
+
+    @staticmethod
+    def make_key(latex_content: str, template_id: str) -> str:
+        """Returns the content address for a rendered LaTeX document."""
+        digest = hashlib.sha256()
+        digest.update(template_id.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(latex_content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the cached PDF for a key, or None on a miss."""
+        pdf_bytes = self.memory.get(key)
+        if pdf_bytes is not None:
+            self.stats_counters.incr("memory_hits")
+            return pdf_bytes
+
+        pdf_bytes = self._disk_get(key)
+        if pdf_bytes is not None:
+            self.stats_counters.incr("disk_hits")
+            self.memory.set(key, pdf_bytes)
+            return pdf_bytes
+
+        self.stats_counters.incr("misses")
+        return None
+
+    def put(self, key: str, pdf_bytes: bytes) -> None:
+        """Stores a compiled PDF in both tiers."""
+        self.memory.set(key, pdf_bytes)
+        self._disk_put(key, pdf_bytes)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if not self.disk_dir:
+            return
+        with self._disk_lock:
+            for path, _, _ in self._disk_entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and current tier sizes."""
+        counters = self.stats_counters.snapshot()
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        return {
+            **counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_items": len(self.memory),
+            "disk_enabled": self.disk_dir is not None,
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pdf")
+
+    def _disk_entries(self):
+        """Yields (path, mtime, size) for every cached PDF on disk."""
+        with os.scandir(self.disk_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".pdf"):
+                    st = entry.stat()
+                    yield entry.path, st.st_mtime, st.st_size
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                pdf_bytes = f.read()
+            # Bump mtime so eviction treats this entry as recently used
+            os.utime(path, None)
+            return pdf_bytes
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"PDF disk cache read failed for {key}: {e}")
+            return None
+
+    def _disk_put(self, key: str, pdf_bytes: bytes) -> None:
+        if not self.disk_dir or len(pdf_bytes) > self.max_disk_bytes:
+            return
+        path = self._path(key)
+        with self._disk_lock:
+            try:
+                previous = os.path.getsize(path) if os.path.exists(path) else 0
+                # Write to a temp file first so readers never see a partial PDF
+                fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(pdf_bytes)
+                os.replace(tmp_path, path)
+                self._disk_bytes += len(pdf_bytes) - previous
+            except OSError as e:
+                logger.warning(f"PDF disk cache write failed for {key}: {e}")
+                return
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Deletes least recently used files until the tier fits its cap."""
+        entries = sorted(self._disk_entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.stats_counters.incr("evictions")
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+
+# Global instance
+pdf_cache = PDFCache(
+    memory_items=settings.PDF_CACHE_MEMORY_ITEMS if settings.PDF_CACHE_ENABLED else 0,
+    disk_dir=settings.PDF_CACHE_DIR if settings.PDF_CACHE_ENABLED else None,
+    max_disk_bytes=settings.PDF_CACHE_MAX_DISK_MB * 1024 * 1024,
+)
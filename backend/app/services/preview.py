@@ -0,0 +1,49 @@
+"""
+Fast HTML / plain-text rendering of a resume for live preview.
+
+Mirrors the section order of templates/resume.tex (header, experience,
+education, skills) but skips LaTeX entirely, so a preview renders in well
+under a millisecond instead of a full pdflatex round trip. The PDF path
+remains the source of truth for the final download.
+"""
+from typing import Literal
+
+from app.core.config import settings
+from app.models.resume import Resume
+from app.services.latex import TEMPLATE_DIR, TemplateRegistry
+
+PreviewFormat = Literal["html", "text"]
+
+MEDIA_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "text": "text/plain; charset=utf-8",
+}
+
+# Global instances, compiled once at import (i.e. application startup)
+html_templates = TemplateRegistry(
+    TEMPLATE_DIR,
+    auto_reload=settings.ENVIRONMENT == "development",
+    default_id=settings.DEFAULT_TEMPLATE_ID,
+    extension=".html",
+    autoescape=True,
+)
+text_templates = TemplateRegistry(
+    TEMPLATE_DIR,
+    auto_reload=settings.ENVIRONMENT == "development",
+    default_id=settings.DEFAULT_TEMPLATE_ID,
+    extension=".txt",
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+
+
+def render_preview(resume: Resume, fmt: PreviewFormat = "html") -> str:
+    """
+    Renders a resume as HTML or plain text.
+
+    Args:
+        resume: The resume to render.
+        fmt: "html" (escaped for HTML) or "text".
+    """
+    registry = html_templates if fmt == "html" else text_templates
+    return registry.get("default").render(resume=resume)
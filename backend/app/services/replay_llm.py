@@ -0,0 +1,161 @@
+"""
+Record/replay chat model for offline, deterministic runs.
+
+In "record" mode every prompt is sent to a real (upstream) provider and the
+prompt -> response pair is appended to a cassette file; prompts already on
+the cassette are replayed instead of being sent again. In "replay" mode
+responses come only from the cassette, so the whole pipeline runs without
+credentials or network access. A configurable delay is injected before each
+replayed response to stand in for provider latency when load testing.
+
+The cassette is a JSON Lines file with one {"key", "messages", "response"}
+object per recorded prompt; the key is a hash of the messages.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Literal, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+# Size of the chunks a replayed response is streamed in
+STREAM_CHUNK_CHARS = 32
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode for a prompt that is not on the cassette."""
+
+
+def cassette_key(messages: List[BaseMessage]) -> str:
+    """Hashes the role and content of each message."""
+    payload = json.dumps([[message.type, message.content] for message in messages], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReplayChatModel(BaseChatModel):
+    """
+    Chat model that records responses to, and replays them from, a cassette.
+
+    Args:
+        cassette_path: JSON Lines cassette file.
+        mode: "replay" serves only recorded responses; "record" also calls
+            ``upstream`` for new prompts and appends them to the cassette.
+        upstream: The real chat model used in record mode.
+        latency_ms: Delay before each replayed response.
+        latency_jitter_ms: Up to this much is randomly added to or taken
+            from the delay.
+        seed: Seed for the jitter, so runs are repeatable.
+    """
+
+    cassette_path: str
+    mode: Literal["replay", "record"] = "replay"
+    upstream: Optional[BaseChatModel] = None
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    seed: int = 0
+
+    _entries: Dict[str, str] = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _rng: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        if self.mode == "record" and self.upstream is None:
+            raise ValueError("Record mode needs an upstream model")
+        self._rng = random.Random(self.seed)
+        if os.path.exists(self.cassette_path):
+            with open(self.cassette_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry["response"]
+        elif self.mode == "replay":
+            logger.warning(f"Cassette {self.cassette_path} does not exist; every prompt will miss")
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    @property
+    def recorded(self) -> int:
+        """Number of prompts on the cassette."""
+        return len(self._entries)
+
+    def _delay(self) -> float:
+        """Seconds to wait before a replayed response."""
+        jitter = self._rng.uniform(-self.latency_jitter_ms, self.latency_jitter_ms) if self.latency_jitter_ms else 0.0
+        return max(self.latency_ms + jitter, 0.0) / 1000.0
+
+    def _lookup(self, key: str) -> Optional[str]:
+        response = self._entries.get(key)
+        if response is None and self.mode == "replay":
+            raise CassetteMissError(f"Prompt {key[:12]} is not on cassette {self.cassette_path}")
+        return response
+
+    def _record(self, key: str, messages: List[BaseMessage], response: str) -> None:
+        """Stores a new response and appends it to the cassette."""
+        entry = {
+            "key": key,
+            "messages": [{"role": message.type, "content": message.content} for message in messages],
+            "response": response,
+        }
+        with self._lock:
+            self._entries[key] = response
+            directory = os.path.dirname(self.cassette_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.cassette_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    @staticmethod
+    def _result(response: str) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response))])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        key = cassette_key(messages)
+        response = self._lookup(key)
+        if response is None:
+            response = self.upstream.invoke(messages, stop=stop, **kwargs).text
+            self._record(key, messages, response)
+            return self._result(response)
+        time.sleep(self._delay())
+        return self._result(response)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                         **kwargs: Any) -> ChatResult:
+        key = cassette_key(messages)
+        response = self._lookup(key)
+        if response is None:
+            response = (await self.upstream.ainvoke(messages, stop=stop, **kwargs)).text
+            self._record(key, messages, response)
+            return self._result(response)
+        await asyncio.sleep(self._delay())
+        return self._result(response)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        response = self._generate(messages, stop, **kwargs).generations[0].message.content
+        for i in range(0, len(response), STREAM_CHUNK_CHARS):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=response[i:i + STREAM_CHUNK_CHARS]))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        """Streams a replayed response in small chunks; the delay comes before the first one."""
+        result = await self._agenerate(messages, stop, **kwargs)
+        response = result.generations[0].message.content
+        for i in range(0, len(response), STREAM_CHUNK_CHARS):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=response[i:i + STREAM_CHUNK_CHARS]))
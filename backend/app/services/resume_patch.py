@@ -0,0 +1,144 @@
+"""
+Patch-based resume tailoring.
+
+Instead of re-emitting the whole resume, the model returns a short list of
+edits against an indexed view of the resume (replace bullet i of experience
+j, new summary, reordered skills, ...). The edits are applied locally; each
+one is validated on its own and discarded if it does not apply, so one bad
+edit never costs the rest.
+
+Edit operations:
+    {"op": "summary", "text": str}
+    {"op": "bullet", "exp": int, "index": int, "text": str}
+    {"op": "bullet_order", "exp": int, "order": [int, ...]}
+    {"op": "project", "index": int, "text": str}
+    {"op": "skills", "order": [{"category": str, "skills": [str, ...]}, ...]}
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from app.models.job_description import JDAnalysis
+from app.models.resume import Resume
+from app.services.section_tailoring import reorder_skills
+
+
+class EditError(ValueError):
+    """Raised when a single edit cannot be applied."""
+
+
+@dataclass
+class PatchResult:
+    """Outcome of applying a list of edits."""
+    resume: Resume
+    applied: int = 0
+    rejected: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def build_patch_prompt(resume: Resume, analysis: JDAnalysis) -> str:
+    """Builds a prompt asking for edits against an indexed view of the resume."""
+    indexed = {
+        "summary": resume.summary,
+        "experience": [
+            {"exp": j, "position": f"{item.position} at {item.company}",
+             "bullets": {str(i): bullet for i, bullet in enumerate(item.description)}}
+            for j, item in enumerate(resume.experience)
+        ],
+        "projects": [
+            {"index": k, "name": item.name, "description": item.description}
+            for k, item in enumerate(resume.projects)
+        ],
+        "skills": [category.model_dump() for category in resume.skills],
+    }
+    return f"""
+    Tailor the following resume to match the job description analysis by
+    returning a list of edits. Only include edits that improve the match;
+    everything not edited stays as it is.
+
+    Resume (indexed):
+    {json.dumps(indexed)}
+
+    Job Analysis:
+    {analysis.model_dump_json(exclude_defaults=True)}
+
+    Allowed edits:
+    {{"op": "summary", "text": "new summary"}}
+    {{"op": "bullet", "exp": 0, "index": 1, "text": "rewritten bullet"}}
+    {{"op": "bullet_order", "exp": 0, "order": [1, 0, 2]}}
+    {{"op": "project", "index": 0, "text": "rewritten description"}}
+    {{"op": "skills", "order": [{{"category": "string", "skills": ["string"]}}]}}
+
+    Instructions:
+    1. Rewrite bullets and the summary to highlight relevant skills and achievements.
+    2. Reorder skills so those required by the job come first.
+    3. Do NOT invent false information. Only rephrase or emphasize existing experience.
+
+    Output JSON structure: {{"edits": [...]}}
+    """
+
+
+def _text(edit: Dict[str, Any]) -> str:
+    text = edit.get("text")
+    if not isinstance(text, str) or not text.strip():
+        raise EditError("text must be a non-empty string")
+    return text.strip()
+
+
+def _index(edit: Dict[str, Any], key: str, size: int) -> int:
+    value = edit.get(key)
+    # bool is an int subclass; reject it explicitly
+    if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value < size:
+        raise EditError(f"{key} must be an index below {size}")
+    return value
+
+
+def _apply_edit(resume: Resume, edit: Any) -> None:
+    if not isinstance(edit, dict):
+        raise EditError("edit must be an object")
+    op = edit.get("op")
+    if op == "summary":
+        resume.summary = _text(edit)
+    elif op == "bullet":
+        item = resume.experience[_index(edit, "exp", len(resume.experience))]
+        item.description[_index(edit, "index", len(item.description))] = _text(edit)
+    elif op == "bullet_order":
+        item = resume.experience[_index(edit, "exp", len(resume.experience))]
+        order = edit.get("order")
+        if (not isinstance(order, list)
+                or not all(isinstance(i, int) and not isinstance(i, bool) for i in order)
+                or sorted(order) != list(range(len(item.description)))):
+            raise EditError("order must be a permutation of the bullet indexes")
+        item.description = [item.description[i] for i in order]
+    elif op == "project":
+        resume.projects[_index(edit, "index", len(resume.projects))].description = _text(edit)
+    elif op == "skills":
+        try:
+            resume.skills = reorder_skills(resume.skills, edit.get("order"))
+        except ValueError as e:
+            raise EditError(str(e)) from e
+    else:
+        raise EditError(f"unknown op {op!r}")
+
+
+def apply_edits(resume: Resume, edits: Any) -> PatchResult:
+    """
+    Applies edits to a copy of the resume, skipping any that are invalid.
+
+    Edits apply in order, so a bullet_order followed by a bullet edit refers
+    to the reordered bullets.
+    """
+    result = PatchResult(resume=resume.model_copy(deep=True))
+    if not isinstance(edits, list):
+        result.rejected.append({"edit": edits, "reason": "edits must be a list"})
+        return result
+    for edit in edits:
+        try:
+            _apply_edit(result.resume, edit)
+            result.applied += 1
+        except EditError as e:
+            result.rejected.append({"edit": edit, "reason": str(e)})
+        except Exception as e:
+            # Malformed values the checks above did not anticipate
+            result.rejected.append({"edit": edit, "reason": f"invalid edit: {e}"})
+    result.resume = Resume.model_validate(result.resume.model_dump())
+    return result
@@ -0,0 +1,149 @@
+"""
+Resource-bounded subprocess execution for the LaTeX compiler.
+
+Each command runs in its own session (process group) with a wall-clock
+timeout and, where the platform supports it, CPU time, address space and
+output file size limits. The whole process group is killed when the command
+finishes or is aborted, so no stray children outlive a compile.
+"""
+import logging
+import os
+import signal
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: only the wall-clock timeout applies
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class CompileLimitExceeded(Exception):
+    """
+    Raised when a sandboxed command is killed for exceeding a limit.
+
+    Attributes:
+        reason: One of "timeout", "cpu", "memory" or "output".
+    """
+
+    def __init__(self, reason: str, message: Optional[str] = None):
+        super().__init__(message or f"Compilation aborted: {reason} limit exceeded")
+        self.reason = reason
+
+    def __reduce__(self):
+        return (self.__class__, (self.reason, self.args[0]))
+
+
+@dataclass
+class SandboxLimits:
+    """Limits for one sandboxed command. A value of 0 disables that limit."""
+    wall_seconds: float = 30.0
+    cpu_seconds: int = 20
+    memory_bytes: int = 1024 * 1024 * 1024
+    output_bytes: int = 20 * 1024 * 1024
+
+    def rlimits(self) -> Dict[int, int]:
+        if resource is None:
+            return {}
+        limits = {resource.RLIMIT_CORE: 0}
+        if self.cpu_seconds:
+            limits[resource.RLIMIT_CPU] = self.cpu_seconds
+        if self.memory_bytes:
+            limits[resource.RLIMIT_AS] = self.memory_bytes
+        if self.output_bytes:
+            limits[resource.RLIMIT_FSIZE] = self.output_bytes
+        return limits
+
+
+def _set_rlimits(limits: Dict[int, int], pid: int = 0) -> None:
+    for kind, value in limits.items():
+        # The CPU hard limit sits one second above the soft one so the
+        # process gets SIGXCPU first and SIGKILL only if it ignores it.
+        hard = value + 1 if kind == resource.RLIMIT_CPU else value
+        if pid:
+            resource.prlimit(pid, kind, (value, hard))
+        else:
+            resource.setrlimit(kind, (value, hard))
+
+
+def _kill_group(process: subprocess.Popen) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _killed_reason(returncode: int) -> Optional[str]:
+    """Maps death-by-signal to the limit that most likely caused it."""
+    if returncode >= 0 or sys.platform == "win32":
+        return None
+    sig = -returncode
+    if sig in (signal.SIGXCPU, signal.SIGKILL):
+        return "cpu"
+    if sig == signal.SIGXFSZ:
+        return "output"
+    if sig in (signal.SIGSEGV, signal.SIGBUS, signal.SIGABRT):
+        return "memory"
+    return None
+
+
+def run_sandboxed(
+    cmd: List[str],
+    cwd: str,
+    limits: SandboxLimits,
+    env: Optional[Dict[str, str]] = None,
+) -> subprocess.CompletedProcess:
+    """
+    Runs a command under the given limits.
+
+    Returns:
+        The completed process. Output is discarded; callers read the files
+        the command wrote instead.
+
+    Raises:
+        CompileLimitExceeded: If the command timed out or was killed by a limit.
+    """
+    rlimits = limits.rlimits()
+    # prlimit avoids preexec_fn, which is unsafe in threaded programs
+    use_prlimit = bool(rlimits) and hasattr(resource, "prlimit")
+    preexec_fn = None
+    if rlimits and not use_prlimit:
+        preexec_fn = lambda: _set_rlimits(rlimits)  # noqa: E731
+
+    process = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=sys.platform != "win32",
+        preexec_fn=preexec_fn,
+    )
+    try:
+        if use_prlimit:
+            try:
+                _set_rlimits(rlimits, pid=process.pid)
+            except (ProcessLookupError, OSError):
+                pass  # Already exited
+        try:
+            returncode = process.wait(timeout=limits.wall_seconds or None)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"{cmd[0]} exceeded {limits.wall_seconds}s wall-clock limit, killing it")
+            raise CompileLimitExceeded("timeout")
+    finally:
+        if sys.platform != "win32":
+            _kill_group(process)
+        else:
+            process.kill()
+        process.wait()
+
+    reason = _killed_reason(returncode)
+    if reason:
+        logger.warning(f"{cmd[0]} killed by signal {-returncode} ({reason} limit)")
+        raise CompileLimitExceeded(reason)
+    return subprocess.CompletedProcess(cmd, returncode)
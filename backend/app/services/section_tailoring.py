@@ -0,0 +1,177 @@
+"""
+Per-section resume tailoring.
+
+Instead of asking for the whole resume back in one call, the work is split
+into independent tasks (the summary, the bullets of each experience item,
+each project and the skills ordering) that run concurrently. Wall-clock time
+then tracks the slowest section rather than the total output length. A task
+that fails leaves its section unchanged, and the merged result is validated
+as a Resume.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.models.job_description import JDAnalysis
+from app.models.resume import ExperienceItem, ProjectItem, Resume, SkillCategory
+from app.services.llm import llm_client
+
+logger = logging.getLogger(__name__)
+
+_GUIDELINES = """
+    Do NOT invent false information. Only rephrase or emphasize what is already there.
+    Return JSON only, using exactly the keys shown.
+    """
+
+
+def _job_context(analysis: JDAnalysis) -> str:
+    return analysis.model_dump_json(exclude_defaults=True)
+
+
+def summary_prompt(resume: Resume, analysis: JDAnalysis) -> str:
+    return f"""
+    Rewrite this resume summary to align with the target role.
+
+    Summary:
+    {json.dumps(resume.summary)}
+
+    Most recent positions:
+    {json.dumps([f"{item.position} at {item.company}" for item in resume.experience[:3]])}
+
+    Job Analysis:
+    {_job_context(analysis)}
+    {_GUIDELINES}
+    Output JSON structure: {{"summary": "string"}}
+    """
+
+
+def experience_prompt(item: ExperienceItem, analysis: JDAnalysis) -> str:
+    return f"""
+    Rewrite the bullet points of this position to highlight skills and
+    achievements relevant to the job. Keep the same number of bullets or fewer.
+
+    Position:
+    {item.model_dump_json(include={"company", "position", "description", "technologies"})}
+
+    Job Analysis:
+    {_job_context(analysis)}
+    {_GUIDELINES}
+    Output JSON structure: {{"description": ["string"]}}
+    """
+
+
+def project_prompt(item: ProjectItem, analysis: JDAnalysis) -> str:
+    return f"""
+    Rewrite this project description to highlight what is relevant to the job.
+
+    Project:
+    {item.model_dump_json(include={"name", "description", "technologies"})}
+
+    Job Analysis:
+    {_job_context(analysis)}
+    {_GUIDELINES}
+    Output JSON structure: {{"description": "string"}}
+    """
+
+
+def skills_prompt(skills: List[SkillCategory], analysis: JDAnalysis) -> str:
+    return f"""
+    Reorder these skill categories, and the skills within each category, so
+    that those required or preferred by the job come first. Do not add, drop
+    or rename anything.
+
+    Skills:
+    {json.dumps([category.model_dump() for category in skills])}
+
+    Job Analysis:
+    {_job_context(analysis)}
+    {_GUIDELINES}
+    Output JSON structure: {{"skills": [{{"category": "string", "skills": ["string"]}}]}}
+    """
+
+
+def reorder_skills(original: List[SkillCategory], proposed: Any) -> List[SkillCategory]:
+    """
+    Applies a proposed skills ordering without letting it add or drop skills.
+
+    Unknown categories and skills are ignored; anything the proposal left
+    out keeps its original relative order after the proposed items.
+    """
+    if not isinstance(proposed, list):
+        raise ValueError("skills must be a list")
+    by_name = {category.category: category for category in original}
+    ordered: List[SkillCategory] = []
+    for entry in proposed:
+        if not isinstance(entry, dict) or not isinstance(entry.get("category"), str):
+            continue
+        if entry["category"] not in by_name:
+            continue
+        category = by_name.pop(entry["category"])
+        known = set(category.skills)
+        proposed_skills = entry.get("skills")
+        if not isinstance(proposed_skills, list):
+            proposed_skills = []
+        skills = list(dict.fromkeys(s for s in proposed_skills if isinstance(s, str) and s in known))
+        skills += [s for s in category.skills if s not in skills]
+        ordered.append(SkillCategory(category=category.category, skills=skills))
+    return ordered + [by_name[name] for name in by_name]
+
+
+async def tailor_resume_by_section(resume: Resume, analysis: JDAnalysis,
+                                   concurrency: Optional[int] = None) -> Resume:
+    """
+    Tailors a resume section by section, running the LLM calls concurrently.
+
+    Args:
+        resume: The base resume to tailor.
+        analysis: The analysis of the job description.
+        concurrency: Maximum number of LLM calls in flight. Defaults to
+            ``settings.TAILORING_SECTION_CONCURRENCY``.
+
+    Returns:
+        Resume: The tailored resume; sections whose task failed are unchanged.
+    """
+    tailored = resume.model_copy(deep=True)
+    semaphore = asyncio.Semaphore(concurrency or settings.TAILORING_SECTION_CONCURRENCY)
+
+    async def run(name: str, prompt: str, apply: Callable[[Dict[str, Any]], None]) -> None:
+        async with semaphore:
+            result = await llm_client.generate_json(prompt)
+        if "error" in result or not result:
+            logger.warning(f"Tailoring of {name} failed, keeping it unchanged")
+            return
+        try:
+            apply(result)
+        except Exception as e:
+            logger.warning(f"Tailoring of {name} returned an unusable result: {e}")
+
+    tasks: List[Awaitable[None]] = []
+    if resume.summary:
+        def apply_summary(result):
+            tailored.summary = str(result["summary"])
+        tasks.append(run("summary", summary_prompt(resume, analysis), apply_summary))
+
+    for index, item in enumerate(resume.experience):
+        if not item.description:
+            continue
+        def apply_experience(result, index=index):
+            description = result["description"]
+            if not isinstance(description, list) or not description:
+                raise ValueError("description must be a non-empty list")
+            tailored.experience[index].description = [str(bullet) for bullet in description]
+        tasks.append(run(f"experience[{index}]", experience_prompt(item, analysis), apply_experience))
+
+    for index, item in enumerate(resume.projects):
+        def apply_project(result, index=index):
+            tailored.projects[index].description = str(result["description"])
+        tasks.append(run(f"projects[{index}]", project_prompt(item, analysis), apply_project))
+
+    if resume.skills:
+        def apply_skills(result):
+            tailored.skills = reorder_skills(resume.skills, result["skills"])
+        tasks.append(run("skills", skills_prompt(resume.skills, analysis), apply_skills))
+
+    await asyncio.gather(*tasks)
+    return Resume.model_validate(tailored.model_dump())
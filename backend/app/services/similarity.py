@@ -0,0 +1,118 @@
+"""
+Near-duplicate detection for job description text.
+
+Texts are normalized (case, whitespace, links, e-mail addresses and dates),
+split into word shingles and summarised as a MinHash signature. The fraction
+of equal signature slots estimates the Jaccard similarity of the shingle sets.
+Signatures are cut into LSH bands so that candidates can be found by an
+indexed equality lookup instead of comparing against every stored text.
+
+A few words change an analysis even though they barely move the similarity
+("3+ years" vs "8+ years", "Junior" vs "Senior"); ``qualifiers`` extracts
+them so near-duplicates can be required to agree on them exactly.
+"""
+import hashlib
+import random
+import re
+from typing import List, Sequence, Set
+
+from app.services.cleaning import clean_text
+
+# Mersenne prime used for the universal hash family
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_URL_RE = re.compile(r"(https?://|www\.)\S+", re.IGNORECASE)
+_EMAIL_RE = re.compile(r"\S+@\S+\.\S+")
+_DATE_RE = re.compile(
+    r"\b(?:\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}"
+    r"|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}"
+    r"|\d{1,2}(?:st|nd|rd|th)?\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?,?\s+\d{4})\b",
+    re.IGNORECASE,
+)
+_NON_WORD_RE = re.compile(r"[^\w+#]+")
+_NUMBER_RE = re.compile(r"^\d+(?:\+|k)?$")
+SENIORITY_WORDS = frozenset({
+    "intern", "junior", "jr", "mid", "senior", "sr", "staff", "lead", "principal",
+})
+
+
+def normalize_text(text: str) -> str:
+    """
+    Reduces a job description to the words that matter for comparison.
+
+    Builds on clean_text, then lowercases and drops links, e-mail addresses,
+    dates and punctuation, which routinely change between reposts. Other
+    numbers are kept, since "3+ years" and "8+ years" make different analyses.
+    """
+    text = clean_text(text).lower()
+    text = _URL_RE.sub(" ", text)
+    text = _EMAIL_RE.sub(" ", text)
+    text = _DATE_RE.sub(" ", text)
+    return " ".join(_NON_WORD_RE.sub(" ", text).split())
+
+
+def qualifiers(normalized: str) -> List[str]:
+    """Returns the sorted numbers and seniority words of a normalized text."""
+    return sorted({word for word in normalized.split() if word in SENIORITY_WORDS or _NUMBER_RE.match(word)})
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Returns the set of word n-grams of a normalized text."""
+    words = text.split()
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _hash_shingle(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures and LSH band keys.
+
+    The permutations are derived from a fixed seed, so signatures stay
+    comparable across restarts and processes.
+
+    Args:
+        num_perm: Signature length.
+        bands: Number of LSH bands; must divide num_perm.
+        seed: Seed for the hash permutations.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, shingle_set: Set[str]) -> List[int]:
+        """Returns the MinHash signature of a shingle set."""
+        if not shingle_set:
+            return [_MAX_HASH] * self.num_perm
+        hashes = [_hash_shingle(shingle) for shingle in shingle_set]
+        return [
+            min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._params
+        ]
+
+    def band_keys(self, signature: Sequence[int]) -> List[str]:
+        """Returns one "<band>:<digest>" key per LSH band of a signature."""
+        keys = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(",".join(map(str, rows)).encode("ascii"), digest_size=8).hexdigest()
+            keys.append(f"{band}:{digest}")
+        return keys
+
+    @staticmethod
+    def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+        """Estimates the Jaccard similarity of the sets behind two signatures."""
+        if not a or len(a) != len(b):
+            return 0.0
+        return sum(x == y for x, y in zip(a, b)) / len(a)
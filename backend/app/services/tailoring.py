@@ -1,38 +1,89 @@
+import logging
+from typing import Any, AsyncIterator, Dict, Literal, Optional, Tuple
+from app.core.config import settings
 from app.models.resume import Resume
-from app.models.job_description import JDAnalysis
+from app.models.job_description import JDAnalysis, JobDescription
+from app.services.analysis import (ANALYSIS_JSON_STRUCTURE, analysis_from_result, lookup_stored_analysis,
+                                   prepare_jd_text)
 from app.services.llm import llm_client
+from app.services.resume_patch import apply_edits, build_patch_prompt
+from app.services.section_tailoring import tailor_resume_by_section
 
-async def tailor_resume_content(resume: Resume, analysis: JDAnalysis) -> Resume:
+logger = logging.getLogger(__name__)
+
+TailoringMode = Literal["full", "sections", "patch"]
+
+# Resume sections streamed item by item; all others are streamed whole
+STREAMED_LIST_SECTIONS = ("education", "experience", "projects", "skills")
+
+def build_resume_prefix(resume: Resume) -> str:
     """
-    Tailors a resume based on a job description analysis.
-    
-    Args:
-        resume: The base resume to tailor.
-        analysis: The analysis of the job description.
-        
-    Returns:
-        Resume: The tailored resume.
+    Builds the part of the tailoring prompt that depends only on the resume.
+
+    It comes first in the prompt, so batches tailoring one resume to many JDs
+    build it once and send an identical prefix with every call, which
+    providers with prompt caching can reuse.
     """
     # Convert resume to JSON string for prompt
     resume_json = resume.model_dump_json()
-    analysis_json = analysis.model_dump_json()
-    
+
     prompt = f"""
     Tailor the following resume content to match the job description analysis.
     
+    Instructions:
+    1. Rewrite experience bullet points to highlight relevant skills and achievements.
+    2. Reorder skills to prioritize those required by the job.
+    3. Update the summary to align with the role.
+    4. Do NOT invent false information. Only rephrase or emphasize existing experience.
+    
     Resume:
     {resume_json}
+    """
+    return prompt
+
+def build_tailoring_prompt(resume: Resume, analysis: JDAnalysis, prefix: Optional[str] = None) -> str:
+    """
+    Builds the prompt asking the LLM for a tailored version of the resume.
+
+    Args:
+        resume: The base resume.
+        analysis: The analysis of the job description.
+        prefix: build_resume_prefix(resume), if already built.
+    """
+    if prefix is None:
+        prefix = build_resume_prefix(resume)
+    analysis_json = analysis.model_dump_json()
     
+    prompt = f"""{prefix}
     Job Analysis:
     {analysis_json}
     
-    Instructions:
-    1. Rewrite experience bullet points to highlight relevant skills and achievements.
-    2. Reorder skills to prioritize those required by the job.
-    3. Update the summary to align with the role.
-    4. Do NOT invent false information. Only rephrase or emphasize existing experience.
+    """
+    return prompt
+
+async def tailor_resume_content(resume: Resume, analysis: JDAnalysis,
+                                mode: Optional[TailoringMode] = None, prefix: Optional[str] = None) -> Resume:
+    """
+    Tailors a resume based on a job description analysis.
     
+    Args:
+        resume: The base resume to tailor.
+        analysis: The analysis of the job description.
+        mode: "full" (one call for the whole resume), "sections" (see
+            tailor_resume_by_section) or "patch" (see tailor_resume_by_patch).
+            Defaults to ``settings.TAILORING_MODE``.
+        prefix: build_resume_prefix(resume), if already built ("full" mode only).
+        
+    Returns:
+        Resume: The tailored resume.
     """
+    mode = mode or settings.TAILORING_MODE
+    if mode == "sections":
+        return await tailor_resume_by_section(resume, analysis)
+    if mode == "patch":
+        return await tailor_resume_by_patch(resume, analysis)
+
+    prompt = build_tailoring_prompt(resume, analysis, prefix)
     
     # Use the new LLM client
     result = await llm_client.generate_json(prompt)
@@ -47,3 +98,113 @@ async def tailor_resume_content(resume: Resume, analysis: JDAnalysis) -> Resume:
     except Exception as e:
         print(f"Tailoring Error: {e}")
         return resume
+
+def build_combined_prompt(resume: Resume, jd: JobDescription, prefix: Optional[str] = None) -> str:
+    """Builds the prompt asking for the JD analysis and the tailored resume in one response."""
+    if prefix is None:
+        prefix = build_resume_prefix(resume)
+    cleaned_text = prepare_jd_text(jd)
+
+    prompt = f"""{prefix}
+    First analyze the following job description, then tailor the resume to it.
+    
+    Job Description:
+    {cleaned_text}
+    
+    Output JSON structure:
+    {{
+        "analysis": {ANALYSIS_JSON_STRUCTURE},
+        "resume": the tailored resume, with the same structure as the resume above
+    }}
+    
+    """
+    return prompt
+
+async def analyze_and_tailor(resume: Resume, jd: JobDescription,
+                             prefix: Optional[str] = None) -> Tuple[JDAnalysis, Resume]:
+    """
+    Analyzes a job description and tailors the resume to it in a single LLM call.
+
+    Saves the round trip of analyzing first and then sending the analysis
+    back with the tailoring prompt. If the analysis is already stored, only
+    the tailoring call is made. An analysis that fails validation falls back
+    to the local keyword extractor; a tailored resume that does, to the base
+    resume.
+
+    Args:
+        resume: The base resume to tailor.
+        jd: The job description.
+        prefix: build_resume_prefix(resume), if already built.
+
+    Returns:
+        (analysis, tailored resume).
+    """
+    stored = await lookup_stored_analysis(jd)
+    if stored is not None:
+        return stored, await tailor_resume_content(resume, stored, "full", prefix=prefix)
+
+    result = await llm_client.generate_json(build_combined_prompt(resume, jd, prefix))
+    failed = not isinstance(result, dict) or "error" in result or not result
+    analysis = await analysis_from_result(jd, None if failed else result.get("analysis"))
+    if failed:
+        return analysis, resume
+
+    try:
+        return analysis, Resume(**result.get("resume"))
+    except Exception as e:
+        logger.error(f"Tailoring Error: {e}")
+        return analysis, resume
+
+async def tailor_resume_by_patch(resume: Resume, analysis: JDAnalysis) -> Resume:
+    """
+    Tailors a resume by asking the LLM for a list of edits only.
+
+    The model does not re-emit unchanged fields (contact info, education,
+    dates), which cuts output tokens. Edits that fail validation are
+    discarded one by one; the rest are still applied.
+    """
+    result = await llm_client.generate_json(build_patch_prompt(resume, analysis))
+    if not isinstance(result, dict) or "error" in result or not result:
+        return resume
+
+    patch = apply_edits(resume, result.get("edits"))
+    if patch.rejected:
+        logger.warning(f"Discarded {len(patch.rejected)} of {len(patch.rejected) + patch.applied} tailoring edits: "
+                       f"{[item['reason'] for item in patch.rejected]}")
+    return patch.resume
+
+async def stream_tailored_resume(resume: Resume, analysis: JDAnalysis) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Tailors a resume, yielding each part as soon as the LLM has produced it.
+
+    Yields (event, data) pairs:
+        ("section", {"section", "value"}) for summary, contact info and other
+            single-valued sections; list sections (experience, projects, ...)
+            also carry "index" and are sent one item at a time.
+        ("error", {"message"}) if the LLM call fails midway.
+        ("done", {"resume", "fallback"}) last, with the validated tailored
+            resume, or the base resume with fallback=True if tailoring failed.
+
+    Section values are sent as generated and are only validated as part of
+    the final resume.
+    """
+    result = None
+    try:
+        async for path, value in llm_client.stream_json(build_tailoring_prompt(resume, analysis), max_depth=2):
+            if path == ():
+                result = value
+            elif len(path) == 2 and path[0] in STREAMED_LIST_SECTIONS:
+                yield "section", {"section": path[0], "index": path[1], "value": value}
+            elif len(path) == 1 and path[0] not in STREAMED_LIST_SECTIONS:
+                yield "section", {"section": path[0], "value": value}
+    except Exception as e:
+        logger.error(f"Streaming tailoring failed: {e}")
+        yield "error", {"message": "Tailoring failed, falling back to the base resume"}
+
+    tailored = resume
+    if isinstance(result, dict):
+        try:
+            tailored = Resume(**result)
+        except Exception as e:
+            logger.error(f"Tailoring Error: {e}")
+    yield "done", {"resume": tailored.model_dump(mode="json"), "fallback": tailored is resume}
@@ -0,0 +1,53 @@
+"""
+Incremental ZIP writer for streaming responses.
+
+``zipfile`` supports unseekable outputs by writing data descriptors after
+each member, so archive bytes can be handed to the client as soon as a
+member is added instead of after the whole archive is built.
+"""
+import zipfile
+from typing import List
+
+
+class _ChunkBuffer:
+    """Write-only sink that collects bytes until they are drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStream:
+    """
+    Builds a ZIP archive member by member.
+
+    Usage:
+        stream = ZipStream()
+        yield stream.add("a.pdf", pdf_bytes)
+        yield stream.close()
+    """
+
+    def __init__(self, compression: int = zipfile.ZIP_STORED):
+        self._buffer = _ChunkBuffer()
+        self._zip = zipfile.ZipFile(self._buffer, mode="w", compression=compression)
+
+    def add(self, name: str, data: bytes) -> bytes:
+        """Adds a member and returns the archive bytes produced for it."""
+        self._zip.writestr(name, data)
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        """Writes the central directory and returns the final bytes."""
+        self._zip.close()
+        return self._buffer.drain()
@@ -49,6 +49,10 @@ app.include_router(history_router, prefix="/api/v1/history", tags=["History"])
 async def root():
     return {"message": "Resume Tailor API is running"}
 
+from app.services.llm import llm_client
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    llm_circuit = llm_client.breaker.snapshot()
+    status = "healthy" if llm_circuit["state"] == "closed" else "degraded"
+    return {"status": status, "llm_circuit": llm_circuit}
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark for LaTeX rendering of large resumes.
+
+Compares the per-character escape against the compiled-regex escape, and a
+template that escapes every field through the latex_escape filter against
+rendering a resume escaped once up front.
+
+Usage:
+    python scripts/bench_latex_render.py [--jobs 40] [--bullets 15] [--repeat 200]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jinja2 import Environment
+
+from app.models.resume import Resume
+from app.services.latex import LATEX_SPECIAL_CHARS, escape_resume, latex_escape, template_registry
+
+
+def legacy_latex_escape(value):
+    """The original per-character implementation, kept for comparison."""
+    if not isinstance(value, str):
+        return value
+    return ''.join(LATEX_SPECIAL_CHARS.get(c, c) for c in value)
+
+
+def build_resume(jobs: int, bullets: int) -> Resume:
+    return Resume(
+        contact_info={"name": "Ada Lovelace", "email": "ada@example.com", "phone": "+1 555 0100"},
+        summary="Engineer with 10+ years of C++ & Python experience; cut costs by 30%.",
+        experience=[
+            {
+                "company": f"Company #{i} & Sons",
+                "position": "Senior Software_Engineer",
+                "start_date": "2015",
+                "end_date": "2020",
+                "description": [
+                    f"Improved throughput by {j}% across {i} services using C# and F# tooling"
+                    if j % 3 == 0 else
+                    f"Led a team of {j} engineers delivering the payments platform on time"
+                    for j in range(bullets)
+                ],
+            }
+            for i in range(jobs)
+        ],
+        education=[{"institution": "University of London", "degree": "BSc Mathematics"}],
+        skills=[{"category": "Languages", "skills": ["C++", "C#", "Python", "SQL", "TeX"]}] * 5,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--bullets", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    resume = build_resume(args.jobs, args.bullets)
+    strings = [bullet for job in resume.experience for bullet in job.description]
+    assert [legacy_latex_escape(s) for s in strings] == [latex_escape(s) for s in strings]
+
+    def per_call_ms(stmt):
+        return timeit.timeit(stmt, number=args.repeat) / args.repeat * 1000
+
+    print(f"Resume: {args.jobs} jobs x {args.bullets} bullets ({len(strings)} strings)")
+    print(f"  escape, per-character join : {per_call_ms(lambda: [legacy_latex_escape(s) for s in strings]):8.3f} ms")
+    print(f"  escape, compiled regex     : {per_call_ms(lambda: [latex_escape(s) for s in strings]):8.3f} ms")
+
+    # A variant of the default template that escapes every field in the template
+    env = template_registry.env
+    source = env.loader.get_source(env, template_registry.default_id + ".tex")[0]
+    filtered_source = re.sub(r"\{\{\s*(.+?)\s*\}\}", r"{{ \1 | latex_escape }}", source)
+    per_field = env.from_string(filtered_source)
+    legacy_env = Environment()
+    legacy_env.filters["latex_escape"] = legacy_latex_escape
+    legacy_per_field = legacy_env.from_string(filtered_source)
+    plain = env.from_string(source)
+
+    print(f"  render, legacy filter/field: {per_call_ms(lambda: legacy_per_field.render(resume=resume)):8.3f} ms")
+    print(f"  render, fast filter/field  : {per_call_ms(lambda: per_field.render(resume=resume)):8.3f} ms")
+    print(f"  render, pre-escaped model  : {per_call_ms(lambda: plain.render(resume=escape_resume(resume))):8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
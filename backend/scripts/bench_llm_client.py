@@ -0,0 +1,141 @@
+"""
+Benchmark for LLM client setup against a local OpenAI-compatible stub server.
+
+Compares the previous LLMClient path with the current one, both using the
+real ChatOpenAI client pointed at the stub:
+
+- baseline: ChatOpenAI built as the factory used to build it (the SDK's own
+  default HTTP client), with a new PromptTemplate and chain for every call.
+- current: LLMClient.generate_json() with the model LLMFactory.create_llm()
+  builds, i.e. the chain built once. The response cache is off, so every
+  call reaches the stub; breaker and cache-key bookkeeping are included in
+  the timing.
+
+The stub answers instantly over plain HTTP, so the difference is
+client-side overhead only; against a real provider each new connection
+also pays a TLS handshake. Each run reports new connections opened during
+the timed calls, after a warm-up.
+
+Usage:
+    python scripts/bench_llm_client.py [--calls 300] [--concurrency 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import PromptTemplate
+
+from app.core.config import settings
+from app.services.llm import JSON_PROMPT_TEMPLATE, LLMClient
+
+RESPONSE = json.dumps({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "bench",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": '{"role_type": "Engineer"}'},
+        "finish_reason": "stop",
+    }],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI-style chat completion endpoint that answers immediately."""
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, *args):
+        pass
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+def make_baseline(base_url):
+    """The previous path: SDK default client, prompt and chain built per call."""
+    from langchain_openai import ChatOpenAI
+
+    llm = ChatOpenAI(model=settings.OPENAI_MODEL, api_key="stub", base_url=base_url, temperature=0.0)
+    parser = JsonOutputParser()
+
+    async def call(prompt_text):
+        prompt = PromptTemplate(template=JSON_PROMPT_TEMPLATE, input_variables=["prompt"])
+        chain = prompt | llm | parser
+        return await chain.ainvoke({"prompt": prompt_text})
+    return call
+
+
+def make_current(base_url):
+    """The current path: factory-built model behind LLMClient."""
+    os.environ["OPENAI_BASE_URL"] = base_url  # Read by the OpenAI SDK
+    settings.LLM_PROVIDER = "openai"
+    settings.OPENAI_API_KEY = "stub"
+    client = LLMClient(cache=None)  # Builds its model with LLMFactory.create_llm()
+    assert client.llm is not None, "langchain-openai is not installed"
+    return client.generate_json
+
+
+async def run(call, calls, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            result = await call(f"Analyze job {i}")
+            assert result == {"role_type": "Engineer"}, result
+
+    await asyncio.gather(*(one(i) for i in range(calls)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    server = CountingServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    async def measure(factory):
+        call = factory(base_url)
+        await run(call, 20, args.concurrency)  # warm up
+        before = server.connections
+        started = time.perf_counter()
+        await run(call, args.calls, args.concurrency)
+        return time.perf_counter() - started, server.connections - before
+
+    print(f"{args.calls} calls, concurrency {args.concurrency}")
+    for name, factory in (("baseline", make_baseline), ("current", make_current)):
+        elapsed, connections = asyncio.run(measure(factory))
+        print(f"  {name:<9} {elapsed * 1000 / args.calls:7.3f} ms/call  {connections:4d} new connections")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import json
+import os
+import stat
+import sys
+import textwrap
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from main import app
+from app.api.deps import get_current_user
+from app.db.session import Base, get_db
+from app.models.sql_models import Resume as DBResume, User
+
+FAKE_PDFLATEX = textwrap.dedent("""\
+    #!{python}
+    # Stand-in for pdflatex: records its arguments and writes the usual outputs.
+    import json, os, sys
+    args = sys.argv[1:]
+    with open(os.environ["FAKE_PDFLATEX_CALLS"], "a") as f:
+        f.write(json.dumps({{"args": args, "cwd": os.getcwd(),
+                             "texformats": os.environ.get("TEXFORMATS")}}) + "\\n")
+    if "-ini" in args:
+        jobname = [a for a in args if a.startswith("-jobname=")][0].split("=", 1)[1]
+        open(jobname + ".fmt", "w").write("fmt")
+        sys.exit(0)
+    source = open("resume.tex").read()
+    log = "This is pdfTeX\\n"
+    if "\\\\label" in source:
+        if not os.path.exists("resume.aux"):
+            log += "LaTeX Warning: Label(s) may have changed. Rerun to get cross-references right.\\n"
+        open("resume.aux", "w").write("\\\\relax\\n\\\\newlabel{{sec}}{{{{1}}{{{{1}}}}}}\\n")
+    else:
+        open("resume.aux", "w").write("\\\\relax\\n")
+    if "\\\\section" in source:
+        # Every \\section writes a toc entry, read back only by \\tableofcontents
+        open("resume.aux", "a").write(
+            "\\\\@writefile{{toc}}{{\\\\contentsline {{section}}{{Experience}}{{1}}{{section.1}}}}\\n"
+        )
+        if "hyperref" in source and "bookmarks=false" not in source:
+            # hyperref bookmarks go to resume.out, which rerunfilecheck compares across runs
+            outline = "\\\\BOOKMARK [1][-]{{section.1}}{{Experience}}{{}}% 1\\n"
+            if not os.path.exists("resume.out") or open("resume.out").read() != outline:
+                log += ("Package rerunfilecheck Warning: File `resume.out' has changed.\\n"
+                        "(rerunfilecheck) Rerun to get outlines right\\n")
+            open("resume.out", "w").write(outline)
+    if "BROKEN" in source:
+        log += "./resume.tex:4: Undefined control sequence.\\nl.4 BROKEN\\n"
+        open("resume.log", "w").write(log)
+        sys.exit(1)
+    open("resume.log", "w").write(log)
+    open("resume.pdf", "wb").write(b"%PDF-" + source.encode())
+""")
+
+
+@pytest.fixture
+def fake_pdflatex(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "pdflatex"
+    script.write_text(FAKE_PDFLATEX.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    calls_file = tmp_path / "calls.jsonl"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_PDFLATEX_CALLS", str(calls_file))
+
+    def calls():
+        if not calls_file.exists():
+            return []
+        return [json.loads(line) for line in calls_file.read_text().splitlines()]
+
+    return calls
+
+
+@dataclass
+class DBClient:
+    """A test client on its own in-memory database, logged in as ``user_id``."""
+    client: TestClient
+    Session: sessionmaker
+    user_id: int
+
+
+@pytest.fixture
+def db_client(monkeypatch):
+    """
+    Returns a factory for a DBClient.
+
+    The factory creates a fresh in-memory database with one user, stores
+    ``resume`` as that user's base resume when given, and points the app's
+    database and current-user dependencies at it.
+    """
+    def make(resume: Optional[dict] = None, username: str = "tester") -> DBClient:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+        user = User(username=username, hashed_password="fakehash")
+        db.add(user)
+        db.commit()
+        if resume is not None:
+            db.add(DBResume(user_id=user.id, content=resume))
+            db.commit()
+        user_id = user.id
+        db.close()
+
+        def override_get_db():
+            session = Session()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+        monkeypatch.setitem(app.dependency_overrides, get_current_user, lambda: Session().get(User, user_id))
+        return DBClient(TestClient(app), Session, user_id)
+
+    return make
@@ -0,0 +1,97 @@
+from app.models.job_description import JDAnalysis, Keyword
+from app.models.resume import Resume
+from app.models.sql_models import JDAnalysisRecord
+from app.services.ats_scoring import score_many, score_resume
+
+RESUME = {
+    "contact_info": {"name": "Ada Lovelace", "email": "ada@example.com"},
+    "summary": "Backend engineer who enjoys distributed systems.",
+    "experience": [{
+        "company": "Analytical Engines",
+        "position": "Backend Engineer",
+        "description": ["Ran Python services on k8s", "Designed REST APIs backed by Postgres"],
+        "technologies": ["Docker"],
+    }],
+    "skills": [{"category": "Languages", "skills": ["Python", "SQL"]}],
+}
+
+BACKEND = JDAnalysis(
+    role_type="Backend Engineer",
+    keywords=[
+        Keyword(term="Python", importance=5, category="Technical"),
+        Keyword(term="Kubernetes", importance=4, category="Technical"),
+        Keyword(term="PostgreSQL", importance=4, category="Technical"),
+        Keyword(term="Kafka", importance=2, category="Technical"),
+        Keyword(term="Distributed Systems", importance=4, category="Domain"),
+        Keyword(term="REST APIs", importance=3, category="Technical"),
+    ],
+    required_skills=["Python", "Kubernetes", "Terraform"],
+)
+NURSE = JDAnalysis(
+    role_type="Registered Nurse",
+    keywords=[Keyword(term="Patient Care", importance=5, category="Domain")],
+    required_skills=["BLS"],
+)
+
+
+def test_scores_weighted_coverage_and_missing_keywords():
+    result = score_resume(Resume(**RESUME), BACKEND)
+
+    # Aliases (k8s, Postgres) count; the summary-only term gets half credit
+    assert result.matched == ["Python", "Kubernetes", "PostgreSQL", "Distributed Systems", "REST"]
+    assert result.missing == ["Terraform", "Kafka"]
+    covered = 5 + 4 + 4 + 0.5 * 4 + 3
+    assert result.score == round(100 * covered / (5 + 4 + 4 + 2 + 4 + 3 + 4), 1)
+
+
+def test_case_sensitive_skills_need_an_extractor_match():
+    resume = Resume(**{**RESUME, "experience": [{
+        "company": "Analytical Engines",
+        "position": "Director",
+        "description": ["Led go to market for the R and D org; Series C"],
+    }], "skills": []})
+    analysis = JDAnalysis(required_skills=["Go", "REST", "R", "C", "Go to market"])
+
+    # The lowercased phrase still matches a term outside the dictionary
+    result = score_resume(resume, analysis)
+    assert result.matched == ["Go to market"]
+    assert result.missing == ["Go", "REST", "R", "C"]
+
+
+def test_batch_matches_single_scores():
+    resume = Resume(**RESUME)
+    empty = JDAnalysis()
+    results = score_many(resume, [BACKEND, NURSE, empty])
+
+    assert results[0] == score_resume(resume, BACKEND)
+    assert results[1].score == 0.0
+    assert results[1].missing == ["Patient Care", "BLS"]
+    assert results[2].score == 0.0 and results[2].missing == []
+
+
+def test_batch_endpoint_ranks_inline_and_stored_analyses(db_client):
+    setup = db_client()
+    db = setup.Session()
+    record = JDAnalysisRecord(text_hash="h", minhash=[], analysis=BACKEND.model_dump(), created_at="now")
+    db.add(record)
+    db.commit()
+    record_id = record.id
+    db.close()
+
+    client = setup.client
+    response = client.post("/api/v1/score/batch", json={
+        "resume": RESUME,
+        "jd_analyses": [NURSE.model_dump()],
+        "analysis_ids": [record_id],
+    })
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item.get("analysis_id", item.get("index")) for item in results] == [record_id, 0]
+    assert results[0]["role_type"] == "Backend Engineer"
+    assert results[0]["missing"] == ["Terraform", "Kafka"]
+
+    response = client.post("/api/v1/score/batch", json={"resume": RESUME, "analysis_ids": [999]})
+    assert response.status_code == 404
+
+    response = client.post("/api/v1/score", json={"resume": RESUME, "jd_analysis": NURSE.model_dump()})
+    assert response.json() == {"score": 0.0, "matched": [], "missing": ["Patient Care", "BLS"]}
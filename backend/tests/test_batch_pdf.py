@@ -0,0 +1,124 @@
+import asyncio
+import io
+import json
+import multiprocessing
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from app.api import routes
+from app.models.sql_models import TailoredResume
+from app.services import batch_compiler
+from app.services.compile_engine import CompileEngine
+from app.services.compiler import CompileResult, LatexCompilationError
+from app.services.pdf_cache import PDFCache
+
+RESUME = {
+    "contact_info": {"name": "Ada Lovelace", "email": "ada@example.com"},
+    "experience": [{"company": "Analytical Engines", "position": "Engineer", "description": ["Wrote programs"]}],
+}
+
+
+@pytest.fixture
+def client(db_client, tmp_path, monkeypatch, fake_pdflatex):
+    seeded = db_client()
+    db = seeded.Session()
+    db.add(TailoredResume(user_id=seeded.user_id, job_description="JD", content=RESUME, created_at="now"))
+    db.add(TailoredResume(user_id=seeded.user_id, job_description="JD", content={"summary": "no contact"},
+                          created_at="now"))
+    db.commit()
+    db.close()
+
+    monkeypatch.setattr(routes, "pdf_cache", PDFCache(memory_items=8, disk_dir=None, max_disk_bytes=0))
+    monkeypatch.setattr(routes.settings, "LATEX_WORK_DIR", str(tmp_path / "latex"))
+    monkeypatch.setattr(batch_compiler, "_worker_pool", None)
+    monkeypatch.setattr(batch_compiler, "_process_pool", ThreadPoolExecutor(max_workers=2))
+    return seeded.client
+
+
+def test_batch_streams_zip_with_per_item_errors(client, monkeypatch):
+    compiled = []
+    compile_in_worker = batch_compiler._compile_in_worker
+
+    def counting_compile(latex_content):
+        compiled.append(latex_content)
+        return compile_in_worker(latex_content)
+
+    monkeypatch.setattr(batch_compiler, "_compile_in_worker", counting_compile)
+    broken = {**RESUME, "experience": [{**RESUME["experience"][0], "description": ["BROKEN"]}]}
+    response = client.post(
+        "/api/v1/generate-pdf/batch",
+        json={"resumes": [RESUME, broken], "history_ids": [1, 2, 99]},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert set(archive.namelist()) == {"resume-1.pdf", "history-1.pdf", "manifest.json"}
+    assert archive.read("resume-1.pdf").startswith(b"%PDF-")
+
+    manifest = {item["name"]: item for item in json.loads(archive.read("manifest.json"))}
+    assert manifest["resume-1.pdf"]["status"] == "ok"
+    assert manifest["resume-1.pdf"]["cache"] == "miss"
+    # The history copy renders to the same LaTeX, so it reuses that compile
+    assert manifest["history-1.pdf"]["status"] == "ok"
+    assert manifest["history-1.pdf"]["cache"] == "hit"
+    assert archive.read("history-1.pdf") == archive.read("resume-1.pdf")
+    assert len(compiled) == 2
+    assert manifest["resume-2.pdf"]["status"] == "error"
+    assert manifest["resume-2.pdf"]["error"]["message"] == "LaTeX compilation failed"
+    assert manifest["resume-2.pdf"]["error"]["latex_error"]["line"] == 4
+    assert manifest["history-2.pdf"]["error"]["message"].startswith("Invalid resume")
+    assert manifest["history-99.pdf"]["error"]["message"] == "Resume not found"
+
+
+def test_batch_rejects_oversized_requests(client, monkeypatch):
+    monkeypatch.setattr(routes.settings, "PDF_BATCH_MAX_ITEMS", 1)
+    response = client.post("/api/v1/generate-pdf/batch", json={"resumes": [RESUME, RESUME]})
+    assert response.status_code == 413
+
+
+def test_compile_many_across_processes(tmp_path, monkeypatch, fake_pdflatex):
+    monkeypatch.setenv("LATEX_WORK_DIR", str(tmp_path / "latex"))
+    documents = [
+        "\\documentclass{article}\n\\begin{document}\nOne\n\\end{document}\n",
+        "\\documentclass{article}\n\\begin{document}\nBROKEN\n\\end{document}\n",
+    ]
+
+    async def run():
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+            return dict([item async for item in batch_compiler.compile_many(documents, executor)])
+
+    results = asyncio.run(run())
+    assert isinstance(results[0], CompileResult)
+    assert isinstance(results[1], LatexCompilationError)
+    # The structured error survives the trip back from the worker process
+    assert results[1].error.line == 4
+
+
+def test_compile_many_shares_the_engine_limit(monkeypatch):
+    engine = CompileEngine(max_concurrency=2)
+    release = threading.Event()
+
+    def slow_compile(latex_content):
+        release.wait(timeout=5)
+        return latex_content
+
+    monkeypatch.setattr(batch_compiler, "_compile_in_worker", slow_compile)
+
+    async def run():
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = batch_compiler.compile_many([str(i) for i in range(6)], executor, engine)
+            first = asyncio.ensure_future(results.__anext__())
+            await asyncio.sleep(0.05)
+            stats = engine.stats()
+            release.set()
+            return stats, [await first] + [item async for item in results]
+
+    stats, results = asyncio.run(run())
+    # Only the engine's slots are used; the rest of the batch waits its turn
+    assert stats["active"] == 2 and stats["waiting"] == 0
+    assert sorted(index for index, _ in results) == list(range(6))
+    assert engine.stats()["completed"] == 6
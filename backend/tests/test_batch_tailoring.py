@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+import pytest
+
+from app.models.job_description import JDAnalysis
+from app.models.resume import Resume
+from app.models.sql_models import TailoredResume
+from app.services import batch_tailoring, tailoring
+from app.services.tailoring import build_resume_prefix
+
+RESUME = {
+    "contact_info": {"name": "Ada Lovelace", "email": "ada@example.com"},
+    "summary": "Engineer",
+    "experience": [{"company": "Analytical Engines", "position": "Engineer", "description": ["Wrote programs"]}],
+}
+
+
+class FakeLLM:
+    """Records prompts and the peak number of concurrent calls."""
+
+    def __init__(self):
+        self.prompts = []
+        self.active = 0
+        self.peak = 0
+
+    async def generate_json(self, prompt):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        role = json.loads(prompt.split("Job Analysis:", 1)[1])["role_type"]
+        return {**RESUME, "summary": f"Engineer for {role}"}
+
+
+@pytest.fixture
+def setup(db_client, monkeypatch):
+    seeded = db_client(RESUME)
+
+    async def fake_analyze(jd):
+        if "FAIL" in jd.raw_text:
+            raise RuntimeError("analysis failed")
+        return JDAnalysis(role_type=jd.raw_text)
+
+    llm = FakeLLM()
+    monkeypatch.setattr(batch_tailoring, "analyze_job_description", fake_analyze)
+    monkeypatch.setattr(tailoring, "llm_client", llm)
+    return seeded.client, seeded.Session, llm
+
+
+def test_batch_streams_each_jd_with_a_shared_prefix(setup):
+    client, Session, llm = setup
+    jds = [{"raw_text": f"Role {i}"} for i in range(6)] + [{"raw_text": "FAIL"}]
+
+    response = client.post("/api/v1/users/me/tailor/batch?mode=full", json={"jds": jds, "save": True})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    by_index = {line["index"]: line for line in lines}
+    assert sorted(by_index) == list(range(7))
+    assert by_index[6] == {"index": 6, "status": "error", "error": {"message": "analysis failed"}}
+    assert by_index[2]["status"] == "ok"
+    assert by_index[2]["resume"]["summary"] == "Engineer for Role 2"
+
+    # Bounded concurrency, and every prompt starts with the same resume prefix
+    assert 1 < llm.peak <= 4
+    prefix = build_resume_prefix(Resume(**RESUME))
+    assert len(llm.prompts) == 6 and all(prompt.startswith(prefix) for prompt in llm.prompts)
+
+    db = Session()
+    saved = {row.id: row for row in db.query(TailoredResume).all()}
+    assert len(saved) == 6
+    assert saved[by_index[2]["history_id"]].job_description == "Role 2"
+    assert "history_id" not in by_index[6]
+
+
+def test_batch_rejects_too_many_jds(setup, monkeypatch):
+    client, _, _ = setup
+    monkeypatch.setattr(batch_tailoring.settings, "TAILORING_BATCH_MAX_ITEMS", 2)
+    response = client.post("/api/v1/users/me/tailor/batch", json={"jds": [{"raw_text": "JD"}] * 3})
+    assert response.status_code == 413
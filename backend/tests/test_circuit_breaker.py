@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from app.core.config import settings
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.llm import LLMClient
+
+
+def test_opens_after_threshold_and_probes_when_half_open(monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10, half_open_max_calls=1)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    later = time.monotonic() + 11
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    assert breaker.state == "half_open"
+    breaker.before_call()  # The single probe is admitted
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_failure()  # A failed probe re-opens the breaker
+    assert breaker.state == "open"
+
+    later += 11
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["opened"] == 2
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("test", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_client_fails_fast_once_provider_keeps_failing():
+    calls = []
+
+    async def failing_provider(prompt_value):
+        calls.append(prompt_value)
+        raise ConnectionError("provider down")
+
+    client = LLMClient(cache=None, breaker=CircuitBreaker("llm", failure_threshold=2, reset_timeout=60))
+    client.llm = RunnableLambda(failing_provider)
+
+    results = [asyncio.run(client.generate_json(f"prompt {i}")) for i in range(4)]
+    assert results[:2] == [{}, {}]
+    assert results[2:] == [{"error": "LLM service unavailable"}] * 2
+    assert len(calls) == 2
+    assert client.stats()["circuit"]["state"] == "open"
+
+
+def test_slow_calls_time_out_and_count_as_failures(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_TIMEOUT_SECONDS", 0.05)
+
+    async def hanging_provider(prompt_value):
+        await asyncio.sleep(5)
+
+    client = LLMClient(cache=None, breaker=CircuitBreaker("llm", failure_threshold=1, reset_timeout=60))
+    client.llm = RunnableLambda(hanging_provider)
+
+    started = time.monotonic()
+    assert asyncio.run(client.generate_json("prompt")) == {}
+    assert time.monotonic() - started < 2
+    assert client.breaker.state == "open"
+
+
+def test_invalid_json_does_not_trip_the_breaker():
+    client = LLMClient(cache=None, breaker=CircuitBreaker("llm", failure_threshold=1))
+    client.llm = RunnableLambda(lambda prompt_value: "not json")
+
+    assert asyncio.run(client.generate_json("prompt")) == {}
+    assert client.breaker.state == "closed"
+
+
+def test_cancelled_probe_frees_its_slot():
+    async def hanging_provider(prompt_value):
+        await asyncio.sleep(5)
+
+    breaker = CircuitBreaker("llm", failure_threshold=1, reset_timeout=0.1)
+    client = LLMClient(cache=None, breaker=breaker)
+    client.llm = RunnableLambda(hanging_provider)
+    breaker.record_failure()
+    time.sleep(0.15)
+
+    async def scenario():
+        probe = asyncio.ensure_future(client.generate_json("prompt"))
+        await asyncio.sleep(0.02)
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # The probe holds the only slot
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        await asyncio.sleep(0.02)  # Let the provider call unwind
+
+    asyncio.run(scenario())
+    assert breaker.state == "half_open"
+    breaker.before_call()  # The slot is free again
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.models.job_description import JobDescription
+from app.models.resume import Resume
+from app.services import analysis, tailoring
+
+RESUME = {
+    "contact_info": {"name": "Ada Lovelace", "email": "ada@example.com"},
+    "summary": "Engineer",
+    "experience": [{"company": "Analytical Engines", "position": "Engineer", "description": ["Wrote programs"]}],
+}
+JD = "Backend Engineer\n\nRequirements:\n- Python and Kubernetes"
+
+
+class FakeLLM:
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    async def generate_json(self, prompt):
+        self.prompts.append(prompt)
+        return self.response
+
+
+@pytest.fixture
+def no_store(monkeypatch):
+    monkeypatch.setattr(analysis.settings, "JD_STORE_ENABLED", False)
+
+
+def test_combined_endpoint_makes_one_llm_call(no_store, db_client, monkeypatch):
+    async def unexpected(prompt):
+        raise AssertionError("The separate analysis call must not be made")
+
+    llm = FakeLLM({
+        "analysis": {"role_type": "Backend Engineer", "required_skills": ["Python"]},
+        "resume": {**RESUME, "summary": "Python backend engineer"},
+    })
+    monkeypatch.setattr(tailoring, "llm_client", llm)
+    monkeypatch.setattr(analysis.llm_client, "generate_json", unexpected)
+    client = db_client(RESUME).client
+
+    response = client.post("/api/v1/users/me/tailor?combined=true", json={"raw_text": JD})
+    assert response.status_code == 200
+    assert response.json()["summary"] == "Python backend engineer"
+    assert response.json()["contact_info"]["name"] == "Ada Lovelace"
+    assert len(llm.prompts) == 1
+    assert llm.prompts[0].startswith(tailoring.build_resume_prefix(Resume(**RESUME)))
+    assert "Python and Kubernetes" in llm.prompts[0]
+
+    response = client.post("/api/v1/users/me/tailor?combined=true&mode=patch", json={"raw_text": JD})
+    assert response.status_code == 400
+
+
+def test_invalid_parts_fall_back_independently(no_store, monkeypatch):
+    llm = FakeLLM({"analysis": {"keywords": "not a list"}, "resume": {"summary": "no contact info"}})
+    monkeypatch.setattr(tailoring, "llm_client", llm)
+    resume = Resume(**RESUME)
+
+    result_analysis, tailored = asyncio.run(tailoring.analyze_and_tailor(resume, JobDescription(raw_text=JD)))
+    assert tailored is resume
+    # The local keyword extractor stands in for the invalid analysis
+    assert result_analysis.role_type == "Backend Engineer"
+    assert "Python" in result_analysis.required_skills
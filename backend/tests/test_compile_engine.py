@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.compile_engine import CompileEngine, CompilerBusyError
+
+
+def test_rejects_when_wait_queue_is_full():
+    engine = CompileEngine(max_concurrency=1, max_queue=1, retry_after=7)
+    release = threading.Event()
+
+    def slow_compile():
+        release.wait(timeout=5)
+        return b"%PDF"
+
+    async def scenario():
+        running = asyncio.ensure_future(engine.run(slow_compile))
+        queued = asyncio.ensure_future(engine.run(slow_compile))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(CompilerBusyError) as exc_info:
+            await engine.run(slow_compile)
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "7"
+
+        # The event loop is still free while pdflatex "runs"
+        assert engine.stats()["active"] == 1
+        assert engine.stats()["waiting"] == 1
+
+        release.set()
+        assert await running == b"%PDF"
+        assert await queued == b"%PDF"
+
+    asyncio.run(scenario())
+    assert engine.stats()["completed"] == 2
+    assert engine.stats()["rejected"] == 1
+
+
+def test_wait_times_out():
+    engine = CompileEngine(max_concurrency=1, max_queue=4, queue_timeout=0.05)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(engine.run(release.wait, 5))
+        await asyncio.sleep(0.01)
+        with pytest.raises(CompilerBusyError):
+            await engine.run(release.wait, 5)
+        release.set()
+        await running
+
+    asyncio.run(scenario())
+    assert engine.stats()["timed_out"] == 1
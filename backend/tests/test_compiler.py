@@ -0,0 +1,170 @@
+import pytest
+
+from app.models.resume import Resume
+from app.services import compiler
+from app.services.latex import generate_latex
+from app.services.latex_log import parse_latex_log
+
+DOCUMENT = "\\documentclass{article}\n\\usepackage{hyperref}\n\\begin{document}\nHello\n\\end{document}\n"
+
+
+def test_split_preamble():
+    assert compiler.split_preamble(DOCUMENT) == "\\documentclass{article}\n\\usepackage{hyperref}\n"
+    assert compiler.split_preamble("no body") is None
+
+
+def test_warm_pool_builds_format_once_and_reuses_it(tmp_path, fake_pdflatex):
+    pool = compiler.WarmCompilerPool(size=1, root_dir=str(tmp_path / "latex"))
+
+    assert pool.compile(DOCUMENT).pdf.startswith(b"%PDF-")
+    assert pool.compile(DOCUMENT.replace("Hello", "World")).pdf.endswith(b"World\n\\end{document}\n")
+
+    calls = fake_pdflatex()
+    assert sum("-ini" in call["args"] for call in calls) == 1
+    compile_calls = [call for call in calls if "-ini" not in call["args"]]
+    assert all(any(a.startswith("-fmt=preamble-") for a in call["args"]) for call in compile_calls)
+    assert all(call["texformats"].startswith(pool.formats.fmt_dir) for call in compile_calls)
+    assert pool.stats()["formats"] == {"hits": 1, "builds": 1, "build_failures": 0}
+
+
+def test_warm_pool_rebuilds_format_when_preamble_changes(tmp_path, fake_pdflatex):
+    pool = compiler.WarmCompilerPool(size=1, root_dir=str(tmp_path / "latex"))
+    pool.compile(DOCUMENT)
+    pool.compile(DOCUMENT.replace("hyperref", "enumitem"))
+
+    assert pool.stats()["formats"]["builds"] == 2
+
+
+def test_document_errors_are_not_retried_without_format(tmp_path, fake_pdflatex):
+    pool = compiler.WarmCompilerPool(size=1, root_dir=str(tmp_path / "latex"))
+    with pytest.raises(compiler.LatexCompilationError):
+        pool.compile(DOCUMENT.replace("Hello", "BROKEN"))
+
+    # The format is still considered good
+    assert pool.formats.get(DOCUMENT) is not None
+    # The worker directory is returned to the pool
+    assert pool.stats()["idle_workers"] == 1
+
+
+def test_single_pass_without_rerun_request(tmp_path, fake_pdflatex):
+    result = compiler._compile_in_dir(str(tmp_path), DOCUMENT)
+
+    assert result.passes == 1
+    assert len(fake_pdflatex()) == 1
+
+
+def test_reruns_until_references_settle(tmp_path, fake_pdflatex):
+    result = compiler._compile_in_dir(str(tmp_path), DOCUMENT.replace("Hello", "Hello\\label{sec}"))
+
+    assert result.passes == 2
+    assert result.total_time == sum(result.pass_times)
+
+
+def test_pass_count_is_capped(tmp_path, fake_pdflatex, monkeypatch):
+    monkeypatch.setattr(compiler.settings, "LATEX_MAX_PASSES", 1)
+    result = compiler._compile_in_dir(str(tmp_path), DOCUMENT.replace("Hello", "Hello\\label{sec}"))
+
+    assert result.passes == 1
+
+
+def test_needs_rerun_ignores_boilerplate_aux_changes():
+    assert not compiler.needs_rerun("", "", "\\relax\n\\providecommand\\hyper@newdestlabel[2]{}\n")
+    assert compiler.needs_rerun("", "", "\\relax\n\\newlabel{sec}{{1}{1}}\n")
+    assert not compiler.needs_rerun("", "\\newlabel{sec}{{1}{1}}", "\\newlabel{sec}{{1}{1}}")
+    assert compiler.needs_rerun("Package rerunfilecheck Warning: (rerunfilecheck) Rerun to get outlines right", "", "")
+
+
+# .aux and .log of one pdflatex pass over templates/resume.tex
+TEMPLATE_AUX = """\\relax 
+\\providecommand\\hyper@newdestlabel[2]{}
+\\providecommand\\HyperFirstAtBeginDocument{\\AtBeginDocument}
+\\HyperFirstAtBeginDocument{\\ifx\\hyper@anchor\\@undefined
+\\global\\let\\oldnewlabel\\newlabel
+\\fi}
+\\@writefile{toc}{\\contentsline {section}{Experience}{1}{section*.1}\\protected@file@percent }
+\\@writefile{toc}{\\contentsline {section}{Education}{1}{section*.2}\\protected@file@percent }
+\\@writefile{toc}{\\contentsline {section}{Skills}{1}{section*.3}\\protected@file@percent }
+\\gdef \\@abspage@last{1}
+"""
+TEMPLATE_LOG = """This is pdfTeX, Version 3.141592653-2.6-1.40.25 (TeX Live 2023) (preloaded format=pdflatex)
+(./resume.tex
+Package hyperref Info: Link coloring OFF on input line 10.
+No file resume.aux.
+[1{/var/lib/texmf/fonts/map/pdftex/updmap/pdftex.map}] (./resume.aux) )
+Output written on resume.pdf (1 page, 41234 bytes).
+"""
+RESUME = Resume(
+    contact_info={"name": "Ada Lovelace", "email": "ada@example.com"},
+    experience=[{"company": "Analytical Engines", "position": "Engineer", "description": ["Wrote programs"]}],
+    skills=[{"category": "Languages", "skills": ["Python"]}],
+)
+
+
+def test_section_toc_entries_do_not_force_a_rerun():
+    source = generate_latex(RESUME, "resume")
+    assert not compiler.needs_rerun(TEMPLATE_LOG, "", TEMPLATE_AUX, source)
+    # They do once the document typesets a table of contents
+    with_toc = source.replace("\\begin{document}", "\\begin{document}\n\\tableofcontents")
+    assert compiler.needs_rerun(TEMPLATE_LOG, "", TEMPLATE_AUX, with_toc)
+
+
+def test_real_template_compiles_in_one_pass(tmp_path, fake_pdflatex):
+    source = generate_latex(RESUME, "resume")
+    assert compiler._compile_in_dir(str(tmp_path), source).passes == 1
+
+    # PDF bookmarks would make rerunfilecheck ask for a second pass every time
+    with_bookmarks = source.replace("[bookmarks=false]{hyperref}", "{hyperref}")
+    assert compiler._compile_in_dir(str(tmp_path), with_bookmarks).passes == 2
+
+
+def test_failed_compile_stops_after_first_pass_with_structured_error(tmp_path, fake_pdflatex):
+    with pytest.raises(compiler.LatexCompilationError) as exc_info:
+        compiler._compile_in_dir(str(tmp_path), DOCUMENT.replace("Hello", "BROKEN\\label{sec}"))
+
+    calls = fake_pdflatex()
+    assert len(calls) == 1
+    assert "-halt-on-error" in calls[0]["args"]
+    error = exc_info.value.error
+    assert error.line == 4
+    assert error.message == "Undefined control sequence."
+    assert "This is pdfTeX" not in str(exc_info.value)
+
+
+CLASSIC_LOG = """This is pdfTeX, Version 3.141592653
+(./resume.tex
+LaTeX2e <2022-11-01>
+! Undefined control sequence.
+l.27     \\item \\textbf{Acme & Co}
+                               \\hfill 2020 -- 2022
+Here is how much of TeX's memory you used:
+"""
+
+FILE_LINE_LOG = """(./resume.tex
+./resume.tex:12: Misplaced alignment tab character &.
+l.12     \\item Built tools for R&
+                             D teams
+./resume.tex:30: Missing $ inserted.
+!  ==> Fatal error occurred, no output PDF file produced!
+"""
+
+
+def test_parse_classic_error():
+    error = parse_latex_log(CLASSIC_LOG)
+    assert error.message == "Undefined control sequence."
+    assert error.line == 27
+    assert error.snippet == "\\item \\textbf{Acme & Co} \\hfill 2020 -- 2022"
+
+
+def test_parse_file_line_error_reports_only_the_first():
+    error = parse_latex_log(FILE_LINE_LOG)
+    assert error.line == 12
+    assert error.message == "Misplaced alignment tab character &."
+    assert error.snippet == "\\item Built tools for R& D teams"
+
+
+def test_parse_falls_back_to_source_snippet():
+    error = parse_latex_log("! LaTeX Error: Something's wrong.\n", source="a\nb")
+    assert error == compiler.LatexError(message="LaTeX Error: Something's wrong.")
+    error = parse_latex_log("./resume.tex:2: Missing $ inserted.\n", source="first\n  second line\n")
+    assert error.snippet == "second line"
+    assert parse_latex_log("This is pdfTeX\nOutput written on resume.pdf\n") is None
@@ -0,0 +1,106 @@
+from app.services import jd_compaction
+from app.services.jd_compaction import JDCompactor, count_tokens, split_sections
+
+JD = """Senior Backend Engineer
+
+About Acme Corp
+Acme was founded in 1999 and we are proud of our culture. Our mission is to
+make payments boring.
+
+Responsibilities:
+- Design, build and operate the services behind our payments platform
+- Own features end to end and mentor other engineers
+
+Requirements:
+- 5+ years of experience with Python
+- Knowledge of PostgreSQL, Redis and Kubernetes
+
+**Benefits**
+Health, dental and vision insurance, 401(k) matching, unlimited paid time off.
+
+Acme is an equal opportunity employer. We consider all applicants without regard
+to race, national origin, sexual orientation, gender identity or protected veteran status.
+"""
+
+
+def test_splits_on_blank_lines_and_headings():
+    sections = split_sections("Intro line\nResponsibilities:\n- Build things\n\nRequirements:\n- Python")
+    assert sections == ["Intro line", "Responsibilities:\n- Build things", "Requirements:\n- Python"]
+
+
+def test_drops_boilerplate_sections():
+    compactor = JDCompactor(token_budget=0)
+    result = compactor.compact(JD)
+
+    assert "Requirements:" in result.text
+    assert "Responsibilities:" in result.text
+    assert "founded in" not in result.text
+    assert "401(k)" not in result.text
+    assert "equal opportunity" not in result.text
+    assert result.dropped_sections == 3
+    assert result.tokens_saved > 0
+    assert not result.truncated
+
+
+def test_keeps_about_you_and_role_descriptions_under_about_headings():
+    text = """Data Engineer
+
+About You
+- 3+ years of experience with Spark and Airflow
+
+About This Position
+You will build the pipelines behind our reporting.
+
+About Us
+Founded in 2010, we are proud of our mission and our culture.
+
+Benefits
+We also design our office around you. 401(k) matching and paid time off.
+"""
+    result = JDCompactor(token_budget=0).compact(text)
+
+    assert "experience with Spark" in result.text
+    assert "build the pipelines" in result.text
+    assert "Founded in 2010" not in result.text
+    # A body that talks about the work is kept even under a boilerplate heading
+    assert "401(k)" in result.text
+    assert result.dropped_sections == 1
+
+
+def test_truncates_to_budget_keeping_relevant_sections():
+    filler = "\n\n".join(f"Team fact {i}: we like coffee and board games on Fridays." for i in range(40))
+    text = JD + "\n\n" + filler
+    compactor = JDCompactor(token_budget=120)
+    result = compactor.compact(text)
+
+    assert result.truncated
+    assert result.tokens <= 120 + 5  # separators between kept sections
+    assert "5+ years of experience with Python" in result.text
+    assert result.text.index("Responsibilities:") < result.text.index("Requirements:")
+
+    stats = compactor.stats()
+    assert stats["requests"] == 1
+    assert stats["tokens_saved"] == count_tokens(text) - result.tokens
+
+
+def test_short_clean_jd_is_left_alone():
+    text = "Backend engineer\nPython, FastAPI and PostgreSQL required."
+    result = JDCompactor(token_budget=1500).compact(text)
+    assert result.text == text
+    assert result.tokens_saved == 0
+
+
+def test_estimates_tokens_when_the_encoding_cannot_load(monkeypatch):
+    class OfflineTiktoken:
+        calls = 0
+
+        @classmethod
+        def get_encoding(cls, name):
+            cls.calls += 1
+            raise ConnectionError("no network")
+
+    monkeypatch.setattr(jd_compaction, "tiktoken", OfflineTiktoken)
+    monkeypatch.setattr(jd_compaction, "_encoding", None)
+    assert count_tokens("x" * 40) == 10
+    assert count_tokens("x" * 8) == 2
+    assert OfflineTiktoken.calls == 1
@@ -0,0 +1,106 @@
+import asyncio
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.session import Base
+from app.models.job_description import JDAnalysis, JobDescription
+from app.services import analysis
+from app.services.jd_store import JDAnalysisStore
+from app.services.similarity import MinHasher, normalize_text, shingles
+
+JD = """
+Senior Backend Engineer - Acme Corp (posted 2024-05-01)
+
+We are looking for a backend engineer to design, build and operate the
+services behind our payments platform. You will work closely with product
+and infrastructure teams, own features end to end, and mentor other
+engineers. Requirements: 5+ years of Python, experience with FastAPI or
+Django, PostgreSQL, Redis, Docker and Kubernetes, and a track record of
+shipping reliable distributed systems. Nice to have: Kafka, Terraform and
+AWS. Apply at https://jobs.acme.example/apply?utm_source=linkedin
+"""
+
+REPOST = JD.replace("2024-05-01", "June 3, 2024").replace(
+    "utm_source=linkedin", "utm_source=indeed&ref=42"
+).replace("\n", "  \n ")
+
+OTHER_JD = """
+Registered Nurse - City Hospital. Provide direct patient care in a busy
+emergency department, administer medication, coordinate with physicians
+and document treatment plans. Requires an active RN license and BLS.
+"""
+
+ANALYSIS = JDAnalysis(role_type="Backend Engineer", required_skills=["Python", "FastAPI"])
+
+
+def make_store(threshold=0.9):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return JDAnalysisStore(sessionmaker(bind=engine), threshold=threshold, hasher=MinHasher())
+
+
+def test_normalization_ignores_links_dates_and_whitespace():
+    assert normalize_text(JD) == normalize_text(REPOST)
+    assert "utm_source" not in normalize_text(JD)
+
+
+def test_similarity_estimates_jaccard():
+    hasher = MinHasher(num_perm=128, bands=32)
+    a = shingles(normalize_text(JD))
+    b = shingles(normalize_text(JD.replace("mentor other engineers", "mentor junior engineers")))
+    estimate = hasher.similarity(hasher.signature(a), hasher.signature(b))
+    assert abs(estimate - len(a & b) / len(a | b)) < 0.15
+    assert hasher.similarity(hasher.signature(a), hasher.signature(shingles(normalize_text(OTHER_JD)))) < 0.2
+
+
+def test_exact_and_near_duplicate_lookup():
+    store = make_store()
+    assert store.lookup(JD) is None
+    store.save(JD, ANALYSIS)
+
+    assert store.lookup(REPOST) == ANALYSIS
+    near = JD.replace("mentor other", "mentor fellow")
+    assert store.lookup(near) == ANALYSIS
+    assert store.lookup(OTHER_JD) is None
+
+    stats = store.stats()
+    assert stats["exact_hits"] == 1
+    assert stats["near_hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_threshold_is_respected():
+    store = make_store(threshold=0.99)
+    store.save(JD, ANALYSIS)
+    assert store.lookup(JD.replace("mentor other", "mentor fellow")) is None
+
+
+def test_years_and_seniority_must_match_for_a_near_hit():
+    store = make_store()
+    store.save(JD, ANALYSIS)
+    hasher = store.hasher
+    stored = hasher.signature(shingles(normalize_text(JD)))
+
+    for variant in (JD.replace("5+ years", "8+ years"), JD.replace("Senior Backend", "Junior Backend")):
+        # Similar enough for a near hit, but the posting asks for someone else
+        assert hasher.similarity(stored, hasher.signature(shingles(normalize_text(variant)))) >= 0.9
+        assert store.lookup(variant) is None
+    assert store.stats()["near_hits"] == 0
+
+
+def test_analysis_reuses_stored_result(monkeypatch):
+    store = make_store()
+    calls = []
+
+    async def fake_generate_json(prompt):
+        calls.append(prompt)
+        return ANALYSIS.model_dump()
+
+    monkeypatch.setattr(analysis, "jd_analysis_store", store)
+    monkeypatch.setattr(analysis.llm_client, "generate_json", fake_generate_json)
+
+    assert asyncio.run(analysis.analyze_job_description(JobDescription(raw_text=JD))) == ANALYSIS
+    assert asyncio.run(analysis.analyze_job_description(JobDescription(raw_text=REPOST))) == ANALYSIS
+    assert len(calls) == 1
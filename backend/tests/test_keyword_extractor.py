@@ -0,0 +1,96 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from main import app
+from app.models.job_description import JobDescription
+from app.services import analysis
+from app.services.keyword_extractor import AhoCorasick, extract_analysis
+
+JD = """Job Title: Senior Backend Engineer
+
+Responsibilities:
+- Design and operate Python microservices on Kubernetes
+- Mentor other engineers
+
+Requirements:
+- 5+ years of experience with Python and PostgreSQL
+- Solid knowledge of Docker and Kubernetes
+
+Nice to have:
+- Go or Rust
+- Experience with Kafka
+
+We value R&D and C++ expertise is a plus. Strong communication skills required.
+"""
+
+
+def test_aho_corasick_finds_overlapping_matches():
+    matcher = AhoCorasick({"he": "he", "she": "she", "his": "his", "hers": "hers"})
+    assert sorted(matcher.finditer("ushers")) == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_extracts_required_and_preferred_skills():
+    result = extract_analysis(JD)
+
+    assert result.role_type == "Senior Backend Engineer"
+    assert result.experience_level == "Senior"
+    assert set(result.required_skills) == {"Python", "PostgreSQL", "Docker", "Kubernetes"}
+    assert {"Go", "Rust", "Kafka", "C++"} <= set(result.preferred_skills)
+    # Whole words only, with case-sensitive short names
+    terms = {keyword.term for keyword in result.keywords}
+    assert "R" not in terms and "C" not in terms
+    assert result.key_responsibilities == [
+        "Design and operate Python microservices on Kubernetes",
+        "Mentor other engineers",
+    ]
+
+
+def test_ignores_lookalike_words_and_non_experience_years():
+    result = extract_analysis("""Operations Manager
+
+Requirements:
+- Over 100 years of combined tradition in hospitality
+- Led go to market for the rest of the R and D org; Series C
+- Keep a Type C charger and a spark of curiosity
+""")
+    assert result.required_skills == []
+    assert result.experience_level == "Unknown"
+
+    result = extract_analysis("""Backend Engineer
+
+Requirements:
+- 3-4 years of experience building RESTful services in C and R
+- Comfortable with REST and Golang
+""")
+    assert set(result.required_skills) == {"REST", "C", "R", "Go"}
+    assert result.experience_level == "Mid-level"
+
+
+def test_importance_reflects_section_and_frequency():
+    importance = {k.term: k.importance for k in extract_analysis(JD).keywords}
+    assert importance["Python"] == 5  # required and mentioned twice
+    assert importance["Kafka"] == 2
+    assert importance["PostgreSQL"] == 4
+    assert list(importance)[0] in ("Python", "Kubernetes")
+
+
+def test_llm_failure_falls_back_to_local_extractor(monkeypatch):
+    async def failing_generate_json(prompt):
+        return {"error": "LLM service unavailable"}
+
+    monkeypatch.setattr(analysis.settings, "JD_STORE_ENABLED", False)
+    monkeypatch.setattr(analysis.llm_client, "generate_json", failing_generate_json)
+    result = asyncio.run(analysis.analyze_job_description(JobDescription(raw_text=JD)))
+    assert result.role_type == "Senior Backend Engineer"
+    assert "Python" in result.required_skills
+
+
+def test_fast_mode_endpoint_skips_the_llm(monkeypatch):
+    async def unexpected(prompt):
+        raise AssertionError("LLM must not be called in fast mode")
+
+    monkeypatch.setattr(analysis.llm_client, "generate_json", unexpected)
+    response = TestClient(app).post("/api/v1/analyze-jd?mode=fast", json={"raw_text": JD})
+    assert response.status_code == 200
+    assert "Kubernetes" in response.json()["required_skills"]
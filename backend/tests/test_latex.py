@@ -0,0 +1,111 @@
+import os
+import random
+
+import pytest
+
+from app.models.resume import Resume
+from app.services.latex import (
+    LATEX_SPECIAL_CHARS,
+    TemplateNotFoundError,
+    TemplateRegistry,
+    _escape_batch,
+    escape_resume,
+    generate_latex,
+    latex_escape,
+    template_registry,
+)
+
+RESUME = Resume(
+    contact_info={"name": "Ada Lovelace", "email": "ada@example.com"},
+    experience=[{"company": "Analytical Engines", "position": "Engineer", "description": ["Wrote programs"]}],
+    skills=[{"category": "Languages", "skills": ["Python", "LaTeX"]}],
+)
+
+
+def write_template(path, body):
+    path.write_text(body)
+    # Make sure the change is visible to mtime-based reload checks
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    (tmp_path / "resume.tex").write_text("classic {{ resume.contact_info.name }}")
+    (tmp_path / "modern.tex").write_text("modern {{ resume.contact_info.name }}")
+    (tmp_path / "notes.txt").write_text("not a template")
+    return tmp_path
+
+
+def test_registry_routes_template_ids(template_dir):
+    registry = TemplateRegistry(str(template_dir))
+
+    assert registry.template_ids() == ["modern", "resume"]
+    assert registry.resolve("default") == "resume"
+    assert registry.get("modern").render(resume=RESUME) == "modern Ada Lovelace"
+    with pytest.raises(TemplateNotFoundError) as exc_info:
+        registry.get("../resume")
+    assert exc_info.value.status_code == 404
+
+
+def test_production_registry_ignores_edits(template_dir):
+    registry = TemplateRegistry(str(template_dir), auto_reload=False)
+    write_template(template_dir / "resume.tex", "edited")
+    (template_dir / "new.tex").write_text("new")
+
+    assert registry.get("default").render(resume=RESUME) == "classic Ada Lovelace"
+    with pytest.raises(TemplateNotFoundError):
+        registry.get("new")
+
+
+def test_development_registry_hot_reloads(template_dir, tmp_path):
+    registry = TemplateRegistry(str(template_dir), auto_reload=True, bytecode_cache_dir=str(tmp_path / "bytecode"))
+    write_template(template_dir / "resume.tex", "edited {{ resume.contact_info.name }}")
+    (template_dir / "new.tex").write_text("new")
+
+    assert registry.get("default").render(resume=RESUME) == "edited Ada Lovelace"
+    assert registry.get("new").render(resume=RESUME) == "new"
+
+
+def test_bundled_template_renders():
+    assert "default" not in template_registry.template_ids()
+    latex = generate_latex(RESUME)
+    assert "\\section{Experience}" in latex
+    assert "Analytical Engines" in latex
+
+
+def reference_escape(value):
+    return ''.join(LATEX_SPECIAL_CHARS.get(c, c) for c in value)
+
+
+def test_escape_matches_reference_implementation():
+    rng = random.Random(1234)
+    alphabet = "ab {}\\&%$#_~^\x00\x01é"
+    samples = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(500)]
+
+    assert [latex_escape(s) for s in samples] == [reference_escape(s) for s in samples]
+    clean = [s for s in samples if "\x00" not in s and "\x01" not in s]
+    assert _escape_batch(clean) == [reference_escape(s) for s in clean]
+    # Inputs containing the internal separator or sentinel still escape correctly
+    assert _escape_batch(samples) == [reference_escape(s) for s in samples]
+    assert latex_escape(None) is None
+
+
+def test_escape_resume_escapes_text_but_not_urls():
+    resume = Resume(
+        contact_info={"name": "R&D Lead", "email": "a@example.com", "github": "https://github.com/a_b"},
+        experience=[{"company": "50% Co", "position": "C# Dev", "description": ["Saved $1k_"]}],
+        projects=[{"name": "x", "description": "~home", "url": "https://example.com/#top"}],
+    )
+    view = escape_resume(resume)
+
+    assert view.contact_info.name == "R\\&D Lead"
+    assert view.contact_info.github == "https://github.com/a_b"
+    assert view.experience[0].description == ["Saved \\$1k\\_"]
+    assert view.projects[0].description == "\\textasciitilde{}home"
+    assert view.projects[0].url == "https://example.com/#top"
+
+    latex = generate_latex(resume, pre_escape=True)
+    assert "R\\&D Lead" in latex
+    assert "50\\% Co" in latex
+
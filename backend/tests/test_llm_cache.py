@@ -0,0 +1,88 @@
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.services.llm import LLMClient
+from app.services.llm_cache import LLMResponseCache
+
+
+def make_client(cache, responses):
+    client = LLMClient(cache=cache)
+    client.llm = FakeListChatModel(responses=responses)
+    return client
+
+
+def test_key_depends_on_provider_model_and_prompt():
+    key = LLMResponseCache.make_key("openai", "gpt-4", "prompt")
+    assert key == LLMResponseCache.make_key("openai", "gpt-4", "prompt")
+    assert key != LLMResponseCache.make_key("gemini", "gpt-4", "prompt")
+    assert key != LLMResponseCache.make_key("openai", "gpt-4o", "prompt")
+    assert key != LLMResponseCache.make_key("openai", "gpt-4", "prompt ")
+
+
+def test_repeated_prompt_is_served_from_cache(tmp_path):
+    cache = LLMResponseCache(memory_items=8, db_path=str(tmp_path / "llm.sqlite3"), max_entries=100)
+    client = make_client(cache, ['{"keywords": ["python"]}', '{"keywords": ["other"]}'])
+
+    first = asyncio.run(client.generate_json("Analyze this"))
+    first["keywords"].append("mutated")
+    second = asyncio.run(client.generate_json("Analyze this"))
+
+    assert second == {"keywords": ["python"]}
+    assert client.llm.i == 1  # The provider was only called once
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_failed_responses_are_not_cached(tmp_path):
+    cache = LLMResponseCache(memory_items=8, db_path=None, max_entries=100)
+    client = make_client(cache, ["not json", '{"ok": true}'])
+
+    assert asyncio.run(client.generate_json("Analyze this")) == {}
+    assert asyncio.run(client.generate_json("Analyze this")) == {"ok": True}
+
+
+def test_persistent_tier_survives_restart_and_evicts(tmp_path):
+    db_path = str(tmp_path / "llm.sqlite3")
+    cache = LLMResponseCache(memory_items=0, db_path=db_path, max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    assert cache.get("a") == {"n": 1}  # "b" is now least recently used
+    cache.put("c", {"n": 3})
+
+    restarted = LLMResponseCache(memory_items=8, db_path=db_path, max_entries=2)
+    assert restarted.get("b") is None
+    assert restarted.get("a") == {"n": 1}
+    assert restarted.get("c") == {"n": 3}
+    stats = restarted.stats()
+    assert stats["disk_hits"] == 2
+    assert stats["persistent_items"] == 2
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    cache = LLMResponseCache(memory_items=8, db_path=str(tmp_path / "llm.sqlite3"),
+                             max_entries=100, ttl_seconds=60)
+    cache.put("a", {"n": 1})
+    assert cache.get("a") == {"n": 1}
+
+    import time
+    now = time.time() + 120
+    monotonic = time.monotonic() + 120
+    monkeypatch.setattr(time, "time", lambda: now)
+    monkeypatch.setattr(time, "monotonic", lambda: monotonic)
+
+    assert cache.get("a") is None
+    assert cache.stats()["expired"] == 1
+    assert cache.stats()["persistent_items"] == 0
+
+
+def test_chain_is_built_once_per_model():
+    client = make_client(None, ['{"a": 1}', '{"a": 2}'])
+    chain = client.chain
+    asyncio.run(client.generate_json("first"))
+    assert client.chain is chain
+
+    client.llm = FakeListChatModel(responses=['{"b": 1}'])
+    assert client.chain is not chain
+    assert asyncio.run(client.generate_json("second")) == {"b": 1}
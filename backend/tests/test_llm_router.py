@@ -0,0 +1,138 @@
+import asyncio
+import json
+import random
+import time
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.llm import LLMClient
+from app.services.llm_router import LatencyTracker, LLMRouter, RouteTarget
+
+
+def provider(name, delay=0.0, fail=False, calls=None):
+    """An in-process fake provider that answers with its own name."""
+    def answer(prompt):
+        if calls is not None:
+            calls.append(name)
+        if fail:
+            raise RuntimeError(f"{name} is down")
+        return name
+
+    async def call(prompt):
+        await asyncio.sleep(delay)
+        return answer(prompt)
+    return RunnableLambda(answer, afunc=call)
+
+
+def make_router(*targets, **kwargs):
+    kwargs.setdefault("hedge_initial_delay", 0.05)
+    return LLMRouter(list(targets), rng=random.Random(0), **kwargs)
+
+
+def test_fails_over_to_the_next_provider():
+    primary = RouteTarget("primary", provider("primary", fail=True), weight=1)
+    standby = RouteTarget("standby", provider("standby"), weight=0)
+    router = make_router(primary, standby)
+
+    assert asyncio.run(router.ainvoke("prompt")) == "standby"
+    assert router.invoke("prompt") == "standby"
+    stats = router.stats()["providers"]
+    assert stats["primary"]["failures"] == 2
+    assert stats["standby"]["successes"] == 2
+    assert stats["standby"]["hedges"] == 0
+
+
+def test_slow_primary_is_hedged_and_first_answer_wins():
+    primary = RouteTarget("primary", provider("primary", delay=1.0), weight=1)
+    standby = RouteTarget("standby", provider("standby", delay=0.01), weight=0)
+    router = make_router(primary, standby)
+
+    started = time.monotonic()
+    assert asyncio.run(router.ainvoke("prompt")) == "standby"
+    assert time.monotonic() - started < 0.5
+    stats = router.stats()["providers"]
+    assert stats["standby"]["hedges"] == 1
+    assert stats["standby"]["hedge_wins"] == 1
+    assert stats["primary"]["cancelled"] == 1
+
+
+def test_fast_primary_is_not_hedged():
+    calls = []
+    primary = RouteTarget("primary", provider("primary", delay=0.01, calls=calls), weight=1)
+    standby = RouteTarget("standby", provider("standby", calls=calls), weight=0)
+    router = make_router(primary, standby, hedge_initial_delay=0.5)
+
+    assert asyncio.run(router.ainvoke("prompt")) == "primary"
+    assert calls == ["primary"]
+
+
+def test_hedge_delay_follows_the_latency_percentile():
+    tracker = LatencyTracker(window=100)
+    for ms in range(1, 101):
+        tracker.record(ms / 1000)
+    assert tracker.percentile(95) == 0.095
+    assert tracker.percentile(50) == 0.05
+
+    target = RouteTarget("primary", provider("primary"))
+    router = make_router(target, hedge_min_samples=3, hedge_initial_delay=5.0)
+    assert router.hedge_delay(target) == 5.0
+    for seconds in (0.1, 0.2, 0.3):
+        target.latencies.record(seconds)
+    assert router.hedge_delay(target) == 0.3
+
+
+def test_timeout_fails_over_without_hedging():
+    primary = RouteTarget("primary", provider("primary", delay=1.0), weight=1, timeout=0.05)
+    standby = RouteTarget("standby", provider("standby"), weight=0)
+    router = make_router(primary, standby, hedging=False)
+
+    assert asyncio.run(router.ainvoke("prompt")) == "standby"
+    assert router.stats()["providers"]["primary"]["timeouts"] == 1
+
+
+def test_open_breaker_skips_provider():
+    calls = []
+    primary = RouteTarget("primary", provider("primary", fail=True, calls=calls), weight=1,
+                          breaker=CircuitBreaker("primary", failure_threshold=1, reset_timeout=60))
+    standby = RouteTarget("standby", provider("standby", calls=calls), weight=1)
+    router = make_router(primary, standby)
+
+    for _ in range(5):
+        assert asyncio.run(router.ainvoke("prompt")) == "standby"
+    assert calls.count("primary") == 1
+
+    standby.breaker = CircuitBreaker("standby", failure_threshold=1, reset_timeout=60)
+    standby.breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(router.ainvoke("prompt"))
+
+
+def test_weights_pick_the_primary():
+    calls = []
+    heavy = RouteTarget("heavy", provider("heavy", calls=calls), weight=9)
+    light = RouteTarget("light", provider("light", calls=calls), weight=1)
+    router = make_router(heavy, light)
+
+    for _ in range(200):
+        asyncio.run(router.ainvoke("prompt"))
+    assert 150 < calls.count("heavy") < 200
+    assert calls.count("light") > 0
+
+
+def test_router_plugs_into_the_llm_client():
+    broken = RouteTarget("broken", provider("broken", fail=True), weight=1)
+    fake = RouteTarget("fake", FakeListChatModel(responses=[json.dumps({"ok": True})]), weight=0)
+    client = LLMClient(cache=None)
+    client.llm = make_router(broken, fake)
+
+    assert asyncio.run(client.generate_json("Say ok")) == {"ok": True}
+    assert client.stats()["router"]["providers"]["broken"]["failures"] == 1
+    assert client.breaker.state == "closed"
+
+    async def stream():
+        return [event async for event in client.stream_json("Say ok")]
+
+    assert asyncio.run(stream())[-1] == ((), {"ok": True})
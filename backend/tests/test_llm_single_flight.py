@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from app.services.llm import LLMClient
+
+
+class SlowProvider:
+    """Stand-in chat model that answers after a release event is set."""
+
+    def __init__(self, response='{"ok": true}', error=None):
+        self.response = response
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+        self.release = None
+
+    async def __call__(self, prompt_value):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+        return self.response
+
+
+def make_client(provider):
+    client = LLMClient(cache=None)
+    client.llm = RunnableLambda(provider)
+    return client
+
+
+def test_concurrent_identical_prompts_share_one_call():
+    provider = SlowProvider()
+    client = make_client(provider)
+
+    async def scenario():
+        provider.release = asyncio.Event()
+        calls = [asyncio.ensure_future(client.generate_json("same")) for _ in range(5)]
+        other = asyncio.ensure_future(client.generate_json("different"))
+        await asyncio.sleep(0)
+        provider.release.set()
+        results = await asyncio.gather(*calls, other)
+        results[0]["ok"] = "mutated"
+        return results
+
+    results = asyncio.run(scenario())
+    assert results[1:] == [{"ok": True}] * 5
+    assert provider.calls == 2
+    assert client.stats()["deduplicated"] == 4
+    assert client.stats()["in_flight"] == 0
+
+
+def test_errors_reach_every_waiter():
+    provider = SlowProvider(error=RuntimeError("provider down"))
+    client = make_client(provider)
+
+    async def scenario():
+        provider.release = asyncio.Event()
+        calls = [asyncio.ensure_future(client.generate_json("same")) for _ in range(3)]
+        await asyncio.sleep(0)
+        provider.release.set()
+        return await asyncio.gather(*calls)
+
+    assert asyncio.run(scenario()) == [{}, {}, {}]
+    assert provider.calls == 1
+
+
+def test_cancelling_one_waiter_keeps_the_call_for_others():
+    provider = SlowProvider()
+    client = make_client(provider)
+
+    async def scenario():
+        provider.release = asyncio.Event()
+        first = asyncio.ensure_future(client.generate_json("same"))
+        second = asyncio.ensure_future(client.generate_json("same"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        provider.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == {"ok": True}
+    assert provider.cancelled == 0
+
+
+def test_call_is_cancelled_when_every_waiter_is_gone():
+    provider = SlowProvider()
+    client = make_client(provider)
+
+    async def scenario():
+        provider.release = asyncio.Event()
+        calls = [asyncio.ensure_future(client.generate_json("same")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for call in calls:
+            call.cancel()
+        await asyncio.gather(*calls, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        assert client.stats()["in_flight"] == 0
+
+        # A later caller starts a fresh provider call
+        retry = asyncio.ensure_future(client.generate_json("same"))
+        await asyncio.sleep(0)
+        provider.release.set()
+        return await retry
+
+    assert asyncio.run(scenario()) == {"ok": True}
+    assert provider.cancelled == 1
+    assert provider.calls == 2
@@ -0,0 +1,45 @@
+import os
+
+from app.services.pdf_cache import PDFCache
+
+
+def test_key_depends_on_latex_and_template():
+    key = PDFCache.make_key("\\documentclass{article}", "default")
+    assert key == PDFCache.make_key("\\documentclass{article}", "default")
+    assert key != PDFCache.make_key("\\documentclass{article}", "modern")
+    assert key != PDFCache.make_key("\\documentclass{report}", "default")
+
+
+def test_memory_tier_is_bounded_lru(tmp_path):
+    cache = PDFCache(memory_items=2, disk_dir=None, max_disk_bytes=0)
+    cache.put("a", b"A")
+    cache.put("b", b"B")
+    assert cache.get("a") == b"A"  # "a" is now most recently used
+    cache.put("c", b"C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"A"
+    assert cache.get("c") == b"C"
+    stats = cache.stats()
+    assert stats["memory_hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["memory_items"] == 2
+
+
+def test_disk_tier_survives_restart_and_evicts(tmp_path):
+    cache = PDFCache(memory_items=1, disk_dir=str(tmp_path), max_disk_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"67890")
+    for name in ("a.pdf", "b.pdf"):
+        os.utime(tmp_path / name, (1_000_000, 1_000_000))
+
+    # A fresh instance only has the disk tier to go on
+    restarted = PDFCache(memory_items=1, disk_dir=str(tmp_path), max_disk_bytes=10)
+    assert restarted.stats()["disk_bytes"] == 10
+    assert restarted.get("a") == b"12345"
+    assert restarted.stats()["disk_hits"] == 1
+
+    restarted.put("c", b"abcde")
+    assert restarted.stats()["disk_bytes"] <= 10
+    assert restarted.stats()["evictions"] == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.pdf", "c.pdf"]
@@ -0,0 +1,39 @@
+from fastapi.testclient import TestClient
+
+from main import app
+from app.models.resume import Resume
+from app.services.preview import render_preview
+
+RESUME = Resume(
+    contact_info={"name": "Ada Lovelace", "email": "ada@example.com"},
+    experience=[{"company": "Analytical Engines", "position": "Engineer", "description": ["Wrote programs"]}],
+    skills=[{"category": "Languages", "skills": ["Python", "LaTeX"]}],
+)
+
+
+def test_preview_follows_latex_section_order_and_escapes_html():
+    resume = RESUME.model_copy(deep=True)
+    resume.experience[0].description.append("<script>alert(1)</script> & more")
+    html = render_preview(resume, "html")
+    text = render_preview(resume, "text")
+
+    assert "&lt;script&gt;" in html and "<script>" not in html
+    for rendered in (html, text.title()):
+        positions = [rendered.index(section) for section in ("Experience", "Education", "Skills")]
+        assert positions == sorted(positions)
+    assert "  - Wrote programs" in text
+    assert "Languages: Python, LaTeX" in text
+
+
+def test_preview_endpoint_returns_the_requested_format():
+    client = TestClient(app)
+    body = RESUME.model_dump(mode="json")
+
+    response = client.post("/api/v1/preview", json=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.text == render_preview(RESUME, "html")
+
+    response = client.post("/api/v1/preview?format=text", json=body)
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text == render_preview(RESUME, "text")
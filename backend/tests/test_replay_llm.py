@@ -0,0 +1,74 @@
+import asyncio
+import json
+import time
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.services import llm_factory
+from app.services.llm import LLMClient
+from app.services.llm_factory import LLMFactory
+from app.services.replay_llm import CassetteMissError, ReplayChatModel
+
+ANSWER = json.dumps({"role_type": "Backend Engineer", "required_skills": ["Python"]})
+
+
+def test_records_then_replays_offline(tmp_path):
+    cassette = str(tmp_path / "cassettes" / "llm.jsonl")
+    upstream = FakeListChatModel(responses=[ANSWER, "unused"])
+    recorder = ReplayChatModel(cassette_path=cassette, mode="record", upstream=upstream)
+
+    assert asyncio.run(recorder.ainvoke("Analyze this JD")).content == ANSWER
+    # Already recorded prompts are not sent upstream again
+    assert recorder.invoke("Analyze this JD").content == ANSWER
+    assert upstream.i == 1
+    lines = open(cassette).read().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["messages"] == [{"role": "human", "content": "Analyze this JD"}]
+
+    replay = ReplayChatModel(cassette_path=cassette)
+    assert replay.recorded == 1
+    assert asyncio.run(replay.ainvoke("Analyze this JD")).content == ANSWER
+    with pytest.raises(CassetteMissError):
+        replay.invoke("A prompt nobody recorded")
+
+
+def test_injects_seeded_latency(tmp_path):
+    cassette = tmp_path / "llm.jsonl"
+    recorder = ReplayChatModel(cassette_path=str(cassette), mode="record",
+                               upstream=FakeListChatModel(responses=[ANSWER]))
+    recorder.invoke("prompt")
+
+    replay = ReplayChatModel(cassette_path=str(cassette), latency_ms=50, latency_jitter_ms=20, seed=7)
+    started = time.monotonic()
+    asyncio.run(replay.ainvoke("prompt"))
+    assert time.monotonic() - started >= 0.03
+
+    delays = [ReplayChatModel(cassette_path=str(cassette), latency_ms=50, latency_jitter_ms=20, seed=7)._delay()
+              for _ in range(2)]
+    assert delays[0] == delays[1] and 0.03 <= delays[0] <= 0.07
+
+
+def test_factory_builds_replay_provider_for_the_client(tmp_path, monkeypatch):
+    cassette = tmp_path / "llm.jsonl"
+    client = LLMClient(cache=None)
+    client.llm = ReplayChatModel(cassette_path=str(cassette), mode="record",
+                                 upstream=FakeListChatModel(responses=[ANSWER]))
+    assert asyncio.run(client.generate_json("Analyze")) == json.loads(ANSWER)
+
+    monkeypatch.setattr(llm_factory.settings, "LLM_PROVIDER", "replay")
+    monkeypatch.setattr(llm_factory.settings, "LLM_REPLAY_MODE", "replay")
+    monkeypatch.setattr(llm_factory.settings, "LLM_REPLAY_CASSETTE", str(cassette))
+    model = LLMFactory.create_llm()
+    assert isinstance(model, ReplayChatModel) and model.upstream is None
+    assert LLMFactory.model_name() == str(cassette)
+
+    client.llm = model
+    assert asyncio.run(client.generate_json("Analyze")) == json.loads(ANSWER)
+
+    async def stream():
+        return [event async for event in client.stream_json("Analyze")]
+
+    events = asyncio.run(stream())
+    assert events[-1] == ((), json.loads(ANSWER))
+    assert len(events) > 1
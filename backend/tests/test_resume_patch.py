@@ -0,0 +1,107 @@
+import asyncio
+
+from app.models.job_description import JDAnalysis
+from app.models.resume import Resume
+from app.services import tailoring
+from app.services.resume_patch import apply_edits
+
+RESUME = Resume(
+    contact_info={"name": "Ada Lovelace", "email": "ada@example.com"},
+    summary="Engineer",
+    education=[{"institution": "University of London", "degree": "BSc", "start_date": "1830"}],
+    experience=[
+        {"company": "Analytical Engines", "position": "Engineer", "start_date": "1842",
+         "description": ["Wrote programs", "Fixed bugs", "Gave talks"]},
+    ],
+    projects=[{"name": "Notes", "description": "Notes on the engine"}],
+    skills=[
+        {"category": "Tools", "skills": ["Git"]},
+        {"category": "Languages", "skills": ["C", "Python"]},
+    ],
+)
+
+
+def test_valid_edits_apply_and_invalid_ones_are_dropped_individually():
+    result = apply_edits(RESUME, [
+        {"op": "summary", "text": "Backend engineer"},
+        {"op": "bullet_order", "exp": 0, "order": [2, 0, 1]},
+        {"op": "bullet", "exp": 0, "index": 0, "text": "Gave Python talks"},
+        {"op": "bullet", "exp": 3, "index": 0, "text": "No such position"},
+        {"op": "bullet", "exp": 0, "index": 1, "text": ""},
+        {"op": "bullet_order", "exp": 0, "order": [0, 0, 1]},
+        {"op": "project", "index": 0, "text": "Python notes"},
+        {"op": "skills", "order": [{"category": "Languages", "skills": ["Python", "C"]}]},
+        {"op": "education", "text": "PhD"},
+        "not an edit",
+    ])
+
+    assert result.applied == 5
+    assert len(result.rejected) == 5
+    tailored = result.resume
+    assert tailored.summary == "Backend engineer"
+    assert tailored.experience[0].description == ["Gave Python talks", "Wrote programs", "Fixed bugs"]
+    assert tailored.projects[0].description == "Python notes"
+    assert [c.category for c in tailored.skills] == ["Languages", "Tools"]
+    assert tailored.skills[0].skills == ["Python", "C"]
+    # Untouched fields survive, and the base resume is not modified
+    assert tailored.education == RESUME.education
+    assert tailored.experience[0].start_date == "1842"
+    assert RESUME.experience[0].description == ["Wrote programs", "Fixed bugs", "Gave talks"]
+
+
+def test_patch_mode_applies_model_edits(monkeypatch):
+    prompts = []
+
+    class FakeLLM:
+        async def generate_json(self, prompt):
+            prompts.append(prompt)
+            return {"edits": [
+                {"op": "summary", "text": "Backend engineer"},
+                {"op": "bullet", "exp": 0, "index": 9, "text": "Out of range"},
+            ]}
+
+    monkeypatch.setattr(tailoring, "llm_client", FakeLLM())
+    tailored = asyncio.run(tailoring.tailor_resume_content(RESUME, JDAnalysis(), mode="patch"))
+
+    assert tailored.summary == "Backend engineer"
+    assert tailored.experience == RESUME.experience
+    # The contact details are not sent to the model at all
+    assert "ada@example.com" not in prompts[0]
+
+
+def test_patch_mode_keeps_base_resume_on_llm_failure(monkeypatch):
+    class FailingLLM:
+        async def generate_json(self, prompt):
+            return {}
+
+    monkeypatch.setattr(tailoring, "llm_client", FailingLLM())
+    assert asyncio.run(tailoring.tailor_resume_content(RESUME, JDAnalysis(), mode="patch")) == RESUME
+
+
+def test_malformed_values_are_rejected_without_losing_other_edits():
+    result = apply_edits(RESUME, [
+        {"op": "bullet_order", "exp": 0, "order": [1.0, 0.0, 2.0]},
+        {"op": "bullet_order", "exp": 0, "order": [1, "0", 2]},
+        {"op": "skills", "order": [
+            {"category": ["Languages"], "skills": ["Python"]},
+            {"category": "Tools", "skills": [{"name": "Git"}, ["Git"]]},
+        ]},
+        {"op": "skills", "order": [{"category": "Languages", "skills": "Python"}]},
+        {"op": "summary", "text": "Backend engineer"},
+    ])
+
+    assert len(result.rejected) == 2
+    assert result.applied == 3
+    assert result.resume.summary == "Backend engineer"
+    assert result.resume.experience[0].description == RESUME.experience[0].description
+    assert [c.category for c in result.resume.skills] == ["Languages", "Tools"]
+    assert result.resume.skills[0].skills == ["C", "Python"]
+
+
+def test_patch_mode_ignores_non_object_response(monkeypatch):
+    class ListLLM:
+        async def generate_json(self, prompt):
+            return [{"op": "summary", "text": "Backend engineer"}]
+
+    monkeypatch.setattr(tailoring, "llm_client", ListLLM())
+    assert asyncio.run(tailoring.tailor_resume_content(RESUME, JDAnalysis(), mode="patch")) == RESUME
@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+
+import pytest
+
+from app.services.sandbox import CompileLimitExceeded, SandboxLimits, run_sandboxed
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX resource limits")
+
+
+def is_running(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split()[2] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+def test_normal_exit_code_is_returned(tmp_path):
+    result = run_sandboxed(python("import sys; sys.exit(3)"), cwd=str(tmp_path), limits=SandboxLimits())
+    assert result.returncode == 3
+
+
+def test_wall_clock_timeout_kills_process_tree(tmp_path):
+    pid_file = tmp_path / "child.pid"
+    code = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+        "time.sleep(60)\n"
+    )
+    started = time.monotonic()
+    with pytest.raises(CompileLimitExceeded) as exc_info:
+        run_sandboxed(python(code), cwd=str(tmp_path), limits=SandboxLimits(wall_seconds=1))
+
+    assert exc_info.value.reason == "timeout"
+    assert time.monotonic() - started < 10
+    child_pid = int(pid_file.read_text())
+    time.sleep(0.1)
+    assert not is_running(child_pid)
+
+
+def test_cpu_limit(tmp_path):
+    limits = SandboxLimits(wall_seconds=20, cpu_seconds=1)
+    with pytest.raises(CompileLimitExceeded) as exc_info:
+        run_sandboxed(python("while True: pass"), cwd=str(tmp_path), limits=limits)
+    assert exc_info.value.reason == "cpu"
+
+
+def test_output_limit(tmp_path):
+    limits = SandboxLimits(output_bytes=1024 * 1024)
+    code = ("import signal; signal.signal(signal.SIGXFSZ, signal.SIG_DFL); "
+            "open('big', 'wb').write(b'x' * 4 * 1024 * 1024)")
+    with pytest.raises(CompileLimitExceeded) as exc_info:
+        run_sandboxed(python(code), cwd=str(tmp_path), limits=limits)
+    assert exc_info.value.reason == "output"
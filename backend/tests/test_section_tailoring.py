@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+from app.models.job_description import JDAnalysis
+from app.models.resume import Resume, SkillCategory
+from app.services import section_tailoring
+from app.services.tailoring import tailor_resume_content
+
+RESUME = Resume(
+    contact_info={"name": "Ada Lovelace", "email": "ada@example.com"},
+    summary="Engineer",
+    experience=[
+        {"company": "Analytical Engines", "position": "Engineer", "description": ["Wrote programs"]},
+        {"company": "Difference Engines", "position": "Intern", "description": ["Oiled gears"]},
+        {"company": "Empty Co", "position": "Advisor"},
+    ],
+    projects=[{"name": "Notes", "description": "Notes on the engine"}],
+    skills=[
+        {"category": "Tools", "skills": ["Git", "Docker"]},
+        {"category": "Languages", "skills": ["C", "Python"]},
+    ],
+)
+ANALYSIS = JDAnalysis(role_type="Backend Engineer", required_skills=["Python"])
+
+
+class FakeLLM:
+    """Answers section prompts after a delay, tracking how many run at once."""
+
+    def __init__(self, delay=0.1, fail=()):
+        self.delay = delay
+        self.fail = fail
+        self.running = 0
+        self.max_running = 0
+        self.calls = 0
+
+    async def generate_json(self, prompt):
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        if any(marker in prompt for marker in self.fail):
+            return {}
+        if '{"summary": "string"}' in prompt:
+            return {"summary": "Backend engineer"}
+        if "Oiled gears" in prompt:
+            return {"description": ["Maintained Python tooling"]}
+        if "Wrote programs" in prompt:
+            return {"description": ["Wrote Python programs", "Shipped them"]}
+        if "Notes on the engine" in prompt:
+            return {"description": "Python notes on the engine"}
+        return {"skills": [
+            {"category": "Languages", "skills": ["Python", "Rust", "C"]},
+            {"category": "Made Up", "skills": ["X"]},
+        ]}
+
+
+def test_sections_run_concurrently_and_merge(monkeypatch):
+    llm = FakeLLM(delay=0.2)
+    monkeypatch.setattr(section_tailoring, "llm_client", llm)
+
+    started = time.monotonic()
+    tailored = asyncio.run(tailor_resume_content(RESUME, ANALYSIS, mode="sections"))
+    elapsed = time.monotonic() - started
+
+    assert llm.calls == 5  # summary, two experience items, one project, skills
+    assert elapsed < 0.2 * 3
+    assert tailored.summary == "Backend engineer"
+    assert tailored.experience[0].description == ["Wrote Python programs", "Shipped them"]
+    assert tailored.experience[1].description == ["Maintained Python tooling"]
+    assert tailored.experience[2].description == []
+    assert tailored.projects[0].description == "Python notes on the engine"
+    # Reordered, but nothing invented or dropped
+    assert tailored.skills == [
+        SkillCategory(category="Languages", skills=["Python", "C"]),
+        SkillCategory(category="Tools", skills=["Git", "Docker"]),
+    ]
+    assert RESUME.summary == "Engineer"
+
+
+def test_concurrency_is_bounded(monkeypatch):
+    llm = FakeLLM(delay=0.05)
+    monkeypatch.setattr(section_tailoring, "llm_client", llm)
+
+    asyncio.run(section_tailoring.tailor_resume_by_section(RESUME, ANALYSIS, concurrency=2))
+    assert llm.max_running == 2
+
+
+def test_failed_sections_are_left_unchanged(monkeypatch):
+    llm = FakeLLM(delay=0, fail=("Oiled gears", '{"summary": "string"}'))
+    monkeypatch.setattr(section_tailoring, "llm_client", llm)
+
+    tailored = asyncio.run(section_tailoring.tailor_resume_by_section(RESUME, ANALYSIS))
+    assert tailored.summary == "Engineer"
+    assert tailored.experience[1].description == ["Oiled gears"]
+    assert tailored.experience[0].description == ["Wrote Python programs", "Shipped them"]
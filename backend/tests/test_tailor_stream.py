@@ -0,0 +1,97 @@
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.api import users
+from app.models.job_description import JDAnalysis
+from app.services import tailoring
+from app.services.json_stream import IncrementalJSONParser, iter_values
+from app.services.llm import LLMClient
+
+RESUME = {
+    "contact_info": {"name": "Ada Lovelace", "email": "ada@example.com"},
+    "summary": "Engineer",
+    "experience": [{"company": "Analytical Engines", "position": "Engineer", "description": ["Wrote programs"]}],
+}
+
+TAILORED = {
+    "contact_info": {"name": "Ada Lovelace", "email": "ada@example.com"},
+    "summary": "Backend engineer with a taste for \"hard\" problems {and} braces",
+    "experience": [
+        {"company": "Analytical Engines", "position": "Engineer", "description": ["Built Python services"]},
+        {"company": "Difference Engines", "position": "Intern", "description": [], "current": False},
+    ],
+    "skills": [{"category": "Languages", "skills": ["Python", "C"]}],
+    "certifications": [],
+}
+
+
+def test_parser_reports_values_as_they_complete():
+    text = "```json\n" + json.dumps(TAILORED, indent=2) + "\n```"
+    parser = IncrementalJSONParser(max_depth=2)
+    events = []
+    for i in range(0, len(text), 7):
+        events.extend(parser.feed(text[i:i + 7]))
+
+    assert parser.done
+    assert events == iter_values(TAILORED, max_depth=2)
+    paths = [path for path, _ in events]
+    # The first experience item is reported before the second has arrived
+    assert paths.index(("experience", 0)) < paths.index(("experience", 1)) < paths.index(("skills", 0))
+    assert events[-1] == ((), TAILORED)
+
+
+def test_parser_rejects_invalid_values():
+    parser = IncrementalJSONParser()
+    with pytest.raises(ValueError):
+        parser.feed('{"summary": tru, "x": 1}')
+
+
+@pytest.fixture
+def client(db_client, monkeypatch):
+    async def fake_analyze(jd):
+        return JDAnalysis(role_type="Backend Engineer")
+
+    monkeypatch.setattr(users, "analyze_job_description", fake_analyze)
+    return db_client(RESUME).client
+
+
+def read_events(response):
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_stream_emits_sections_then_done(client, monkeypatch):
+    llm = LLMClient(cache=None)
+    llm.llm = FakeListChatModel(responses=[json.dumps(TAILORED)])
+    monkeypatch.setattr(tailoring, "llm_client", llm)
+
+    response = client.post("/api/v1/users/me/tailor/stream", json={"raw_text": "Backend engineer"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = read_events(response)
+    assert events[0] == ("analysis", JDAnalysis(role_type="Backend Engineer").model_dump(mode="json"))
+    sections = [(data["section"], data.get("index")) for event, data in events if event == "section"]
+    assert sections == [
+        ("contact_info", None), ("summary", None),
+        ("experience", 0), ("experience", 1), ("skills", 0), ("certifications", None),
+    ]
+    assert events[-1][0] == "done"
+    assert events[-1][1]["fallback"] is False
+    assert events[-1][1]["resume"]["summary"] == TAILORED["summary"]
+
+
+def test_stream_falls_back_to_base_resume(client, monkeypatch):
+    llm = LLMClient(cache=None)
+    llm.llm = FakeListChatModel(responses=['{"summary": "cut off'])
+    monkeypatch.setattr(tailoring, "llm_client", llm)
+
+    events = read_events(client.post("/api/v1/users/me/tailor/stream", json={"raw_text": "JD"}))
+    assert [event for event, _ in events] == ["analysis", "error", "done"]
+    assert events[-1][1]["fallback"] is True
+    assert events[-1][1]["resume"]["summary"] == "Engineer"